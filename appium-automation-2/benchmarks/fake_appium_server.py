@@ -0,0 +1,567 @@
+"""
+Servidor W3C WebDriver/Appium falso para medir los page objects sin dispositivo
+Sirve las pantallas grabadas de la app Valmex (tests/resources/page_sources):
+page_source, capturas, búsqueda de elementos (xpath, accessibility id, id,
+-android uiautomator con UiSelector/UiScrollable), atributos, clicks, texto,
+gestos mobile: y grabación de video. Las transiciones entre pantallas siguen el
+flujo login -> inicio -> operaciones -> vender -> confirmación, y cada comando
+puede tener una latencia simulada para aproximar la de un emulador.
+
+Uso:
+    with FakeAppiumServer(latency=0.01, route_latency={"source": 0.2}) as server:
+        connection = create_tuned_connection(server.url)
+        driver = webdriver.Remote(command_executor=connection, options=options)
+"""
+
+import base64
+import json
+import re
+import secrets
+import socket
+import struct
+import threading
+import time
+import urllib.request
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from lxml import etree
+
+from utils.page_snapshot import parse_bounds
+
+SCREENS_DIR = Path(__file__).resolve().parent.parent / "tests" / "resources" / "page_sources"
+PACKAGE_NAME = "com.valmex.valmexcb"
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# (pantalla, clase, etiqueta) del elemento tocado -> pantalla siguiente
+TRANSITIONS = {
+    ("login", "android.widget.Button", "Entrar"): "home",
+    ("home", "android.view.View", "Operaciones"): "operations",
+    ("operations", "android.view.View", "Vender"): "vender_fondos",
+    ("vender_fondos", "android.widget.Button", "Vender"): "vender_confirmacion",
+}
+START_SCREEN = "login"
+
+# Color de la captura de cada pantalla (la imagen es lisa, del tamaño indicado)
+_SCREEN_COLORS = {
+    "login": (0, 51, 102),
+    "home": (240, 240, 240),
+    "operations": (230, 236, 245),
+    "vender_fondos": (250, 250, 250),
+    "vender_contratos": (245, 245, 250),
+    "vender_confirmacion": (255, 255, 255),
+}
+
+_EMPTY_SOURCE = '<hierarchy index="0" class="hierarchy" rotation="0" width="1080" height="2400"/>'
+_UI_CALL_RE = re.compile(r'\.(\w+)\(\s*("(?:\\.|[^"\\])*"|[^()"]*?)\s*\)')
+_ENTER = "\ue007"
+
+
+class WebDriverError(Exception):
+    """Error W3C: se responde con {"value": {"error", "message"}}."""
+
+    def __init__(self, status, error, message=""):
+        super().__init__(message)
+        self.status = status
+        self.error = error
+        self.message = message
+
+
+def png_bytes(width, height, rgb):
+    """
+    Returns:
+        bytes: PNG liso de width x height (sin dependencias de imágenes)
+    """
+    row = b"\x00" + bytes(rgb) * width
+    raw = row * height
+
+    def chunk(tag, data):
+        return (
+            struct.pack(">I", len(data)) + tag + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+# ----------------------------------------------------
+# UiSelector / UiScrollable
+# ----------------------------------------------------
+
+def _java_string(token):
+    return re.sub(r"\\(.)", r"\1", token[1:-1], flags=re.S)
+
+
+def _java_regex(pattern):
+    # \Q...\E (literal) y \z (fin de texto) no existen en el módulo re
+    pattern = re.sub(r"\\Q(.*?)(?:\\E|$)", lambda m: re.escape(m.group(1)), pattern, flags=re.S)
+    return pattern.replace("\\z", "\\Z")
+
+
+def _ui_predicate(method, argument):
+    if argument.startswith('"'):
+        value = _java_string(argument)
+    elif argument in ("true", "false"):
+        value = argument
+    elif argument.lstrip("-").isdigit():
+        value = int(argument)
+    else:
+        raise WebDriverError(400, "invalid selector", f"Argumento no soportado: {argument}")
+
+    attr_by_prefix = {"description": "content-desc", "text": "text", "resourceId": "resource-id"}
+    for prefix, attr in attr_by_prefix.items():
+        if method == prefix:
+            return lambda a, v=value, k=attr: a.get(k, "") == v
+        if method == prefix + "Matches":
+            regex = re.compile(_java_regex(value))
+            return lambda a, r=regex, k=attr: bool(a.get(k)) and r.fullmatch(a.get(k)) is not None
+        # *Contains / *StartsWith de UiSelector ignoran mayúsculas
+        if method == prefix + "Contains":
+            return lambda a, v=value.lower(), k=attr: v in a.get(k, "").lower()
+        if method == prefix + "StartsWith":
+            return lambda a, v=value.lower(), k=attr: a.get(k, "").lower().startswith(v)
+    if method == "className":
+        return lambda a, v=value: a.get("class") == v
+    if method in ("scrollable", "clickable", "enabled", "selected", "checkable", "focusable"):
+        return lambda a, v=value, k=method: a.get(k) == v
+    if method == "index":
+        return lambda a, v=str(value): a.get("index") == v
+    raise WebDriverError(400, "invalid selector", f"Método UiSelector no soportado: {method}")
+
+
+def uiautomator_find(root, query):
+    """
+    Evalúa una consulta -android uiautomator sobre el árbol. UiScrollable se
+    resuelve sobre la pantalla actual (las pantallas grabadas no se desplazan).
+
+    Returns:
+        list: Nodos lxml en orden de documento
+    """
+    marker = "scrollIntoView("
+    target = query[query.index(marker) + len(marker):] if marker in query else query
+    start = target.find("new UiSelector()")
+    if start < 0:
+        raise WebDriverError(400, "invalid selector", f"Consulta no soportada: {query}")
+
+    predicates = []
+    instance = None
+    for method, argument in _UI_CALL_RE.findall(target[start + len("new UiSelector()"):]):
+        if method == "instance":
+            instance = int(argument)
+            continue
+        predicates.append(_ui_predicate(method, argument))
+
+    nodes = [
+        node for node in root.iter()
+        if isinstance(node.tag, str) and node.tag != "hierarchy"
+        and all(predicate(node.attrib) for predicate in predicates)
+    ]
+    if instance is not None:
+        return nodes[instance:instance + 1]
+    # scrollIntoView devuelve solo el primer elemento encontrado
+    return nodes[:1] if marker in query else nodes
+
+
+# ----------------------------------------------------
+# Dispositivo simulado
+# ----------------------------------------------------
+
+class FakeDevice:
+    """Estado de la app: pantalla actual, historial, árbol y elementos entregados."""
+
+    def __init__(self, screens_dir=SCREENS_DIR, screenshot_size=(270, 600), video_bytes=65536):
+        self.sources = {
+            path.stem: re.sub(r"^<\?xml[^>]*\?>\s*", "", path.read_text(encoding="utf-8"))
+            for path in Path(screens_dir).glob("*.xml")
+        }
+        self.screenshot_size = screenshot_size
+        self.video_bytes = video_bytes
+        self.lock = threading.RLock()
+        self._screenshots = {}
+        self.recording = False
+        self.screen = None
+        self.history = []
+        self.generation = 0
+        self.root = None
+        self.nodes = []
+        self.launch()
+
+    # Pantallas -------------------------------------------------
+
+    def show(self, screen, remember=True):
+        if remember and self.screen is not None:
+            self.history.append(self.screen)
+        self.screen = screen
+        self.generation += 1
+        source = self.sources.get(screen, _EMPTY_SOURCE) if screen else _EMPTY_SOURCE
+        self.root = etree.fromstring(source.encode("utf-8"))
+        self.nodes = [node for node in self.root.iter() if isinstance(node.tag, str)]
+
+    def launch(self):
+        self.history = []
+        self.show(START_SCREEN, remember=False)
+
+    def terminate(self):
+        self.history = []
+        self.show(None, remember=False)
+
+    def back(self):
+        if self.history:
+            self.show(self.history.pop(), remember=False)
+
+    def source(self):
+        return "<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>" + etree.tostring(
+            self.root, encoding="unicode"
+        )
+
+    def screenshot(self):
+        png = self._screenshots.get(self.screen)
+        if png is None:
+            width, height = self.screenshot_size
+            png = png_bytes(width, height, _SCREEN_COLORS.get(self.screen, (0, 0, 0)))
+            self._screenshots[self.screen] = png
+        return base64.b64encode(png).decode("ascii")
+
+    def window_rect(self):
+        return {
+            "x": 0,
+            "y": 0,
+            "width": int(self.root.get("width", 1080)),
+            "height": int(self.root.get("height", 2400)),
+        }
+
+    # Elementos -------------------------------------------------
+
+    def element_id(self, node):
+        return f"{self.generation}-{self.nodes.index(node)}"
+
+    def element(self, element_id):
+        generation, _, index = element_id.partition("-")
+        if generation != str(self.generation):
+            raise WebDriverError(404, "stale element reference", f"Elemento {element_id} obsoleto")
+        try:
+            return self.nodes[int(index)]
+        except (ValueError, IndexError):
+            raise WebDriverError(404, "no such element", f"Elemento {element_id} desconocido")
+
+    def find(self, using, value, scope=None):
+        scope = self.root if scope is None else scope
+        if using == "xpath":
+            try:
+                found = scope.xpath(value)
+            except etree.XPathError as e:
+                raise WebDriverError(400, "invalid selector", str(e))
+            return [node for node in found if isinstance(node, etree._Element)]
+        if using == "accessibility id":
+            return [n for n in scope.iter() if isinstance(n.tag, str) and n.get("content-desc") == value]
+        if using == "id":
+            return [
+                n for n in scope.iter()
+                if isinstance(n.tag, str)
+                and (n.get("resource-id") == value or n.get("resource-id", "").endswith(":id/" + value))
+            ]
+        if using == "class name":
+            return [n for n in scope.iter() if isinstance(n.tag, str) and n.get("class") == value]
+        if using == "-android uiautomator":
+            return uiautomator_find(scope, value)
+        raise WebDriverError(400, "invalid argument", f"Estrategia no soportada: {using}")
+
+    # Acciones --------------------------------------------------
+
+    def tap_node(self, node):
+        # El toque se resuelve en el nodo o en el primer ancestro con transición
+        current = node
+        while current is not None and isinstance(current.tag, str):
+            label = current.get("content-desc") or current.get("text") or ""
+            target = TRANSITIONS.get((self.screen, current.get("class"), label))
+            if target:
+                self.show(target)
+                return
+            current = current.getparent()
+
+    def tap_point(self, x, y):
+        hit = None
+        for node in self.nodes:
+            bounds = parse_bounds(node.get("bounds"))
+            if bounds:
+                x1, y1, x2, y2 = bounds
+                if x1 <= x < x2 and y1 <= y < y2:
+                    hit = node  # el último en orden de documento es el más profundo
+        if hit is not None:
+            self.tap_node(hit)
+
+    def type_text(self, node, text):
+        node.set("text", node.get("text", "") + text.replace(_ENTER, ""))
+
+    def mobile(self, script, args):
+        if script == "mobile: scrollGesture":
+            return False  # Las pantallas grabadas caben completas: no hay más contenido
+        if script == "mobile: clickGesture":
+            if args.get("elementId"):
+                self.tap_node(self.element(args["elementId"]))
+            else:
+                self.tap_point(int(args.get("x", 0)), int(args.get("y", 0)))
+            return None
+        if script in ("mobile: terminateApp", "mobile: clearApp"):
+            self.terminate()
+            return True
+        if script == "mobile: activateApp":
+            if self.screen is None:
+                self.launch()
+            return None
+        if script == "mobile: getCurrentPackage":
+            return PACKAGE_NAME
+        if script == "mobile: queryAppState":
+            return 4 if self.screen else 1
+        # swipeGesture, hideKeyboard, pressKey y demás: sin efecto en la pantalla
+        return None
+
+    def stop_recording(self, options):
+        self.recording = False
+        video = b"\x00\x00\x00\x18ftypmp42" + bytes(max(self.video_bytes - 12, 0))
+        remote_path = options.get("remotePath")
+        if not remote_path:
+            return base64.b64encode(video).decode("ascii")
+        # Como Appium: multipart/form-data con el archivo en fileFieldName ("file")
+        boundary = f"----appium{secrets.token_hex(8)}"
+        field = options.get("fileFieldName") or "file"
+        parts = [
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+            for name, value in (options.get("formFields") or {}).items()
+            if name != field
+        ]
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="video.mp4"\r\n'
+            f"Content-Type: video/mp4\r\n\r\n".encode() + video + b"\r\n"
+        )
+        parts.append(f"--{boundary}--\r\n".encode())
+        request = urllib.request.Request(
+            remote_path,
+            data=b"".join(parts),
+            method=options.get("method", "PUT").upper(),
+            headers={
+                **(options.get("headers") or {}),
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+            },
+        )
+        urllib.request.urlopen(request, timeout=30).read()
+        return ""
+
+
+# ----------------------------------------------------
+# Servidor HTTP
+# ----------------------------------------------------
+
+class _FakeAppiumHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        path = self.path.split("?")[0]
+        if path.startswith("/wd/hub"):
+            path = path[len("/wd/hub"):]
+        parts = [part for part in path.split("/") if part]
+
+        server = self.server
+        try:
+            route, value = server.dispatch(self.command, parts, body)
+            status = 200
+            payload = {"value": value}
+        except WebDriverError as e:
+            route = "error"
+            status = e.status
+            payload = {"value": {"error": e.error, "message": e.message, "stacktrace": ""}}
+
+        server.count(route)
+        delay = server.route_latency.get(route, server.latency)
+        if delay:
+            time.sleep(delay)
+
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _FakeAppiumHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, device, latency, route_latency):
+        super().__init__(address, _FakeAppiumHandler)
+        self.device = device
+        self.latency = latency
+        self.route_latency = dict(route_latency or {})
+        self.session_id = None
+        self.commands = Counter()
+        self._count_lock = threading.Lock()
+
+    def count(self, route):
+        with self._count_lock:
+            self.commands[route] += 1
+
+    def dispatch(self, method, parts, body):
+        """
+        Returns:
+            tuple: (ruta para conteo/latencia, valor de la respuesta)
+        """
+        if parts == ["status"]:
+            return "status", {"ready": True, "message": "fake appium"}
+        if parts == ["session"] and method == "POST":
+            self.session_id = f"fake-{int(time.time() * 1000)}"
+            capabilities = body.get("capabilities", {}).get("alwaysMatch", {})
+            with self.device.lock:
+                self.device.launch()
+            return "session", {"sessionId": self.session_id, "capabilities": capabilities}
+        if len(parts) < 2 or parts[0] != "session":
+            raise WebDriverError(404, "unknown command", "/".join(parts))
+        if parts[1] != self.session_id:
+            raise WebDriverError(404, "invalid session id", parts[1])
+
+        command = parts[2:]
+        with self.device.lock:
+            if not command and method == "DELETE":
+                self.session_id = None
+                return "delete_session", None
+            return self._session_command(method, command, body)
+
+    def _session_command(self, method, command, body):
+        device = self.device
+        head = command[0] if command else ""
+
+        if command == ["source"]:
+            return "source", device.source()
+        if command == ["screenshot"]:
+            return "screenshot", device.screenshot()
+        if command in (["window", "rect"], ["window", "current", "size"], ["window", "size"]):
+            return "window", device.window_rect()
+        if command == ["back"]:
+            device.back()
+            return "back", None
+        if head in ("element", "elements") and len(command) == 1:
+            return "find", self._find(head, body)
+        if head == "element" and len(command) >= 3:
+            return self._element_command(method, command, body)
+        if command == ["execute", "sync"]:
+            args = body.get("args") or [{}]
+            return "execute", device.mobile(body.get("script", ""), args[0] or {})
+        if command == ["appium", "start_recording_screen"]:
+            device.recording = True
+            return "recording", None
+        if command == ["appium", "stop_recording_screen"]:
+            return "recording", device.stop_recording(body.get("options") or {})
+        if command[:2] == ["appium", "device"] and len(command) == 3:
+            legacy = {
+                "terminate_app": "mobile: terminateApp",
+                "activate_app": "mobile: activateApp",
+                "current_package": "mobile: getCurrentPackage",
+            }
+            return "execute", device.mobile(legacy.get(command[2], ""), body)
+        # timeouts, settings y demás comandos sin efecto
+        return "other", None
+
+    def _find(self, head, body, scope=None):
+        nodes = self.device.find(body.get("using"), body.get("value", ""), scope)
+        elements = [
+            {ELEMENT_KEY: self.device.element_id(n), "ELEMENT": self.device.element_id(n)}
+            for n in nodes
+        ]
+        if head == "elements":
+            return elements
+        if not elements:
+            raise WebDriverError(404, "no such element", f"{body.get('using')}={body.get('value')}")
+        return elements[0]
+
+    def _element_command(self, method, command, body):
+        device = self.device
+        node = device.element(command[1])
+        action = command[2]
+        if action in ("element", "elements"):
+            return "find", self._find(action, body, scope=node)
+        if action == "attribute":
+            name = command[3] if len(command) > 3 else ""
+            name = {"contentDescription": "content-desc", "resourceId": "resource-id"}.get(name, name)
+            return "attribute", node.get(name)
+        if action == "text":
+            return "attribute", node.get("text") or node.get("content-desc") or ""
+        if action in ("displayed", "enabled", "selected"):
+            return "attribute", node.get(action, "true" if action != "selected" else "false") == "true"
+        if action == "name":
+            return "attribute", node.get("class")
+        if action == "rect":
+            x1, y1, x2, y2 = parse_bounds(node.get("bounds")) or (0, 0, 0, 0)
+            return "attribute", {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+        if action == "click":
+            device.tap_node(node)
+            return "action", None
+        if action == "clear":
+            node.set("text", "")
+            return "action", None
+        if action == "value":
+            text = body.get("text") or "".join(body.get("value", []))
+            device.type_text(node, text)
+            return "action", None
+        raise WebDriverError(404, "unknown command", "/".join(command))
+
+
+class FakeAppiumServer:
+    """
+    Servidor Appium falso en un hilo (misma interfaz que StubWebDriverServer).
+
+    Args:
+        latency (float): Segundos simulados por comando
+        route_latency (dict): Latencia por tipo de comando (source, screenshot,
+            find, attribute, action, execute, window, recording, ...)
+        screens_dir (Path): Carpeta con las pantallas grabadas (.xml)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, route_latency=None,
+                 screens_dir=SCREENS_DIR, screenshot_size=(270, 600)):
+        self.device = FakeDevice(screens_dir, screenshot_size=screenshot_size)
+        self._server = _FakeAppiumHTTPServer((host, port), self.device, latency, route_latency)
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def commands(self):
+        """Comandos atendidos por tipo (Counter)."""
+        return self._server.commands
+
+    @property
+    def requests(self):
+        return sum(self._server.commands.values())
+
+    def reset_counts(self):
+        self._server.commands.clear()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
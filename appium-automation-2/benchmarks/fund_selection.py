@@ -0,0 +1,84 @@
+"""
+Benchmark de selección de fondos: UiScrollable vs ciclo de swipes
+Requiere Appium Server y el emulador con la app Valmex instalada.
+
+Uso:
+    python -m benchmarks.fund_selection --password "****" --fund VALMXES --repeat 3
+    python -m benchmarks.fund_selection --password "****" --liquidity-days 0
+"""
+
+import argparse
+
+from capabilities.valmex_caps import get_valmex_capabilities_installed
+from config.settings import app
+from pages.home_page import ValmexHomePage
+from pages.login_page import ValmexLoginPage
+from pages.operations_page import ValmexOperationsPage
+from pages.vender_page import ValmexVenderPage
+from utils.appium_driver import AppiumDriver
+from utils.waits import ScreenWaiter
+
+
+def _go_to_vender(driver, password):
+    """Reinicia la app y navega login -> inicio -> operaciones -> vender."""
+    waiter = ScreenWaiter(driver)
+    login_page = ValmexLoginPage(driver)
+    waiter.wait_for(ValmexLoginPage.SCREEN_SIGNATURE, step="login")
+    login_page.set_Access_with_credentials(password, driver)
+    waiter.wait_for(ValmexHomePage.SCREEN_SIGNATURE, step="home", timeout=45)
+    ValmexHomePage(driver).click_operaciones()
+    waiter.wait_for(ValmexOperationsPage.SCREEN_SIGNATURE, step="operations")
+    ValmexOperationsPage(driver).click_vender()
+    waiter.wait_for(ValmexVenderPage.SCREEN_SIGNATURE, step="vender")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--fund", default=None, help="Nombre (parcial) del fondo")
+    parser.add_argument("--liquidity-days", type=int, default=None)
+    parser.add_argument("--value-min", type=float, default=None)
+    parser.add_argument("--value-max", type=float, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    appium_driver = AppiumDriver(get_valmex_capabilities_installed())
+    driver = appium_driver.start_driver()
+    results = []
+    try:
+        for strategy in ("auto", "swipe"):
+            for run in range(1, args.repeat + 1):
+                appium_driver.reset_app(app.PACKAGE_NAME)
+                _go_to_vender(driver, args.password)
+
+                vender_page = ValmexVenderPage(driver)
+                vender_page.FUND_SEARCH_STRATEGY = strategy
+                selected = vender_page.select_fund_by_criteria(
+                    name=args.fund,
+                    value_min=args.value_min,
+                    value_max=args.value_max,
+                    liquidity_days=args.liquidity_days,
+                )
+                stats = vender_page.last_fund_search_stats or {}
+                results.append(
+                    (strategy, run, selected, stats.get("strategy"),
+                     stats.get("round_trips", 0), stats.get("seconds", 0.0))
+                )
+    finally:
+        appium_driver.stop_driver()
+
+    print("\n" + "=" * 72)
+    print(f"{'Modo':<8}{'Corrida':>8}{'Estrategia usada':>20}{'Peticiones':>12}{'Segundos':>12}{'OK':>6}")
+    print("=" * 72)
+    for strategy, run, selected, used, round_trips, seconds in results:
+        print(f"{strategy:<8}{run:>8}{str(used):>20}{round_trips:>12}{seconds:>12.2f}{'✅' if selected else '❌':>6}")
+    for strategy in ("auto", "swipe"):
+        rows = [r for r in results if r[0] == strategy]
+        if rows:
+            avg_trips = sum(r[4] for r in rows) / len(rows)
+            avg_seconds = sum(r[5] for r in rows) / len(rows)
+            print(f"Promedio {strategy}: {avg_trips:.1f} peticiones, {avg_seconds:.2f}s por selección")
+
+
+if __name__ == "__main__":
+    main()
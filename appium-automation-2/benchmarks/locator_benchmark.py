@@ -0,0 +1,97 @@
+"""
+Benchmark de latencia de búsqueda: XPath vs localizadores compilados
+Requiere Appium Server y el emulador con la app Valmex instalada.
+En cada pantalla del flujo (login, inicio, operaciones, vender) ejecuta
+find_elements con el XPath original y con la estrategia compilada
+(utils.locators) y compara la mediana por localizador.
+
+Uso:
+    python -m benchmarks.locator_benchmark --password "****" --repeat 20
+"""
+
+import argparse
+import statistics
+import time
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from capabilities.valmex_caps import get_valmex_capabilities_installed
+from config.settings import app
+from pages.home_page import ValmexHomePage
+from pages.login_page import ValmexLoginPage
+from pages.operations_page import ValmexOperationsPage
+from pages.vender_page import ValmexVenderPage
+from utils.appium_driver import AppiumDriver
+from utils.locators import Locator
+from utils.waits import ScreenWaiter
+
+
+def _compiled_locators(page):
+    return [(name, value) for name, value in vars(page).items() if isinstance(value, Locator) and value.compiled]
+
+
+def _measure(driver, locator, repeat):
+    samples = []
+    found = 0
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        found = len(driver.find_elements(*locator))
+        samples.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(samples), found
+
+
+def _bench_screen(driver, screen, page, repeat, results):
+    # Sin espera implícita: un localizador sin resultados no debe medir el timeout
+    driver.implicitly_wait(0)
+    for name, locator in _compiled_locators(page):
+        xpath_ms, xpath_found = _measure(driver, (AppiumBy.XPATH, locator.xpath), repeat)
+        compiled_ms, compiled_found = _measure(driver, locator, repeat)
+        results.append((screen, name, locator[0], xpath_ms, compiled_ms, xpath_found == compiled_found))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    appium_driver = AppiumDriver(get_valmex_capabilities_installed())
+    driver = appium_driver.start_driver()
+    waiter = ScreenWaiter(driver)
+    results = []
+    try:
+        appium_driver.reset_app(app.PACKAGE_NAME)
+        waiter.wait_for(ValmexLoginPage.SCREEN_SIGNATURE, step="login")
+        _bench_screen(driver, "login", ValmexLoginPage, args.repeat, results)
+
+        ValmexLoginPage(driver).set_Access_with_credentials(args.password, driver)
+        waiter.wait_for(ValmexHomePage.SCREEN_SIGNATURE, step="home", timeout=45)
+        _bench_screen(driver, "inicio", ValmexHomePage, args.repeat, results)
+
+        ValmexHomePage(driver).click_operaciones()
+        waiter.wait_for(ValmexOperationsPage.SCREEN_SIGNATURE, step="operations")
+        _bench_screen(driver, "operaciones", ValmexOperationsPage, args.repeat, results)
+
+        ValmexOperationsPage(driver).click_vender()
+        waiter.wait_for(ValmexVenderPage.SCREEN_SIGNATURE, step="vender")
+        _bench_screen(driver, "vender", ValmexVenderPage, args.repeat, results)
+    finally:
+        appium_driver.stop_driver()
+
+    print("\n" + "=" * 96)
+    print(f"Mediana de {args.repeat} búsquedas por localizador (ms)")
+    print("=" * 96)
+    print(f"{'Pantalla':<13}{'Localizador':<28}{'Estrategia':<22}{'XPath':>9}{'Compilado':>11}{'Mejora':>8}{'Igual':>6}")
+    for screen, name, strategy, xpath_ms, compiled_ms, same in results:
+        print(
+            f"{screen:<13}{name:<28}{strategy:<22}{xpath_ms:>9.1f}{compiled_ms:>11.1f}"
+            f"{xpath_ms / compiled_ms:>7.2f}x{'✅' if same else '❌':>6}"
+        )
+    if results:
+        total_xpath = sum(r[3] for r in results)
+        total_compiled = sum(r[4] for r in results)
+        print(f"Total: XPath {total_xpath:.1f} ms | compilado {total_compiled:.1f} ms | {total_xpath / total_compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
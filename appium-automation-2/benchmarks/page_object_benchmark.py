@@ -0,0 +1,243 @@
+"""
+Benchmark de los page objects y de las evidencias contra el Appium falso
+No requiere Appium Server ni emulador: levanta FakeAppiumServer con las pantallas
+grabadas de la app Valmex y ejecuta los flujos de ValmexVenderPage, take_evidence
+y la generación del reporte, midiendo las peticiones WebDriver y el tiempo de
+cada flujo (mediana de --repeat corridas). La latencia simulada permite comparar
+los flujos como si corrieran contra un emulador (--latency, --source-latency).
+
+Los sleep() fijos de los page objects y del inicio del video se omiten por
+defecto para medir solo el trabajo real; --keep-sleeps los conserva.
+
+Uso:
+    python -m benchmarks.page_object_benchmark --repeat 5
+    python -m benchmarks.page_object_benchmark --latency 0.02 --source-latency 0.3
+    python -m benchmarks.page_object_benchmark --flows seleccion_fondo,evidencias --keep-sleeps
+"""
+
+import argparse
+import contextlib
+import os
+import statistics
+import tempfile
+import time
+import types
+import warnings
+
+from benchmarks.fake_appium_server import FakeAppiumServer
+
+PASSWORD = "benchmark"
+FUND_NAME = "VXGUBCP"
+EXPECTED_TEXTS = ["Títulos disponibles", "Importe estimado", "Sin comisión", "Vender posición total"]
+
+
+# ----------------------------------------------------
+# Flujos (cada uno parte de su pantalla inicial, que se prepara sin medir)
+# ----------------------------------------------------
+
+def _flows(project):
+    ValmexVenderPage = project.ValmexVenderPage
+
+    def navegacion(driver):
+        return project.ScreenNavigator(driver).go_to("vender", password=PASSWORD).target == "vender"
+
+    def seleccion_fondo(driver):
+        return ValmexVenderPage(driver).select_fund_by_name(FUND_NAME)
+
+    def catalogo_fondos(driver):
+        return len(ValmexVenderPage(driver).get_all_available_funds()) > 0
+
+    def validacion_textos(driver):
+        return bool(ValmexVenderPage(driver).validate_texts_on_page(EXPECTED_TEXTS))
+
+    def importe(driver):
+        return ValmexVenderPage(driver).set_sell_amount("1000")
+
+    def contratos(driver):
+        return len(ValmexVenderPage(driver).get_all_contracts()) > 0
+
+    def venta(driver):
+        page = ValmexVenderPage(driver)
+        return page.click_vender_button() and page.validate_detalle_de_operacion_page_loaded()
+
+    def evidencias(driver):
+        for step in range(1, 6):
+            project.take_evidence(driver, step_log=f"Paso {step} del benchmark")
+        project.flush_evidence(driver)
+        return len(driver.evidence_state.get("photo_paths", [])) == 5
+
+    def reporte(driver):
+        project.start_video_recording(driver, driver.evidence_state["test_name"])
+        for step in range(1, 4):
+            project.take_evidence(driver, step_log=f"Paso {step} del reporte")
+        project.stop_and_save_video_if_recording(driver, driver.evidence_state["test_name"])
+        project.flush_evidence(driver)
+        project.generate_html_report(driver, status="PASSED")
+        return bool(driver.evidence_state.get("video_path"))
+
+    return {
+        "navegacion": (None, navegacion),
+        "seleccion_fondo": ("vender_fondos", seleccion_fondo),
+        "catalogo_fondos": ("vender_fondos", catalogo_fondos),
+        "validacion_textos": ("vender_fondos", validacion_textos),
+        "importe": ("vender_fondos", importe),
+        "contratos": ("vender_fondos", contratos),
+        "venta": ("vender_fondos", venta),
+        "evidencias": ("vender_fondos", evidencias),
+        "reporte": ("vender_fondos", reporte),
+    }
+
+
+# ----------------------------------------------------
+# Preparación
+# ----------------------------------------------------
+
+def _load_project():
+    """
+    Importa los módulos del proyecto (después de fijar EVIDENCE_BASE_DIR: la
+    configuración se lee al importar).
+    """
+    from pages.vender_page import ValmexVenderPage
+    from utils.evidences import (
+        flush_evidence,
+        generate_html_report,
+        start_video_recording,
+        stop_and_save_video_if_recording,
+        take_evidence,
+    )
+    from utils.navigator import ScreenNavigator
+
+    return types.SimpleNamespace(
+        ValmexVenderPage=ValmexVenderPage,
+        ScreenNavigator=ScreenNavigator,
+        take_evidence=take_evidence,
+        flush_evidence=flush_evidence,
+        start_video_recording=start_video_recording,
+        stop_and_save_video_if_recording=stop_and_save_video_if_recording,
+        generate_html_report=generate_html_report,
+    )
+
+
+@contextlib.contextmanager
+def _without_fixed_sleeps():
+    """Sustituye los sleep() fijos de los page objects y del inicio del video."""
+    import pages.home_page
+    import pages.login_page
+    import pages.operations_page
+    import pages.vender_page
+    import utils.evidences.video
+
+    modules = [pages.home_page, pages.login_page, pages.operations_page, pages.vender_page]
+    originals = [module.sleep for module in modules]
+    video_time = utils.evidences.video.time
+    for module in modules:
+        module.sleep = lambda seconds: None
+    utils.evidences.video.time = types.SimpleNamespace(time=time.time, sleep=lambda seconds: None)
+    try:
+        yield
+    finally:
+        for module, original in zip(modules, originals):
+            module.sleep = original
+        utils.evidences.video.time = video_time
+
+
+def _create_driver(url):
+    from appium import webdriver
+    from appium.options.android import UiAutomator2Options
+
+    from utils.transport import create_tuned_connection
+
+    options = UiAutomator2Options()
+    options.platform_name = "Android"
+    options.automation_name = "UiAutomator2"
+    return webdriver.Remote(command_executor=create_tuned_connection(url), options=options)
+
+
+def _run_flow(server, driver, name, start_screen, flow, count_commands):
+    with server.device.lock:
+        if start_screen is None:
+            server.device.terminate()
+        else:
+            server.device.launch()
+            server.device.show(start_screen, remember=False)
+    driver.evidence_state = {"is_recording": False, "test_name": f"benchmark_{name}", "step_count": 0}
+    server.reset_counts()
+    with count_commands(driver) as stats:
+        ok = flow(driver)
+    return bool(ok), stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latencia simulada por comando (s)")
+    parser.add_argument("--source-latency", type=float, default=None, help="Latencia de page_source (s)")
+    parser.add_argument("--screenshot-latency", type=float, default=None, help="Latencia de captura (s)")
+    parser.add_argument("--flows", default=None, help="Flujos separados por coma (por defecto todos)")
+    parser.add_argument("--keep-sleeps", action="store_true", help="Conservar los sleep() fijos")
+    parser.add_argument("--output-dir", default=None, help="Carpeta de evidencias (por defecto temporal)")
+    args = parser.parse_args()
+
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix="benchmark_evidencias_")
+    os.environ["EVIDENCE_BASE_DIR"] = os.path.abspath(output_dir)
+    os.environ.setdefault("EVIDENCE_ATTACH_ALLURE", "False")
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    project = _load_project()
+    from utils.command_stats import count_commands
+    from utils.evidences.image_cache import CompressedImageCache
+
+    flows = _flows(project)
+    selected = args.flows.split(",") if args.flows else list(flows)
+    unknown = [name for name in selected if name not in flows]
+    if unknown:
+        parser.error(f"Flujos desconocidos: {', '.join(unknown)} (disponibles: {', '.join(flows)})")
+
+    route_latency = {}
+    if args.source_latency is not None:
+        route_latency["source"] = args.source_latency
+    if args.screenshot_latency is not None:
+        route_latency["screenshot"] = args.screenshot_latency
+
+    results = []
+    sleeps = contextlib.nullcontext() if args.keep_sleeps else _without_fixed_sleeps()
+    CompressedImageCache.start()
+    with FakeAppiumServer(latency=args.latency, route_latency=route_latency) as server, sleeps:
+        driver = _create_driver(server.url)
+        try:
+            for name in selected:
+                start_screen, flow = flows[name]
+                runs = [
+                    _run_flow(server, driver, name, start_screen, flow, count_commands)
+                    for _ in range(args.repeat)
+                ]
+                seconds = statistics.median(stats.seconds for _, stats in runs)
+                last_stats = runs[-1][1]
+                results.append((name, all(ok for ok, _ in runs), last_stats, seconds))
+        finally:
+            driver.quit()
+            CompressedImageCache.shutdown()
+
+    print("\n" + "=" * 78)
+    print(
+        f"Appium falso | latencia: {args.latency * 1000:.1f} ms"
+        f" | page_source: {route_latency.get('source', args.latency) * 1000:.1f} ms"
+        f" | sleeps fijos: {'sí' if args.keep_sleeps else 'no'} | corridas: {args.repeat}"
+    )
+    print("=" * 78)
+    print(f"{'Flujo':<20}{'Peticiones':>12}{'Segundos':>12}{'ms/petición':>14}{'OK':>6}  Comandos principales")
+    for name, ok, stats, seconds in results:
+        top = sorted(stats.commands.items(), key=lambda item: -item[1])[:3]
+        per_command = seconds / stats.round_trips * 1000 if stats.round_trips else 0.0
+        print(
+            f"{name:<20}{stats.round_trips:>12}{seconds:>12.3f}{per_command:>14.2f}"
+            f"{'✅' if ok else '❌':>6}  {', '.join(f'{c}×{n}' for c, n in top)}"
+        )
+    total_trips = sum(stats.round_trips for _, _, stats, _ in results)
+    total_seconds = sum(seconds for _, _, _, seconds in results)
+    print(f"{'Total':<20}{total_trips:>12}{total_seconds:>12.3f}")
+    print(f"\n📁 Evidencias y reportes en: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
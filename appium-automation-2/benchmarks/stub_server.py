@@ -0,0 +1,83 @@
+"""
+Servidor WebDriver mínimo para benchmarks de transporte
+Responde a cualquier comando con un JSON W3C válido (HTTP/1.1 keep-alive),
+sin dispositivo ni Appium, para aislar el costo del cliente HTTP.
+"""
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Como Appium (Node.js, noDelay por defecto): sin esto el cuerpo de la
+        # respuesta espera el ACK retardado del cliente (~40 ms por comando)
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        if length:
+            self.rfile.read(length)
+
+        self.server.requests += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        if self.command == "POST" and self.path.rstrip("/").endswith("/session"):
+            value = {"sessionId": "stub-session", "capabilities": {"platformName": "Android"}}
+        elif self.command == "DELETE":
+            value = None
+        else:
+            value = "stub"
+        body = json.dumps({"value": value}).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubWebDriverServer:
+    """
+    Uso:
+        with StubWebDriverServer(delay=0.001) as server:
+            conn = create_tuned_connection(server.url)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0):
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.delay = delay
+        self._server.requests = 0
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
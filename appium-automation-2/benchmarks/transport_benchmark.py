@@ -0,0 +1,82 @@
+"""
+Benchmark del transporte HTTP contra un servidor WebDriver local (stub)
+Compara una conexión sin keep-alive, la AppiumConnection por defecto y la
+TunedAppiumConnection ejecutando el mismo comando pequeño muchas veces, como
+lo hacen los page objects al leer atributos elemento por elemento.
+
+Uso:
+    python -m benchmarks.transport_benchmark --commands 2000
+    python -m benchmarks.transport_benchmark --commands 2000 --threads 4 --delay 0.001
+"""
+
+import argparse
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from appium.webdriver.appium_connection import AppiumConnection
+from appium.webdriver.client_config import AppiumClientConfig
+from selenium.webdriver.remote.command import Command
+
+from benchmarks.stub_server import StubWebDriverServer
+from utils.transport import create_tuned_connection
+
+
+def _connections(url, pool_size):
+    warnings.simplefilter("ignore", DeprecationWarning)
+    return [
+        ("sin keep-alive", AppiumConnection(client_config=AppiumClientConfig(url, keep_alive=False))),
+        ("AppiumConnection", AppiumConnection(client_config=AppiumClientConfig(url, keep_alive=True))),
+        ("TunedAppiumConnection", create_tuned_connection(url, pool_size=pool_size)),
+    ]
+
+
+def _run(connection, commands, threads):
+    def one(_):
+        connection.execute(
+            Command.GET_ELEMENT_ATTRIBUTE,
+            {"sessionId": "stub-session", "id": "element-1", "name": "content-desc"},
+        )
+
+    started_at = time.perf_counter()
+    if threads <= 1:
+        for i in range(commands):
+            one(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(one, range(commands)))
+    return time.perf_counter() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--delay", type=float, default=0.0, help="Latencia simulada del servidor (s)")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    with StubWebDriverServer(delay=args.delay) as server:
+        for name, connection in _connections(server.url, args.pool_size):
+            _run(connection, 50, args.threads)  # calentamiento
+            best = min(_run(connection, args.commands, args.threads) for _ in range(args.repeat))
+            results.append((name, best))
+            if hasattr(connection, "latency"):
+                connection.latency.reset()
+
+    baseline = results[0][1]
+    print("\n" + "=" * 72)
+    print(f"{args.commands} comandos | hilos: {args.threads} | latencia simulada: {args.delay * 1000:.1f} ms")
+    print("=" * 72)
+    print(f"{'Transporte':<26}{'Total s':>10}{'ms/comando':>14}{'Comandos/s':>12}{'Mejora':>10}")
+    for name, seconds in results:
+        print(
+            f"{name:<26}{seconds:>10.3f}{seconds / args.commands * 1000:>14.3f}"
+            f"{args.commands / seconds:>12.0f}{baseline / seconds:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
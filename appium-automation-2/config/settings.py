@@ -38,6 +38,25 @@ class AppiumConfig:
     INSTALL_TIMEOUT = int(os.getenv("APPIUM_INSTALL_TIMEOUT", 60000))
     ADB_EXEC_TIMEOUT = int(os.getenv("APPIUM_ADB_TIMEOUT", 60000))
 
+    # Reutilización de sesión (una sesión por ejecución o por worker de xdist)
+    SESSION_REUSE = os.getenv("APPIUM_SESSION_REUSE", "False").lower() == "true"
+    APP_RESET_STRATEGY = os.getenv("APPIUM_APP_RESET_STRATEGY", "terminate")  # terminate, clear
+
+    # Compilar localizadores XPath de los page objects a UiSelector / accessibility id
+    COMPILE_LOCATORS = os.getenv("APPIUM_COMPILE_LOCATORS", "True").lower() == "true"
+
+    # Transporte HTTP (pool keep-alive afinado)
+    HTTP_TUNED = os.getenv("APPIUM_HTTP_TUNED", "True").lower() == "true"
+    HTTP_POOL_SIZE = int(os.getenv("APPIUM_HTTP_POOL_SIZE", 4))
+    HTTP_RETRIES = int(os.getenv("APPIUM_HTTP_RETRIES", 2))
+    HTTP_BACKOFF = float(os.getenv("APPIUM_HTTP_BACKOFF", 0.2))
+    HTTP_TIMEOUT = int(os.getenv("APPIUM_HTTP_TIMEOUT", 120))
+
+    # Grabación/reproducción de comandos por prueba (off, record, replay)
+    COMMAND_LOG = os.getenv("APPIUM_COMMAND_LOG", "off").lower()
+    COMMAND_LOG_DIR = BASE_DIR / os.getenv("APPIUM_COMMAND_LOG_DIR", "command_logs")
+    REPLAY_STRICT = os.getenv("APPIUM_REPLAY_STRICT", "True").lower() == "true"
+
 
 class DeviceConfig:
     """Configuración del dispositivo móvil"""
@@ -59,6 +78,15 @@ class DeviceConfig:
         os.getenv("DEVICE_AUTO_GRANT_PERMISSIONS", "True").lower() == "true"
     )
 
+    # Pool de dispositivos para ejecución paralela (pytest-xdist)
+    # Formato: "udid:avd,udid:avd" (el avd es opcional en dispositivos físicos)
+    POOL = os.getenv("DEVICE_POOL", "")
+    SYSTEM_PORT_BASE = int(os.getenv("DEVICE_SYSTEM_PORT_BASE", 8200))
+    CHROMEDRIVER_PORT_BASE = int(os.getenv("DEVICE_CHROMEDRIVER_PORT_BASE", 9515))
+    MJPEG_PORT_BASE = int(os.getenv("DEVICE_MJPEG_PORT_BASE", 7810))
+    LEASE_DIR = BASE_DIR / os.getenv("DEVICE_LEASE_DIR", ".lock/devices")
+    LEASE_TIMEOUT = int(os.getenv("DEVICE_LEASE_TIMEOUT", 600))
+
 
 class AppConfig:
     """Configuración de la aplicación bajo prueba"""
@@ -77,8 +105,9 @@ class AppConfig:
 class EvidenceConfig:
     """Configuración del sistema de evidencias"""
 
-    # Rutas de salida
-    BASE_OUTPUT_DIR = BASE_DIR / os.getenv("EVIDENCE_BASE_DIR", "evidencias")
+    # Rutas de salida (con pytest-xdist cada worker escribe en su subcarpeta)
+    WORKER_ID = os.getenv("PYTEST_XDIST_WORKER", "")
+    BASE_OUTPUT_DIR = BASE_DIR / os.getenv("EVIDENCE_BASE_DIR", "evidencias") / WORKER_ID
     VIDEO_DIR = BASE_OUTPUT_DIR / os.getenv("EVIDENCE_VIDEO_DIR", "videos")
     PHOTO_DIR = BASE_OUTPUT_DIR / os.getenv("EVIDENCE_PHOTO_DIR", "fotos")
     HTML_DIR = BASE_OUTPUT_DIR / os.getenv("EVIDENCE_HTML_DIR", "reportes_html")
@@ -89,6 +118,10 @@ class EvidenceConfig:
     VIDEO_CODEC = os.getenv("EVIDENCE_VIDEO_CODEC", "vp8")
     VIDEO_TIME_LIMIT = int(os.getenv("EVIDENCE_VIDEO_TIME_LIMIT", 600))
     VIDEO_TIMEOUT = int(os.getenv("EVIDENCE_VIDEO_TIMEOUT", 180))
+    # Subida del video a un receptor HTTP local (remotePath) en lugar de base64
+    VIDEO_STREAM_UPLOAD = os.getenv("EVIDENCE_VIDEO_STREAM", "True").lower() == "true"
+    VIDEO_SINK_HOST = os.getenv("EVIDENCE_VIDEO_SINK_HOST", "127.0.0.1")
+    VIDEO_SINK_PORT = int(os.getenv("EVIDENCE_VIDEO_SINK_PORT", 0))
 
     # Configuración de capturas
     SCREENSHOT_ON_FAILURE = (
@@ -96,8 +129,16 @@ class EvidenceConfig:
     )
     IMAGE_MAX_DIMENSION = int(os.getenv("EVIDENCE_IMAGE_MAX_DIM", 1400))
     IMAGE_QUALITY = int(os.getenv("EVIDENCE_IMAGE_QUALITY", 75))
+    THUMB_MAX_DIMENSION = int(os.getenv("EVIDENCE_THUMB_MAX_DIM", 360))
+
+    # Pipeline asíncrono de capturas (escritura y miniaturas en segundo plano)
+    ASYNC_CAPTURE = os.getenv("EVIDENCE_ASYNC_CAPTURE", "True").lower() == "true"
+    CAPTURE_WORKERS = int(os.getenv("EVIDENCE_CAPTURE_WORKERS", 2))
+    CAPTURE_QUEUE_SIZE = int(os.getenv("EVIDENCE_CAPTURE_QUEUE_SIZE", 16))
+    IMAGE_CACHE_WORKERS = int(os.getenv("EVIDENCE_IMAGE_CACHE_WORKERS", 2))
 
     # Reportes
+    HTML_REPORT_MODE = os.getenv("EVIDENCE_HTML_MODE", "embedded").lower()  # embedded, linked
     GENERATE_HTML = os.getenv("EVIDENCE_GENERATE_HTML", "True").lower() == "true"
     GENERATE_PDF = os.getenv("EVIDENCE_GENERATE_PDF", "True").lower() == "true"
 
@@ -122,6 +163,53 @@ class TestConfig:
     DEFAULT_SLEEP = float(os.getenv("TEST_DEFAULT_SLEEP", 0.5))
     ACTION_DELAY = float(os.getenv("TEST_ACTION_DELAY", 1.0))
 
+    # Esperas de transición de pantalla (sondeo con backoff)
+    SCREEN_WAIT_TIMEOUT = float(os.getenv("TEST_SCREEN_WAIT_TIMEOUT", 30))
+    SCREEN_POLL_INTERVAL = float(os.getenv("TEST_SCREEN_POLL_INTERVAL", 0.25))
+    SCREEN_POLL_MAX_INTERVAL = float(os.getenv("TEST_SCREEN_POLL_MAX_INTERVAL", 2.0))
+
+    # Gestos (mobile: scrollGesture): porción del área por scroll y duración objetivo
+    GESTURE_SCROLL_PERCENT = float(os.getenv("TEST_GESTURE_SCROLL_PERCENT", 0.75))
+    GESTURE_DURATION_MS = int(os.getenv("TEST_GESTURE_DURATION_MS", 300))
+
+    # Navegación por estados: vigencia estimada de la sesión autenticada de la app
+    NAV_SESSION_TTL = float(os.getenv("TEST_NAV_SESSION_TTL", 240))
+
+    # Checkpoints por paso: los reintentos reanudan tras el último paso verificado
+    # (requiere APPIUM_SESSION_REUSE=True; una lectura de pantalla extra por paso)
+    STEP_CHECKPOINTS = os.getenv("TEST_STEP_CHECKPOINTS", "False").lower() == "true"
+    CHECKPOINT_MIN_SIMILARITY = float(os.getenv("TEST_CHECKPOINT_MIN_SIMILARITY", 0.9))
+
+    # Watchdog: presupuesto por paso (0 lo desactiva) y plazo de la captura de diagnóstico
+    STEP_BUDGET = float(os.getenv("TEST_STEP_BUDGET", 240))
+    WATCHDOG_DIAG_TIMEOUT = float(os.getenv("TEST_WATCHDOG_DIAG_TIMEOUT", 10))
+
+    # Perfilado de comandos de Appium (JSON por prueba + tabla en el reporte HTML)
+    PROFILE_COMMANDS = os.getenv("TEST_PROFILE_COMMANDS", "False").lower() == "true"
+    PROFILE_TOP_N = int(os.getenv("TEST_PROFILE_TOP_N", 10))
+
+
+class BackendStubConfig:
+    """Stub del backend de la app con mitmproxy (grabación y reproducción de respuestas)"""
+
+    MODE = os.getenv("BACKEND_STUB_MODE", "off").lower()  # off, record, replay
+    DIR = BASE_DIR / os.getenv("BACKEND_STUB_DIR", "backend_stubs")
+    PORT = int(os.getenv("BACKEND_STUB_PORT", 8081))
+    # Dirección del equipo vista desde el emulador de Android
+    PROXY_HOST = os.getenv("BACKEND_STUB_PROXY_HOST", "10.0.2.2")
+    # Hosts del backend a interceptar (vacío = todo el tráfico de la app)
+    HOSTS = [h.strip() for h in os.getenv("BACKEND_STUB_HOSTS", "").split(",") if h.strip()]
+    # replay: milisegundos por respuesta o "recorded" (latencia grabada)
+    LATENCY_MS = os.getenv("BACKEND_STUB_LATENCY_MS", "0")
+    # replay: reenviar al backend real las peticiones no grabadas (si no, responden 502)
+    PASSTHROUGH = os.getenv("BACKEND_STUB_PASSTHROUGH", "False").lower() == "true"
+    # Parámetros de query/JSON que cambian en cada petición y no identifican la respuesta
+    IGNORE_PARAMS = [
+        p.strip() for p in os.getenv("BACKEND_STUB_IGNORE_PARAMS", "").split(",") if p.strip()
+    ]
+    MITMDUMP = os.getenv("BACKEND_STUB_MITMDUMP", "mitmdump")
+    ADB = os.getenv("BACKEND_STUB_ADB", "adb")
+
 
 class CompanyConfig:
     """Configuración de la empresa (para reportes)"""
@@ -140,6 +228,7 @@ device = DeviceConfig()
 app = AppConfig()
 evidence = EvidenceConfig()
 test = TestConfig()
+backend = BackendStubConfig()
 company = CompanyConfig()
 
 
@@ -191,6 +280,8 @@ def print_config_summary():
     print(f"  └─ Nombre: {device.DEVICE_NAME}")
     print(f"  └─ Platform: {device.PLATFORM_NAME} {device.PLATFORM_VERSION}")
     print(f"  └─ No Reset: {device.NO_RESET}")
+    if device.POOL:
+        print(f"  └─ Pool: {device.POOL}")
 
     print(f"\n📦 APLICACIÓN:")
     print(f"  └─ Package: {app.PACKAGE_NAME}")
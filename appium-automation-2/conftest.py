@@ -1,23 +1,133 @@
 """
 Configuración de pytest para las pruebas de Appium
 """
+import os
 from time import sleep
 import pytest
 from utils.appium_driver import AppiumDriver
+from utils.driver_session import DriverSessionManager
+from utils.evidences.image_cache import CompressedImageCache
+from utils.evidences.steps import StepRegistry
 from capabilities.valmex_caps import get_valmex_capabilities_installed
+from config.settings import appium, app, backend, device, evidence, test as test_config
+from utils.command_profiler import CommandProfiler
+from utils.backend_stub import BackendStub
+from utils.checkpoints import StepCheckpoint
+from utils.command_log import RecordingAppiumConnection, log_path_for
+from utils.data_rows import load_rows, order_rows
+from utils.watchdog import StepWatchdog
+from utils.device_registry import DeviceRegistry
 from utils.evidences import (
     start_video_recording,
     stop_and_save_video_if_recording,
     generate_html_report,
     take_evidence,
+    flush_evidence,
 )
 
+session_stats_key = pytest.StashKey[dict]()
+
+
+def _valmex_capabilities(lease):
+    """Capabilities de la app instalada, ajustadas al dispositivo arrendado (si hay)."""
+    caps = get_valmex_capabilities_installed()
+    return lease.apply(caps) if lease is not None else caps
+
+
+@pytest.fixture(scope="session")
+def device_lease():
+    """
+    Dispositivo exclusivo del worker de pytest-xdist (udid, AVD y puertos propios).
+    Sin xdist ni DEVICE_POOL entrega None y se usa DEVICE_NAME tal cual.
+    Si el worker muere, el sistema operativo libera el bloqueo del arrendamiento.
+    Falla de inmediato si hay más workers que dispositivos en el pool.
+    """
+    if not device.POOL and not os.getenv("PYTEST_XDIST_WORKER"):
+        yield None
+        return
+
+    registry = DeviceRegistry.from_config(device)
+    registry.check_capacity(int(os.getenv("PYTEST_XDIST_WORKER_COUNT", 1)))
+    lease = registry.acquire(timeout=device.LEASE_TIMEOUT)
+    yield lease
+    lease.release()
+
+
+@pytest.fixture(scope="session")
+def backend_stub(device_lease):
+    """
+    Stub del backend con mitmproxy (BACKEND_STUB_MODE=record o replay).
+    Arranca mitmdump y apunta el proxy del emulador del worker a él; con
+    BACKEND_STUB_MODE=off entrega None y la app usa el backend real.
+    """
+    if backend.MODE == "off":
+        yield None
+        return
+
+    stub = BackendStub.from_config(backend, device_lease).start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture(autouse=True)
+def backend_scenario(request):
+    """
+    Escenario del stub del backend para la prueba: su nombre o el indicado con
+    @pytest.mark.backend_scenario("nombre") (para compartir respuestas grabadas).
+    Se activa antes de que valmex_driver abra la app.
+    """
+    if backend.MODE == "off":
+        yield None
+        return
+
+    marker = request.node.get_closest_marker("backend_scenario")
+    name = marker.args[0] if marker and marker.args else request.node.name
+    request.getfixturevalue("backend_stub").use_scenario(name)
+    yield name
+
+
+@pytest.fixture(scope="session")
+def valmex_session(request, device_lease):
+    """
+    Sesión de Appium compartida por las pruebas del worker.
+    Con APPIUM_SESSION_REUSE=True la usan todas las pruebas; si no, solo los
+    casos con filas de datos (data_row), cuando se recolectó alguno. En caso
+    contrario entrega None y cada prueba crea su propia sesión.
+    """
+    uses_data_rows = any(
+        "data_row" in getattr(item, "fixturenames", ()) for item in request.session.items
+    )
+    # En replay cada prueba reproduce su propio log (no hay sesión que compartir)
+    if not (appium.SESSION_REUSE or uses_data_rows) or appium.COMMAND_LOG == "replay":
+        yield None
+        return
+
+    manager = DriverSessionManager(
+        _valmex_capabilities(device_lease),
+        package_name=app.PACKAGE_NAME,
+        reset_strategy=appium.APP_RESET_STRATEGY,
+    )
+
+    yield manager
+
+    manager.shutdown()
+    summary = manager.report()
+    request.config.stash[session_stats_key] = summary
+    report_path = manager.save_report(str(evidence.BASE_OUTPUT_DIR))
+    print(
+        f"\n♻️ Reutilización de sesión: {summary['reuses']} reinicios, "
+        f"{summary['cold_starts']} arranques en frío, ~{summary['seconds_saved']}s ahorrados"
+    )
+    if report_path:
+        print(f"   Reporte: {report_path}")
+
 
 @pytest.fixture(scope="function")
-def valmex_driver(request):
+def valmex_driver(request, valmex_session, device_lease):
     """
     Fixture específico para la app Valmex.
-    Inicia y cierra el driver de Appium para cada función de prueba.
+    Inicia y cierra el driver de Appium para cada función de prueba
+    (o reutiliza la sesión compartida y reinicia la app si APPIUM_SESSION_REUSE=True).
     Gestiona automáticamente:
     - Inicio del driver
     - Grabación de video
@@ -28,14 +138,52 @@ def valmex_driver(request):
     print("SETUP: Iniciando driver para Valmex App")
     print("="*50)
 
-    # 1. Obtener las capacidades necesarias
-    caps = get_valmex_capabilities_installed()
-    
-    # 2. Inicializar tu gestor de driver
-    appium_driver = AppiumDriver(caps)
+    # Sin APPIUM_SESSION_REUSE solo los casos data_row comparten la sesión
+    shared_session = None
+    if valmex_session is not None:
+        if appium.SESSION_REUSE or "data_row" in request.fixturenames:
+            shared_session = valmex_session
+        else:
+            # Una sesión por dispositivo: se cierra la de las filas de datos (si
+            # hay) antes de abrir la propia; el siguiente caso data_row la reabre
+            valmex_session.shutdown()
 
-    # 3. Iniciar la sesión de Appium
-    driver_instance = appium_driver.start_driver()
+    # Reintento con checkpoints (TEST_STEP_CHECKPOINTS=True): sobre la sesión
+    # compartida la app no se reinicia para intentar reanudar tras el último paso verde
+    resume_candidate = (
+        test_config.STEP_CHECKPOINTS
+        and shared_session is not None
+        and getattr(request.node, "execution_count", 1) > 1
+        and StepCheckpoint.pending(request.node.nodeid)
+    )
+
+    if shared_session is not None:
+        # 1-3. Reutilizar la sesión compartida (reinicia la app, salvo que la
+        # prueba navegue con screen_navigator desde la pantalla en que quedó)
+        appium_driver = None
+        reset_app = "screen_navigator" not in request.fixturenames
+        driver_instance = shared_session.acquire(reset_app=reset_app and not resume_candidate)
+    else:
+        # 1. Obtener las capacidades necesarias (del dispositivo del worker)
+        caps = _valmex_capabilities(device_lease)
+
+        # 2. Inicializar tu gestor de driver (en replay, desde el log grabado de la prueba)
+        replay_log = None
+        if appium.COMMAND_LOG == "replay":
+            replay_log = log_path_for(request.node.nodeid)
+            if not os.path.exists(replay_log):
+                pytest.skip(f"Sin log grabado para replay: {replay_log}")
+        appium_driver = AppiumDriver(caps, replay_log=replay_log)
+
+        # 3. Iniciar la sesión de Appium
+        driver_instance = appium_driver.start_driver()
+
+    # 3a. Grabación de comandos (APPIUM_COMMAND_LOG=record): solo los de esta prueba
+    recorder = driver_instance.command_executor
+    if isinstance(recorder, RecordingAppiumConnection):
+        recorder.start_segment()
+    else:
+        recorder = None
 
     # 4. Obtener el nombre del test
     test_name = request.node.name 
@@ -44,16 +192,38 @@ def valmex_driver(request):
     VIDEO_ENABLED = True 
 
     # 6. Establecer el estado de la evidencia ANTES del yield
+    # (siempre un diccionario nuevo: con sesión compartida no se arrastra estado entre pruebas)
     setattr(driver_instance, 'evidence_state', {
         'is_recording': False,
         'test_name': test_name, 
         'step_count': 0
     })
+    if "data_row" in request.fixturenames:
+        driver_instance.evidence_state['data_row'] = request.getfixturevalue("data_row").as_dict()
     
     # 7. Iniciar la grabación si está habilitada
     if VIDEO_ENABLED:
         start_video_recording(driver_instance, test_name) 
 
+    # 7a. Checkpoints por paso (después de iniciar el video, que limpia las evidencias)
+    checkpoint_token = None
+    if test_config.STEP_CHECKPOINTS:
+        checkpoint = StepCheckpoint.for_test(request.node.nodeid, driver_instance)
+        if not resume_candidate:
+            checkpoint.reset()
+        elif not checkpoint.resume() and reset_app:
+            shared_session.appium_driver.reset_app(app.PACKAGE_NAME, appium.APP_RESET_STRATEGY)
+        checkpoint_token = StepRegistry.use_checkpoint(checkpoint)
+
+    # 7a'. Watchdog: cada paso con presupuesto de tiempo (TEST_STEP_BUDGET)
+    watchdog = StepWatchdog(driver_instance, test_name)
+    watchdog_token = StepRegistry.use_watchdog(watchdog)
+
+    # 7b. Perfilado de comandos (opcional, TEST_PROFILE_COMMANDS=True)
+    profiler = None
+    if test_config.PROFILE_COMMANDS:
+        profiler = CommandProfiler.attach(driver_instance, top_n=test_config.PROFILE_TOP_N)
+
     # 8. Entregar el driver al test
     yield driver_instance
     
@@ -75,6 +245,12 @@ def valmex_driver(request):
         except Exception:
             error_text = repr(rep)
 
+    StepRegistry.release_watchdog(watchdog_token)
+    if checkpoint_token is not None:
+        StepRegistry.release_checkpoint(checkpoint_token)
+        if status == "PASSED":
+            StepCheckpoint.discard(request.node.nodeid)
+
     # 10. Guardar estado final y error en el evidence_state del driver
     state = getattr(driver_instance, "evidence_state", {}) or {}
     state['final_status'] = status
@@ -82,8 +258,12 @@ def valmex_driver(request):
         state['error'] = error_text
     setattr(driver_instance, 'evidence_state', state)
 
-    # 11. Tomar captura del error si existe
-    if error_text:
+    # 11. Tomar captura del error si existe (si el watchdog abortó un paso, la
+    # captura de diagnóstico ya se tomó y el dispositivo puede seguir colgado)
+    if watchdog.tripped:
+        for trip in watchdog.trips:
+            print(f"🩺 Diagnóstico de '{trip['step']}': {trip['screenshot']} | {trip['page_source']}")
+    elif error_text:
         try:
             take_evidence(driver_instance, step_log=error_text)
             print("📸 Captura del paso fallido tomada y añadida con el log de error.")
@@ -95,13 +275,58 @@ def valmex_driver(request):
     print("="*50)
 
     # 12. Detener video y generar reportes
-    stop_and_save_video_if_recording(driver_instance, test_name)
-    appium_driver.stop_driver()
+    with watchdog.guard("detener_video", raise_on_trip=False):
+        stop_and_save_video_if_recording(driver_instance, test_name)
+    if profiler is not None:
+        profile = profiler.detach()
+        state['command_profile'] = profile
+        profile_path = profiler.save(str(evidence.BASE_OUTPUT_DIR / "perfiles"), test_name, profile)
+        print(f"⏱️ Perfil de comandos: {profile['total_commands']} comandos, {profile['total_ms']:.0f} ms -> {profile_path}")
+    replay_failure = None
+    if recorder is not None:
+        log_path = recorder.save(log_path_for(request.node.nodeid), test=request.node.nodeid)
+        if log_path:
+            print(f"📼 {len(recorder.entries)} comandos grabados en: {log_path}")
+    elif appium.COMMAND_LOG == "replay" and appium_driver is not None:
+        replay = appium_driver.get_driver().command_executor.report()
+        if replay["divergences"] or replay["remaining"]:
+            replay_failure = (
+                f"Replay divergente: {len(replay['divergences'])} divergencia(s), "
+                f"{replay['remaining']} comando(s) grabado(s) sin emitir ({replay['log']})"
+            )
+            # El reporte HTML debe reflejar la divergencia aunque el test haya pasado
+            status = "FAILED"
+            state['final_status'] = status
+            state['replay'] = replay
+            details = [
+                d.get("message") or f"#{d['position']}: no emitidos {', '.join(d.get('skipped', []))}"
+                for d in replay["divergences"]
+            ]
+            state['error'] = "\n\n".join(filter(None, [error_text, replay_failure, *details]))
+    if appium_driver is not None:
+        appium_driver.stop_driver()
+    # 13. Esperar a que las capturas en segundo plano estén en disco
+    flush_evidence(driver_instance)
     generate_html_report(driver_instance, status=status)
+    if replay_failure:
+        pytest.fail(replay_failure)
 
 
 @pytest.fixture(scope="function")
-def driver():
+def screen_navigator(valmex_driver):
+    """
+    Navegador por estados de pantalla sobre el driver de Valmex.
+    Con APPIUM_SESSION_REUSE=True la app no se reinicia entre pruebas que lo usan:
+    la prueba llama go_to(pantalla, password) y solo se recorre el camino faltante.
+    """
+    # Importación diferida: los page objects importan este conftest
+    from utils.navigator import ScreenNavigator
+
+    return ScreenNavigator(valmex_driver)
+
+
+@pytest.fixture(scope="function")
+def driver(device_lease):
     """
     Fixture simple sin gestión de evidencias (para pruebas básicas)
     """
@@ -109,7 +334,7 @@ def driver():
     print("🔧 SETUP: Iniciando driver de Appium")
     print("="*50)
     
-    caps = get_valmex_capabilities_installed()
+    caps = _valmex_capabilities(device_lease)
     appium_driver = AppiumDriver(caps)
     driver_instance = appium_driver.start_driver()
     
@@ -157,6 +382,73 @@ def pytest_runtest_makereport(item, call):
     if rep.when == "call":
         setattr(item, "rep_call", rep)
 
+
+def pytest_generate_tests(metafunc):
+    """
+    Expande las filas del libro de datos en un caso por fila:
+
+        @pytest.mark.data_rows("12_APP_....xlsx", group_by="contract")
+        def test_venta(self, valmex_driver, screen_navigator, data_row): ...
+
+    Las filas con el mismo contrato quedan juntas; todas comparten la sesión de
+    Appium y, con screen_navigator, un solo login.
+    """
+    if "data_row" not in metafunc.fixturenames:
+        return
+    marker = metafunc.definition.get_closest_marker("data_rows")
+    if marker is None:
+        raise pytest.UsageError(
+            f"{metafunc.definition.nodeid}: data_row requiere @pytest.mark.data_rows(libro)"
+        )
+    rows = load_rows(
+        marker.args[0],
+        sheet=marker.kwargs.get("sheet", "rows"),
+        defaults_sheet=marker.kwargs.get("defaults_sheet", "data"),
+    )
+    rows = order_rows(rows, group_by=marker.kwargs.get("group_by", "contract"))
+    metafunc.parametrize("data_row", rows, ids=[row.id for row in rows])
+
+
+def pytest_sessionstart(session):
+    """
+    Crea el pool de compresión de capturas en el hilo principal, antes de que
+    arranquen los hilos del pipeline de evidencias
+    """
+    CompressedImageCache.start()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Cierra el pool de compresión de capturas
+    """
+    CompressedImageCache.shutdown()
+
+
+def pytest_collection_modifyitems(session, config, items):
+    """
+    Registra los pasos step_XX_* de cada clase de prueba una sola vez,
+    para que take_evidence resuelva el paso activo sin inspeccionar la pila
+    """
+    for test_cls in {item.cls for item in items if getattr(item, "cls", None)}:
+        StepRegistry.register_class(test_cls)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """
+    Muestra el tiempo de arranque ahorrado al reutilizar la sesión de Appium
+    """
+    summary = terminalreporter.config.stash.get(session_stats_key, None)
+    if not summary:
+        return
+    terminalreporter.write_sep("=", "Reutilización de sesión Appium")
+    terminalreporter.write_line(
+        f"Arranques en frío: {summary['cold_starts']} "
+        f"({summary['cold_start_seconds']:.2f}s) | "
+        f"Reinicios de app ({summary['reset_strategy']}): {summary['reuses']} "
+        f"({summary['reset_seconds']:.2f}s)"
+    )
+    terminalreporter.write_line(f"Tiempo de arranque ahorrado: ~{summary['seconds_saved']}s")
+
         
 # Configuración de pytest
 def pytest_configure(config):
@@ -168,4 +460,12 @@ def pytest_configure(config):
     )
     config.addinivalue_line(
         "markers", "regression: marca pruebas de regresión"
+    )
+    config.addinivalue_line(
+        "markers",
+        "data_rows(path, sheet='rows', group_by='contract'): un caso por fila del libro de datos",
+    )
+    config.addinivalue_line(
+        "markers",
+        "backend_scenario(name): escenario grabado del stub del backend (BACKEND_STUB_MODE)",
     )
\ No newline at end of file
@@ -4,6 +4,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from appium.webdriver.common.appiumby import AppiumBy
 
+from utils.locators import compile_locator
+
 
 class ValmexHomePage:
     """
@@ -14,11 +16,16 @@ class ValmexHomePage:
     # 1. LOCALIZADORES (Usando el patrón (By_Method, Value))
     # NOTA: Ajusta estos localizadores si NO son Accessibility ID o si la app NO usa Android
     # ----------------------------------------------------
-    OPERACIONES_BTN = (
-        AppiumBy.XPATH,
-        '//android.view.View[@content-desc="Operaciones"]',
+    OPERACIONES_BTN = compile_locator(
+        (
+            AppiumBy.XPATH,
+            '//android.view.View[@content-desc="Operaciones"]',
+        )
     )
 
+    # Firma de pantalla: elemento que confirma que la página de inicio cargó
+    SCREEN_SIGNATURE = OPERACIONES_BTN
+
     DEFAULT_WAIT_TIME = 5
 
     def __init__(self, driver):
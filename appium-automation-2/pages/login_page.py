@@ -4,6 +4,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from appium.webdriver.common.appiumby import AppiumBy
 
+from utils.locators import compile_locator
+
 
 class ValmexLoginPage:
     """
@@ -14,14 +16,19 @@ class ValmexLoginPage:
     # 1. LOCALIZADORES (Usando el patrón (By_Method, Value))
     # NOTA: Ajusta estos localizadores si NO son Accessibility ID o si la app NO usa Android
     # ----------------------------------------------------
-    LOCATOR_TEXTO_ACTIVACION = (
-        AppiumBy.XPATH,
-        '//android.widget.EditText[@hint="Contraseña"]',
+    LOCATOR_TEXTO_ACTIVACION = compile_locator(
+        (
+            AppiumBy.XPATH,
+            '//android.widget.EditText[@hint="Contraseña"]',
+        )
     )
 
     # Localizador para el campo de contraseña (usa hint porque no tiene accessibility ID ni resource-id)
-    PASSWORD_FIELD = (AppiumBy.XPATH, '//android.widget.EditText[@hint="Contraseña"]')
-    ENTRAR_BUTTON = (AppiumBy.XPATH, '//android.widget.Button[@content-desc="Entrar"]')
+    PASSWORD_FIELD = compile_locator((AppiumBy.XPATH, '//android.widget.EditText[@hint="Contraseña"]'))
+    ENTRAR_BUTTON = compile_locator((AppiumBy.XPATH, '//android.widget.Button[@content-desc="Entrar"]'))
+
+    # Firma de pantalla: elementos que confirman que el login está listo
+    SCREEN_SIGNATURE = [PASSWORD_FIELD, ENTRAR_BUTTON]
 
     DEFAULT_WAIT_TIME = 5
 
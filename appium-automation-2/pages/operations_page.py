@@ -4,6 +4,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from appium.webdriver.common.appiumby import AppiumBy
 
+from utils.locators import compile_locator
+
 
 class ValmexOperationsPage:
     """
@@ -15,12 +17,17 @@ class ValmexOperationsPage:
     # NOTA: Ajusta estos localizadores si NO son Accessibility ID o si la app NO usa Android
     # ----------------------------------------------------
 
-    VENDER_BTN = (AppiumBy.XPATH, '//android.view.View[@content-desc="Vender"]')
-    DEPOSITAR_BTN = (
-        AppiumBy.XPATH,
-        '//android.view.View[@content-desc="Depositar a mi contrato"]',
+    VENDER_BTN = compile_locator((AppiumBy.XPATH, '//android.view.View[@content-desc="Vender"]'))
+    DEPOSITAR_BTN = compile_locator(
+        (
+            AppiumBy.XPATH,
+            '//android.view.View[@content-desc="Depositar a mi contrato"]',
+        )
     )
 
+    # Firma de pantalla: elemento que confirma que la página de operaciones cargó
+    SCREEN_SIGNATURE = DEPOSITAR_BTN
+
     DEFAULT_WAIT_TIME = 5
 
     def __init__(self, driver):
@@ -6,6 +6,15 @@ from selenium.webdriver.common.keys import Keys
 from appium.webdriver.common.appiumby import AppiumBy
 
 from conftest import driver
+from config.settings import test
+from utils.contract_roster import ContractRoster
+from utils.fund_catalog import FundCatalog
+from utils.gestures import GestureEngine
+from utils.locator_chain import LocatorChain
+from utils.locators import compile_locator
+from utils.page_snapshot import PageSnapshot
+from utils.text_matcher import TextMatcher
+from utils.command_stats import count_commands
 
 
 class ValmexVenderPage:
@@ -18,27 +27,107 @@ class ValmexVenderPage:
     # NOTA: Ajusta estos localizadores si NO son Accessibility ID o si la app NO usa Android
     # ----------------------------------------------------
 
-    SELECCIONE_FONDO = (AppiumBy.ACCESSIBILITY_ID, "Fondo\nSeleccione un fondo")
-    IMPORTE_FIELD = (AppiumBy.XPATH, '//android.widget.EditText[@hint="Importe"]')
-    CONTRACT_BY_NUMBER = lambda self, contract_number: (
-        AppiumBy.XPATH,
-        f'//android.view.View[contains(@content-desc, "Contrato - {contract_number}")]',
+    SELECCIONE_FONDO = compile_locator((AppiumBy.ACCESSIBILITY_ID, "Fondo\nSeleccione un fondo"))
+    IMPORTE_FIELD = compile_locator((AppiumBy.XPATH, '//android.widget.EditText[@hint="Importe"]'))
+    CONTRACT_BY_NUMBER = lambda self, contract_number: compile_locator(
+        (
+            AppiumBy.XPATH,
+            f'//android.view.View[contains(@content-desc, "Contrato - {contract_number}")]',
+        )
     )
-    VENDER_BUTTON = (AppiumBy.XPATH, '//android.widget.Button[@content-desc="Vender"]')
-    CONFIRMAR_OPERACION_BTN = (AppiumBy.ACCESSIBILITY_ID, "Confirmar operación")
-    DETALLE_DE_OPERACION_LABEL = (
-        AppiumBy.XPATH,
-        '//android.view.View[@content-desc="Detalle de operación"]',
+    VENDER_BUTTON = compile_locator((AppiumBy.XPATH, '//android.widget.Button[@content-desc="Vender"]'))
+    CONFIRMAR_OPERACION_BTN = compile_locator((AppiumBy.ACCESSIBILITY_ID, "Confirmar operación"))
+    DETALLE_DE_OPERACION_LABEL = compile_locator(
+        (
+            AppiumBy.XPATH,
+            '//android.view.View[@content-desc="Detalle de operación"]',
+        )
     )
 
-    VENDER_TOTAL = (AppiumBy.XPATH,'//android.widget.Switch[contains(@content-desc, "Vender posición total")]')
-    CUENTA_BANCARIA = (AppiumBy.XPATH, '//android.widget.Switch[@content-desc="Vender posición total"]') 
+    VENDER_TOTAL = compile_locator((AppiumBy.XPATH,'//android.widget.Switch[contains(@content-desc, "Vender posición total")]'))
+    CUENTA_BANCARIA = compile_locator((AppiumBy.XPATH, '//android.widget.Switch[@content-desc="Vender posición total"]'))
+    CONTRACT_ITEM = compile_locator(
+        (
+            AppiumBy.XPATH,
+            '//android.view.View[contains(@content-desc, "Contrato")]',
+        )
+    )
+
+    FUND_ITEM = compile_locator(
+        (
+            AppiumBy.XPATH,
+            "//android.widget.Button[contains(@content-desc, 'V')]",
+        )
+    )
+    LIQUIDATION_INFO = compile_locator(
+        (
+            AppiumBy.XPATH,
+            "//android.view.View[contains(@content-desc, 'Títulos') or contains(@content-desc, 'Importe') or contains(@content-desc, 'Comisión')]",
+        )
+    )
+
+    # Alternativas (en orden de prioridad) para leer el fondo seleccionado
+    SELECTED_FUND_CHAIN = LocatorChain(
+        "fondo_seleccionado",
+        [
+            # Buscar cualquier elemento que contenga patrón de fondo con valor
+            (
+                AppiumBy.XPATH,
+                "//android.widget.Button[contains(@content-desc, ' - $') and contains(@content-desc, 'Liquida')]",
+            ),
+            # Buscar fondos que empiecen con V (VALMX, VXGUBCP, etc.)
+            (
+                AppiumBy.XPATH,
+                "//android.widget.Button[starts-with(@content-desc, 'V') and contains(@content-desc, '$')]",
+            ),
+            # Buscar cualquier elemento con formato de fondo
+            (
+                AppiumBy.XPATH,
+                "//android.widget.Button[contains(@content-desc, '$') and contains(@content-desc, 'Liquida')]",
+            ),
+            # Buscar elementos que contengan nombres de fondos específicos conocidos
+            (
+                AppiumBy.XPATH,
+                "//android.widget.Button[contains(@content-desc, 'VALMX') or contains(@content-desc, 'VXGUB') or contains(@content-desc, 'VXREP') or contains(@content-desc, 'VXDEU') or contains(@content-desc, 'VLMX')]",
+            ),
+            # Buscar cualquier elemento que tenga el patrón completo
+            (
+                AppiumBy.XPATH,
+                "//android.widget.Button[contains(@content-desc, ' - $') and (contains(@content-desc, 'hoy') or contains(@content-desc, 'dias'))]",
+            ),
+            # Buscar elementos que empiecen por el nombre de Fondo
+            (
+                AppiumBy.XPATH,
+                "//android.widget.Button[starts-with(@content-desc, 'Fondo')]",
+            ),
+        ],
+    )
+
+    # Firmas de pantalla para las transiciones del flujo de venta
+    SCREEN_SIGNATURE = SELECCIONE_FONDO
+    CONTRACT_LIST_SIGNATURE = CONTRACT_ITEM
+    SELL_READY_SIGNATURE = VENDER_BUTTON
+    CONFIRMATION_SIGNATURE = CONFIRMAR_OPERACION_BTN
+    DETALLE_SIGNATURE = DETALLE_DE_OPERACION_LABEL
 
     DEFAULT_WAIT_TIME = 5
 
+    # Búsqueda de fondos: "auto" = UiScrollable en el dispositivo y, si no lo
+    # encuentra, ciclo de swipes; "swipe" = solo el ciclo de swipes
+    FUND_SEARCH_STRATEGY = "auto"
+    MAX_FUND_SCROLLS = 10
+
     def __init__(self, driver):
         self.driver = driver
         self.wait = WebDriverWait(self.driver, self.DEFAULT_WAIT_TIME)
+        self.last_fund_search_stats = None
+        # Fondos ya parseados en esta pantalla (content-desc -> FundInfo)
+        self.fund_catalog = FundCatalog()
+        # Contratos leídos al entrar a la lista (se invalida al navegar o hacer scroll)
+        self.contract_roster = ContractRoster(self.CONTRACT_ITEM)
+        self.gestures = GestureEngine(driver)
+        # Área desplazable de la lista de fondos (se toma del primer snapshot)
+        self._fund_list_region = None
 
     def validate_vender_page_loaded(self):
         """
@@ -202,16 +291,17 @@ class ValmexVenderPage:
     def _get_visible_funds(self):
         """
         Obtiene todos los fondos visibles en la pantalla actual.
+        Usa un único page_source evaluado localmente; los nodos devueltos
+        exponen get_attribute() sin peticiones y resuelven el elemento vivo al hacer click().
 
         Returns:
-            list: Lista de elementos de fondos visibles.
+            list: Lista de nodos (SnapshotNode) de fondos visibles.
         """
         try:
-            funds_locator = (
-                AppiumBy.XPATH,
-                "//android.widget.Button[contains(@content-desc, 'V')]",
-            )
-            return self.driver.find_elements(*funds_locator)
+            snapshot = PageSnapshot.capture(self.driver)
+            if self._fund_list_region is None:
+                self._fund_list_region = GestureEngine.scrollable_region(snapshot)
+            return snapshot.find_all(self.FUND_ITEM)
         except Exception:
             return []
 
@@ -219,7 +309,10 @@ class ValmexVenderPage:
         self, name=None, value_min=None, value_max=None, liquidity_days=None
     ):
         """
-        Busca un fondo que cumpla con los criterios especificados, usando scroll si es necesario.
+        Busca un fondo que cumpla con los criterios especificados.
+        Primero pide al dispositivo que haga el scroll hasta el fondo (UiScrollable);
+        si no lo encuentra, recurre al ciclo de swipes. Registra en
+        self.last_fund_search_stats la estrategia, las peticiones y los segundos.
 
         Args:
             name (str, optional): Nombre parcial o completo del fondo
@@ -227,164 +320,167 @@ class ValmexVenderPage:
             value_max (float, optional): Valor máximo del fondo
             liquidity_days (int, optional): Días de liquidez
 
+        Returns:
+            WebElement | SnapshotNode: Fondo encontrado (ambos exponen click()) o None.
+        """
+        with count_commands(self.driver) as stats:
+            fund_element = None
+            strategy = "uiscrollable"
+            # UiSelector solo puede filtrar por texto: nombre y liquidez
+            if self.FUND_SEARCH_STRATEGY == "auto" and (
+                name or liquidity_days is not None
+            ):
+                fund_element = self._find_fund_by_uiscrollable(
+                    name, value_min, value_max, liquidity_days
+                )
+            if fund_element is None:
+                strategy = "swipe"
+                fund_element = self._find_fund_by_swipe(
+                    name, value_min, value_max, liquidity_days
+                )
+
+        self.last_fund_search_stats = dict(
+            stats.as_dict(), strategy=strategy, found=fund_element is not None
+        )
+        print(
+            f"📈 Búsqueda de fondo ({strategy}): {stats.round_trips} peticiones "
+            f"en {stats.seconds:.2f}s"
+        )
+        return fund_element
+
+    def _find_fund_by_uiscrollable(
+        self, name=None, value_min=None, value_max=None, liquidity_days=None
+    ):
+        """
+        Busca el fondo con una sola consulta -android uiautomator: el dispositivo
+        hace scroll hasta el primer botón cuyo content-desc cumple nombre y liquidez.
+        El rango de valor se verifica después sobre un snapshot de la pantalla.
+        Si el rango no se cumple, la lista vuelve al inicio para que el ciclo de
+        swipes revise también los fondos que quedaron arriba.
+
+        Returns:
+            SnapshotNode: Fondo que cumple el rango de valor (WebElement si solo
+            se filtró por nombre y liquidez) o None si no se encontró
+        """
+        regex = self._fund_description_regex(name, liquidity_days)
+        java_regex = regex.replace("\\", "\\\\").replace('"', '\\"')
+        query = (
+            "new UiScrollable(new UiSelector().scrollable(true))"
+            f".setMaxSearchSwipes({self.MAX_FUND_SCROLLS})"
+            '.scrollIntoView(new UiSelector().className("android.widget.Button")'
+            f'.descriptionMatches("{java_regex}"))'
+        )
+        try:
+            elements = self.driver.find_elements(AppiumBy.ANDROID_UIAUTOMATOR, query)
+        except Exception as e:
+            print(f"⚠️ UiScrollable no disponible, se usará el ciclo de swipes: {e}")
+            return None
+
+        if elements and value_min is None and value_max is None:
+            return elements[0]
+
+        # El fondo ya está en pantalla: validar el rango de valor localmente
+        if elements:
+            for fund_node, fund_info in self.fund_catalog.add_visible(self._get_visible_funds()):
+                if fund_info.matches(name, value_min, value_max, liquidity_days):
+                    return fund_node
+
+        # scrollIntoView dejó la lista desplazada (hasta el fondo por nombre o
+        # hasta el final): el ciclo de swipes debe empezar desde arriba
+        self._scroll_fund_list_to_top()
+        return None
+
+    @staticmethod
+    def _fund_description_regex(name=None, liquidity_days=None):
+        """
+        Construye la expresión regular (sintaxis Java) del content-desc de un fondo.
+        Ejemplo: "VXGUBCP - $38.561459 (Liquida hoy)"
+
+        Returns:
+            str: Expresión regular para UiSelector.descriptionMatches
+        """
+        regex = "(?is)"
+        if name:
+            # Nombre (parcial, sin distinguir mayúsculas) antes del valor
+            regex += "[^$]*\\Q" + name + "\\E[^$]*\\$"
+        regex += ".*"
+        if liquidity_days == 0:
+            regex += "Liquida hoy.*"
+        elif liquidity_days is not None:
+            regex += f"Liquida en {int(liquidity_days)} dias?.*"
+        return regex
+
+    def _find_fund_by_swipe(
+        self, name=None, value_min=None, value_max=None, liquidity_days=None
+    ):
+        """
+        Busca el fondo haciendo swipes y revisando los fondos visibles en cada pantalla.
+
         Returns:
             WebElement: Elemento del fondo encontrado o None si no se encuentra.
         """
-        max_scrolls = 10  # Límite de scrolls para evitar bucle infinito
+        max_scrolls = self.MAX_FUND_SCROLLS  # Límite de scrolls para evitar bucle infinito
         scroll_count = 0
         previous_funds = set()
+        can_scroll_more = True
 
-        while scroll_count < max_scrolls:
+        while True:
             # Obtener fondos visibles actuales
             visible_funds = self._get_visible_funds()
 
             if not visible_funds:
                 break
 
-            # Crear identificadores únicos para los fondos actuales
+            # Los fondos ya vistos en swipes anteriores no se vuelven a parsear
             current_funds = set()
 
-            for fund_element in visible_funds:
-                try:
-                    fund_desc = fund_element.get_attribute("content-desc")
-                    if not fund_desc:
-                        continue
-
-                    current_funds.add(fund_desc)
-
-                    # Parsear la información del fondo
-                    fund_info = self._parse_fund_description(fund_desc)
-
-                    # Verificar si cumple con los criterios
-                    if self._matches_criteria(
-                        fund_info, name, value_min, value_max, liquidity_days
-                    ):
-                        return fund_element
-
-                except Exception as e:
-                    print(f"⚠️ Error procesando fondo: {e}")
-                    continue
+            for fund_element, fund_info in self.fund_catalog.add_visible(visible_funds):
+                current_funds.add(fund_info.description)
+                if fund_info.matches(name, value_min, value_max, liquidity_days):
+                    return fund_element
 
-            # Si ya vimos estos fondos, hemos llegado al final
+            # Fin de la lista: el gesto anterior indicó que no hay más contenido
+            # (o la pantalla no cambió, si el gesto falló)
+            if not can_scroll_more or scroll_count >= max_scrolls:
+                break
             if current_funds.issubset(previous_funds):
                 break
 
             previous_funds.update(current_funds)
 
-            # Hacer scroll hacia abajo
-            self._scroll_fund_list_down()
+            # El gesto termina cuando la lista queda quieta: no hace falta esperar
+            can_scroll_more = self._scroll_fund_list_down()
             scroll_count += 1
-            sleep(1)  # Breve pausa después del scroll
 
         return None
 
-    def _parse_fund_description(self, description):
+    def _scroll_fund_list_down(self):
         """
-        Parsea la descripción de un fondo para extraer su información.
-
-        Args:
-            description (str): Descripción completa del fondo
+        Hace scroll hacia abajo en la lista de fondos.
 
         Returns:
-            dict: Diccionario con la información parseada del fondo
+            bool: True si la lista puede seguir desplazándose (canScrollMore)
         """
         try:
-            # Ejemplo: "VXGUBCP - $38.561459 (Liquida hoy)"
-            # Ejemplo: "VLMXTEC - $6.700650 (Liquida en 1 dias)"
-
-            fund_info = {
-                "name": "",
-                "value": 0.0,
-                "liquidity_days": 0,
-                "full_description": description,
-            }
-
-            # Extraer nombre del fondo (antes del primer " - ")
-            if " - " in description:
-                fund_info["name"] = description.split(" - ")[0].strip()
-
-            # Extraer valor (buscar patrón $X.XXXXXX)
-            import re
-
-            value_match = re.search(r"\$(\d+\.?\d*)", description)
-            if value_match:
-                fund_info["value"] = float(value_match.group(1))
-
-            # Extraer días de liquidez
-            if "Liquida hoy" in description:
-                fund_info["liquidity_days"] = 0
-            elif "Liquida en" in description:
-                days_match = re.search(r"Liquida en (\d+) dias?", description)
-                if days_match:
-                    fund_info["liquidity_days"] = int(days_match.group(1))
-
-            return fund_info
-
+            return self.gestures.scroll("down", region=self._fund_list_region)
         except Exception as e:
-            print(f"⚠️ Error parseando descripción del fondo: {e}")
-            return {
-                "name": "",
-                "value": 0.0,
-                "liquidity_days": 0,
-                "full_description": description,
-            }
-
-    def _matches_criteria(
-        self, fund_info, name=None, value_min=None, value_max=None, liquidity_days=None
-    ):
-        """
-        Verifica si un fondo cumple con los criterios especificados.
-
-        Args:
-            fund_info (dict): Información del fondo
-            name, value_min, value_max, liquidity_days: Criterios de búsqueda
-
-        Returns:
-            bool: True si cumple con todos los criterios especificados
-        """
-        try:
-            # Verificar nombre (búsqueda parcial, case-insensitive)
-            if name and name.upper() not in fund_info["name"].upper():
-                return False
-
-            # Verificar valor mínimo
-            if value_min is not None and fund_info["value"] < value_min:
-                return False
-
-            # Verificar valor máximo
-            if value_max is not None and fund_info["value"] > value_max:
-                return False
-
-            # Verificar días de liquidez
-            if (
-                liquidity_days is not None
-                and fund_info["liquidity_days"] != liquidity_days
-            ):
-                return False
-
-            return True
-
-        except Exception:
+            print(f"⚠️ Error al hacer scroll: {e}")
             return False
 
-    def _scroll_fund_list_down(self):
+    def _scroll_fund_list_to_top(self):
         """
-        Hace scroll hacia abajo en la lista de fondos.
+        Regresa la lista de fondos al inicio (scroll hacia arriba hasta que
+        canScrollMore sea False o se agote MAX_FUND_SCROLLS).
         """
-        try:
-            # Obtener dimensiones de la pantalla
-            size = self.driver.get_window_size()
-
-            # Coordenadas para el scroll (desde 80% hacia 20% de la altura)
-            start_y = int(size["height"] * 0.8)
-            end_y = int(size["height"] * 0.2)
-            x = int(size["width"] * 0.5)
-
-            # Realizar scroll
-            self.driver.swipe(x, start_y, x, end_y, duration=1000)
-
-        except Exception as e:
-            print(f"⚠️ Error al hacer scroll: {e}")
+        if self._fund_list_region is None:
+            self._get_visible_funds()
+        for _ in range(self.MAX_FUND_SCROLLS):
+            try:
+                if not self.gestures.scroll("up", region=self._fund_list_region):
+                    break
+            except Exception as e:
+                print(f"⚠️ Error al regresar al inicio de la lista: {e}")
+                break
 
     def _get_selected_fund_value(self):
         """
@@ -396,75 +492,28 @@ class ValmexVenderPage:
         try:
             print("🔍 Buscando información del fondo seleccionado...")
 
-            # Localizadores más generales para capturar cualquier tipo de fondo
-            fund_locators = [
-                # Buscar cualquier elemento que contenga patrón de fondo con valor
-                (
-                    AppiumBy.XPATH,
-                    "//android.widget.Button[contains(@content-desc, ' - $') and contains(@content-desc, 'Liquida')]",
-                ),
-                # Buscar fondos que empiecen con V (VALMX, VXGUBCP, etc.)
-                (
-                    AppiumBy.XPATH,
-                    "//android.widget.Button[starts-with(@content-desc, 'V') and contains(@content-desc, '$')]",
-                ),
-                # Buscar cualquier elemento con formato de fondo
-                (
-                    AppiumBy.XPATH,
-                    "//android.widget.Button[contains(@content-desc, '$') and contains(@content-desc, 'Liquida')]",
-                ),
-                # Buscar elementos que contengan nombres de fondos específicos conocidos
-                (
-                    AppiumBy.XPATH,
-                    "//android.widget.Button[contains(@content-desc, 'VALMX') or contains(@content-desc, 'VXGUB') or contains(@content-desc, 'VXREP') or contains(@content-desc, 'VXDEU') or contains(@content-desc, 'VLMX')]",
-                ),
-                # Buscar cualquier elemento que tenga el patrón completo
-                (
-                    AppiumBy.XPATH,
-                    "//android.widget.Button[contains(@content-desc, ' - $') and (contains(@content-desc, 'hoy') or contains(@content-desc, 'dias'))]",
-                ),
-                # Buscar elementos que empiecen por el nombre de Fondo
-                (
-                    AppiumBy.XPATH,
-                    "//android.widget.Button[starts-with(@content-desc, 'Fondo')]",
-                ),
-            ]
+            # Un solo page_source para todos los candidatos; el ganador se recuerda
+            match = self.SELECTED_FUND_CHAIN.resolve(self.driver, screen="vender")
 
             fund_element = None
             fund_description = None
 
-            # Probar diferentes localizadores
-            for i, locator in enumerate(fund_locators):
-                try:
-                    print(f"🔎 Probando localizador {i+1}: {locator[1]}")
-                    elements = self.driver.find_elements(*locator)
-
-                    if elements:
-                        print(
-                            f"✅ Encontrados {len(elements)} elementos con localizador {i+1}"
-                        )
-
-                        # Revisar cada elemento encontrado
-                        for j, element in enumerate(elements):
-                            try:
-                                desc = element.get_attribute("content-desc")
-                                if desc:
-                                    fund_element = element
-                                    fund_description = desc
-                                    print(
-                                        f"✅ Fondo válido encontrado en elemento {j+1}: {desc}"
-                                    )
-                                    break
-                            except Exception as e:
-                                print(f"⚠️ Error procesando elemento {j+1}: {e}")
-                                continue
-
-                        if fund_element:
+            if match is not None:
+                print(
+                    f"✅ Encontrados {len(match.elements)} elementos con localizador "
+                    f"{match.index + 1} ({match.source})"
+                )
+                for j, element in enumerate(match.elements):
+                    try:
+                        desc = element.get_attribute("content-desc")
+                        if desc:
+                            fund_element = element
+                            fund_description = desc
+                            print(f"✅ Fondo válido encontrado en elemento {j+1}: {desc}")
                             break
-
-                except Exception as e:
-                    print(f"⚠️ Error con localizador {i+1}: {e}")
-                    continue
+                    except Exception as e:
+                        print(f"⚠️ Error procesando elemento {j+1}: {e}")
+                        continue
 
             if fund_element is None or fund_description is None:
                 print("❌ No se encontró información válida del fondo seleccionado")
@@ -472,8 +521,8 @@ class ValmexVenderPage:
 
             print(f"📋 Descripción del fondo encontrada: {fund_description}")
 
-            # Extraer el valor usando expresión regular más robusta
-            fund_value = self._extract_fund_value_from_description(fund_description)
+            # El catálogo parsea cada content-desc una sola vez por pantalla
+            fund_value = self.fund_catalog.get(fund_description).value
 
             if fund_value is not None:
                 print(f"💰 Valor del fondo extraído: ${fund_value}")
@@ -486,48 +535,6 @@ class ValmexVenderPage:
             print(f"❌ Error extrayendo valor del fondo: {e}")
             return None
 
-    def _extract_fund_value_from_description(self, description):
-        """
-        Extrae el valor numérico del fondo de su descripción.
-
-        Args:
-            description (str): Descripción completa del fondo
-
-        Returns:
-            float: Valor del fondo o None si no se puede extraer
-        """
-        try:
-            import re
-
-            # Patrones más robustos para extraer el valor
-            value_patterns = [
-                r" - \$(\d+\.?\d*)",  # " - $38.561459"
-                r"\$(\d+\.\d+)",  # "$38.561459"
-                r"\$(\d+)",  # "$38" (sin decimales)
-            ]
-
-            for pattern in value_patterns:
-                value_match = re.search(pattern, description)
-                if value_match:
-                    try:
-                        fund_value = float(value_match.group(1))
-                        print(
-                            f"💰 Valor extraído con patrón '{pattern}': ${fund_value}"
-                        )
-                        return fund_value
-                    except ValueError as e:
-                        print(
-                            f"⚠️ Error convirtiendo valor '{value_match.group(1)}' a float: {e}"
-                        )
-                        continue
-
-            print(f"❌ No se pudo extraer valor de: {description}")
-            return None
-
-        except Exception as e:
-            print(f"❌ Error extrayendo valor de la descripción: {e}")
-            return None
-
     def get_all_available_funds(self):
         """
         Obtiene información de todos los fondos disponibles (incluyendo scroll).
@@ -544,8 +551,9 @@ class ValmexVenderPage:
             max_scrolls = 10
             scroll_count = 0
             seen_funds = set()
+            can_scroll_more = True
 
-            while scroll_count < max_scrolls:
+            while True:
                 visible_funds = self._get_visible_funds()
 
                 if not visible_funds:
@@ -553,24 +561,17 @@ class ValmexVenderPage:
 
                 new_funds_found = False
 
-                for fund_element in visible_funds:
-                    try:
-                        fund_desc = fund_element.get_attribute("content-desc")
-                        if fund_desc and fund_desc not in seen_funds:
-                            fund_info = self._parse_fund_description(fund_desc)
-                            all_funds.append(fund_info)
-                            seen_funds.add(fund_desc)
-                            new_funds_found = True
-
-                    except Exception as e:
-                        print(f"⚠️ Error procesando fondo: {e}")
+                for _, fund_info in self.fund_catalog.add_visible(visible_funds):
+                    if fund_info.description not in seen_funds:
+                        all_funds.append(fund_info.as_dict())
+                        seen_funds.add(fund_info.description)
+                        new_funds_found = True
 
-                if not new_funds_found:
+                if not new_funds_found or not can_scroll_more or scroll_count >= max_scrolls:
                     break
 
-                self._scroll_fund_list_down()
+                can_scroll_more = self._scroll_fund_list_down()
                 scroll_count += 1
-                sleep(1)
 
             print(f"✅ Se encontraron {len(all_funds)} fondos en total")
             return all_funds
@@ -671,10 +672,9 @@ class ValmexVenderPage:
         try:
             print("📊 Obteniendo información del cálculo de liquidación...")
 
-            # Buscar elementos que contengan información de liquidación
-            liquidation_elements = self.driver.find_elements(
-                AppiumBy.XPATH,
-                "//android.view.View[contains(@content-desc, 'Títulos') or contains(@content-desc, 'Importe') or contains(@content-desc, 'Comisión')]",
+            # Buscar elementos que contengan información de liquidación (un solo page_source)
+            liquidation_elements = PageSnapshot.capture(self.driver).find_all(
+                self.LIQUIDATION_INFO
             )
 
             liquidation_info = {
@@ -686,7 +686,7 @@ class ValmexVenderPage:
             }
 
             for element in liquidation_elements:
-                content_desc = element.get_attribute("content-desc")
+                content_desc = element.content_desc
                 if not content_desc:
                     continue
 
@@ -781,10 +781,14 @@ class ValmexVenderPage:
             bool: True si la selección fue exitosa, False en caso contrario.
         """
         try:
-            contract_locator = (
-                AppiumBy.XPATH,
-                f'//android.view.View[contains(@content-desc, "Contrato - {contract_number}")]',
-            )
+            # Con la lista ya leída en esta pantalla se toca el centro de sus bounds
+            if self.contract_roster.loaded:
+                contract = self.contract_roster.by_number(self.driver, contract_number)
+                if contract is not None and contract.center is not None:
+                    print(f"✅ Seleccionando contrato: {contract.full_description}")
+                    return self._tap_contract(contract)
+
+            contract_locator = self.CONTRACT_BY_NUMBER(contract_number)
 
             contract_element = self.wait.until(
                 EC.element_to_be_clickable(contract_locator)
@@ -795,6 +799,7 @@ class ValmexVenderPage:
             print(f"✅ Seleccionando contrato: {contract_info}")
 
             contract_element.click()
+            self.contract_roster.invalidate()
             return True
 
         except TimeoutException:
@@ -821,6 +826,7 @@ class ValmexVenderPage:
             print(f"✅ Seleccionando primer contrato: {contract_info}")
 
             contract_element.click()
+            self.contract_roster.invalidate()
             return True
 
         except TimeoutException:
@@ -830,49 +836,22 @@ class ValmexVenderPage:
             print(f"❌ Error al seleccionar contrato: {e}")
             return False
 
-    def get_all_contracts(self):
+    def get_all_contracts(self, refresh=False):
         """
         Obtiene todos los contratos disponibles.
+        La lista se lee una sola vez por entrada a la pantalla (ver ContractRoster).
+
+        Args:
+            refresh (bool): Fuerza una nueva lectura de la pantalla
 
         Returns:
             list: Lista de diccionarios con información de cada contrato
         """
         try:
-            contracts_locator = (
-                AppiumBy.XPATH,
-                '//android.view.View[contains(@content-desc, "Contrato")]',
-            )
-
-            contract_elements = self.driver.find_elements(*contracts_locator)
-
-            contracts = []
-            for i, element in enumerate(contract_elements):
-                content_desc = element.get_attribute("content-desc")
-
-                # Parse contract number and amount from content-desc
-                if content_desc:
-                    parts = content_desc.split("\\n")
-                    contract_line = parts[0] if parts else content_desc
-                    amount = parts[1] if len(parts) > 1 else "N/A"
-
-                    # Extract contract number
-                    contract_number = (
-                        contract_line.replace("Contrato - ", "")
-                        if "Contrato - " in contract_line
-                        else "Unknown"
-                    )
-
-                    contracts.append(
-                        {
-                            "index": i,
-                            "contract_number": contract_number,
-                            "amount": amount,
-                            "full_description": content_desc,
-                            "bounds": element.get_attribute("bounds"),
-                        }
-                    )
-
-            return contracts
+            return [
+                contract.as_dict()
+                for contract in self.contract_roster.contracts(self.driver, refresh=refresh)
+            ]
 
         except Exception as e:
             print(f"❌ Error al obtener contratos: {e}")
@@ -889,7 +868,7 @@ class ValmexVenderPage:
             bool: True si la selección fue exitosa, False en caso contrario.
         """
         try:
-            contracts = self.get_all_contracts()
+            contracts = self.contract_roster.contracts(self.driver)
 
             if not contracts:
                 print("❌ No se encontraron contratos disponibles")
@@ -901,17 +880,81 @@ class ValmexVenderPage:
                 )
                 return False
 
-            contract_info = contracts[index]
+            contract = contracts[index]
             print(
-                f"✅ Seleccionando contrato por índice {index}: {contract_info['full_description']}"
+                f"✅ Seleccionando contrato por índice {index}: {contract.full_description}"
             )
 
-            return self.select_contract_by_number(contract_info["contract_number"])
+            if contract.center is None:
+                return self.select_contract_by_number(contract.contract_number)
+            return self._tap_contract(contract)
 
         except Exception as e:
             print(f"❌ Error al seleccionar contrato por índice: {e}")
             return False
 
+    def _tap_contract(self, contract, expected_signature=None):
+        """
+        Toca el centro de los bounds guardados del contrato y confirma la
+        transición (TEST_SCREEN_WAIT_TIMEOUT). Si la pantalla esperada no
+        apareció, se reintenta una sola vez y solo si un snapshot confirma que
+        la lista de contratos sigue en pantalla con el contrato en los mismos
+        bounds: un segundo tap a coordenadas sobre la pantalla siguiente podría
+        disparar otra acción del flujo de venta.
+
+        Args:
+            contract (ContractInfo): Contrato de la lista en caché
+            expected_signature: Firma de la pantalla siguiente (por defecto SELL_READY_SIGNATURE)
+
+        Returns:
+            bool: True si la pantalla esperada apareció tras el tap
+        """
+        expected_signature = expected_signature or self.SELL_READY_SIGNATURE
+        wait = WebDriverWait(self.driver, test.SCREEN_WAIT_TIMEOUT)
+
+        for attempt in range(2):
+            x, y = contract.center
+            self.driver.execute_script("mobile: clickGesture", {"x": x, "y": y})
+            try:
+                wait.until(EC.presence_of_element_located(expected_signature))
+                self.contract_roster.invalidate()
+                return True
+            except TimeoutException:
+                if attempt or not self._can_retap_contract(contract, expected_signature):
+                    break
+                print("⚠️ El tap no cambió de pantalla; se reintenta sobre los mismos bounds")
+
+        print("❌ No se pudo seleccionar el contrato con los bounds de la lista")
+        self.contract_roster.invalidate()
+        return False
+
+    def _can_retap_contract(self, contract, expected_signature):
+        """
+        Verifica con un snapshot que es seguro volver a tocar el contrato: la
+        pantalla esperada no apareció, la lista de contratos sigue visible y
+        el contrato conserva sus bounds.
+
+        Returns:
+            bool: True si el reintento del tap es seguro
+        """
+        snapshot = PageSnapshot.capture(self.driver)
+        if snapshot.exists(expected_signature):
+            return False
+        if not snapshot.exists(self.CONTRACT_LIST_SIGNATURE):
+            print("⚠️ La lista de contratos ya no está en pantalla; no se reintenta el tap")
+            return False
+        current = next(
+            (
+                c for c in self.contract_roster.read(self.driver, snapshot)
+                if c.contract_number == contract.contract_number
+            ),
+            None,
+        )
+        if current is None or current.bounds != contract.bounds:
+            print(f"⚠️ El contrato {contract.contract_number} cambió de posición; no se reintenta el tap")
+            return False
+        return True
+
     def get_contract_amount(self, contract_number):
         """
         Obtiene el monto de un contrato específico.
@@ -923,11 +966,9 @@ class ValmexVenderPage:
             str: Monto del contrato o None si no se encuentra
         """
         try:
-            contracts = self.get_all_contracts()
-
-            for contract in contracts:
-                if contract["contract_number"] == contract_number:
-                    return contract["amount"]
+            contract = self.contract_roster.by_number(self.driver, contract_number)
+            if contract is not None:
+                return contract.amount
 
             print(f"❌ No se encontró el contrato {contract_number}")
             return None
@@ -955,6 +996,7 @@ class ValmexVenderPage:
 
             if is_enabled == "true" and is_clickable == "true":
                 vender_button.click()
+                self.contract_roster.invalidate()
                 return True
             else:
                 print("❌ Botón Vender no está habilitado")
@@ -1009,89 +1051,78 @@ class ValmexVenderPage:
         Returns:
             bool: True si el texto se encuentra, False en caso contrario
         """
-        try:
-            print(f"🔍 Buscando texto: '{text_to_find}'")
+        return bool(
+            self.validate_texts_on_page([text_to_find], partial_match, max_scrolls)
+        )
 
-            scroll_count = 0
-            seen_content = set()
+    def validate_texts_on_page(self, expected_texts, partial_match=True, max_scrolls=0):
+        """
+        Valida varios textos (o expresiones regulares) con una sola lectura de la
+        pantalla por posición de scroll; todos los patrones se evalúan a la vez.
+        Solo se hace scroll mientras falte alguno.
 
-            while scroll_count < max_scrolls:
-                # Obtener todo el contenido visible actual
-                current_content = self._get_all_visible_text()
+        Args:
+            expected_texts (list): Textos literales o re.Pattern
+            partial_match (bool): Si True, busca coincidencia parcial. Si False, coincidencia exacta
+            max_scrolls (int): Número máximo de scrolls a realizar (0 = solo la vista actual)
+
+        Returns:
+            TextReport: Verdadero si se encontraron todos; detalle por patrón con el elemento
+        """
+        matcher = TextMatcher(expected_texts, partial_match=partial_match)
+        found = {}
+        try:
+            print(f"🔍 Buscando {len(matcher.patterns)} texto(s) en la página")
 
-                # Verificar si el texto existe en el contenido actual
-                if self._text_found_in_content(
-                    text_to_find, current_content, partial_match
-                ):
-                    print(f"✅ Texto '{text_to_find}' encontrado en la página")
-                    return True
+            scroll_count = 0
+            can_scroll_more = True
+            pending = set(range(len(matcher.patterns)))
 
-                # Crear un identificador único del contenido actual
-                content_signature = hash(str(sorted(current_content)))
+            while True:
+                # Una lectura de la pantalla para todos los patrones pendientes
+                found.update(matcher.match(self._get_visible_text_nodes(), pending))
+                pending -= set(found)
 
-                # Si ya vimos este contenido, hemos llegado al final
-                if content_signature in seen_content:
-                    print(
-                        "🔄 Se detectó contenido repetido, se alcanzó el final de la página"
-                    )
+                # El último gesto indicó que no hay más contenido
+                if not pending or not can_scroll_more or scroll_count >= max_scrolls:
                     break
 
-                seen_content.add(content_signature)
-
-                # Hacer scroll hacia abajo
                 print(f"📜 Haciendo scroll {scroll_count + 1}/{max_scrolls}")
-                self._scroll_page_down()
+                can_scroll_more = self._scroll_page_down()
                 scroll_count += 1
-                sleep(1)  # Pausa para que cargue el contenido
-
-            print(
-                f"❌ Texto '{text_to_find}' no encontrado después de {scroll_count} scrolls"
-            )
-            return False
 
         except Exception as e:
             print(f"❌ Error al buscar texto en la página: {e}")
-            return False
 
-    def _get_all_visible_text(self):
+        report = matcher.report(found)
+        print(report.summary())
+        return report
+
+    def _get_visible_text_nodes(self):
         """
-        Obtiene todo el texto visible en la pantalla actual.
+        Obtiene los textos visibles de la pantalla actual con su nodo.
 
         Returns:
-            list: Lista con todos los textos visibles
+            list: Tuplas (texto, SnapshotNode); primero content-desc y luego text
         """
         try:
-            # Buscar todos los elementos que contengan texto
-            text_elements = self.driver.find_elements(
-                AppiumBy.XPATH,
-                "//*[@content-desc and string-length(@content-desc) > 0]",
-            )
+            # Un solo page_source para todos los textos de la pantalla
+            snapshot = PageSnapshot.capture(self.driver)
 
             visible_texts = []
 
-            for element in text_elements:
-                try:
-                    content_desc = element.get_attribute("content-desc")
-                    if content_desc and content_desc.strip():
-                        visible_texts.append(content_desc.strip())
-                except Exception:
-                    continue
+            for element in snapshot.find_all(
+                "//*[@content-desc and string-length(@content-desc) > 0]"
+            ):
+                content_desc = element.content_desc
+                if content_desc.strip():
+                    visible_texts.append((content_desc.strip(), element))
 
             # También buscar elementos con texto (para casos donde no hay content-desc)
-            try:
-                text_nodes = self.driver.find_elements(
-                    AppiumBy.XPATH, "//*[@text and string-length(@text) > 0]"
-                )
-
-                for element in text_nodes:
-                    try:
-                        text_content = element.get_attribute("text")
-                        if text_content and text_content.strip():
-                            visible_texts.append(text_content.strip())
-                    except Exception:
-                        continue
-            except Exception:
-                pass
+            for element in snapshot.find_all("//*[@text and string-length(@text) > 0]"):
+                text_content = element.text
+                if text_content.strip():
+                    visible_texts.append((text_content.strip(), element))
 
             return visible_texts
 
@@ -1099,76 +1130,46 @@ class ValmexVenderPage:
             print(f"⚠️ Error obteniendo texto visible: {e}")
             return []
 
-    def _text_found_in_content(self, text_to_find, content_list, partial_match=True):
+    def _get_all_visible_text(self):
         """
-        Verifica si el texto buscado existe en la lista de contenido.
-
-        Args:
-            text_to_find (str): Texto a buscar
-            content_list (list): Lista de textos donde buscar
-            partial_match (bool): Si True, busca coincidencia parcial
+        Obtiene todo el texto visible en la pantalla actual.
 
         Returns:
-            bool: True si el texto se encuentra
+            list: Lista con todos los textos visibles
         """
-        try:
-            text_to_find_clean = text_to_find.strip().lower()
-
-            for content in content_list:
-                content_clean = content.lower()
-
-                if partial_match:
-                    if text_to_find_clean in content_clean:
-                        print(f"✅ Coincidencia parcial encontrada en: '{content}'")
-                        return True
-                else:
-                    if text_to_find_clean == content_clean:
-                        print(f"✅ Coincidencia exacta encontrada: '{content}'")
-                        return True
-
-            return False
-
-        except Exception as e:
-            print(f"⚠️ Error comparando texto: {e}")
-            return False
+        return [text for text, _ in self._get_visible_text_nodes()]
 
     def _scroll_page_down(self):
         """
         Hace scroll hacia abajo en toda la página.
+
+        Returns:
+            bool: True si la página puede seguir desplazándose (canScrollMore)
         """
         try:
-            # Obtener dimensiones de la pantalla
-            size = self.driver.get_window_size()
-
-            # Coordenadas para el scroll (desde 80% hacia 20% de la altura)
-            start_y = int(size["height"] * 0.8)
-            end_y = int(size["height"] * 0.2)
-            x = int(size["width"] * 0.5)
-
-            # Realizar scroll
-            self.driver.swipe(x, start_y, x, end_y, duration=1000)
+            # Los bounds de la lista de contratos dejan de ser válidos
+            self.contract_roster.invalidate()
+            return self.gestures.scroll("down")
 
         except Exception as e:
             print(f"⚠️ Error al hacer scroll en la página: {e}")
+            return False
 
     def _scroll_page_up(self):
         """
         Hace scroll hacia arriba en toda la página.
+
+        Returns:
+            bool: True si la página puede seguir desplazándose (canScrollMore)
         """
         try:
-            # Obtener dimensiones de la pantalla
-            size = self.driver.get_window_size()
-
-            # Coordenadas para el scroll (desde 20% hacia 80% de la altura)
-            start_y = int(size["height"] * 0.2)
-            end_y = int(size["height"] * 0.8)
-            x = int(size["width"] * 0.5)
-
-            # Realizar scroll
-            self.driver.swipe(x, start_y, x, end_y, duration=1000)
+            # Los bounds de la lista de contratos dejan de ser válidos
+            self.contract_roster.invalidate()
+            return self.gestures.scroll("up")
 
         except Exception as e:
             print(f"⚠️ Error al hacer scroll hacia arriba: {e}")
+            return False
 
     def validate_error_message_exists(self, error_message):
         """
@@ -1217,24 +1218,27 @@ class ValmexVenderPage:
             all_content = []
             scroll_count = 0
             seen_content = set()
+            can_scroll_more = True
 
-            while scroll_count < max_scrolls:
+            while True:
                 current_content = self._get_all_visible_text()
 
                 # Agregar contenido nuevo
+                new_content = False
                 for content in current_content:
                     if content not in seen_content:
                         all_content.append(content)
                         seen_content.add(content)
+                        new_content = True
 
-                # Verificar si hay contenido nuevo
-                content_signature = hash(str(sorted(current_content)))
-                if content_signature in seen_content and scroll_count > 0:
+                # Fin: el gesto indicó que no hay más contenido o la pantalla no cambió
+                if not can_scroll_more or scroll_count >= max_scrolls:
+                    break
+                if scroll_count > 0 and not new_content:
                     break
 
-                self._scroll_page_down()
+                can_scroll_more = self._scroll_page_down()
                 scroll_count += 1
-                sleep(1)
 
             print(f"✅ Se obtuvo contenido de {len(all_content)} elementos de texto")
             return all_content
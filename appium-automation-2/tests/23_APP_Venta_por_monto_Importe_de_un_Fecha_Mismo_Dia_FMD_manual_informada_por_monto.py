@@ -2,7 +2,6 @@
 Casos de prueba para la aplicación Valmex Móvil
 """
 
-from time import sleep
 from conftest import driver
 from pages.home_page import ValmexHomePage
 from pages.login_page import ValmexLoginPage
@@ -13,6 +12,7 @@ import os
 
 
 from utils.evidences import take_evidence
+from utils.waits import ScreenWaiter
 import subprocess
 
 
@@ -45,6 +45,7 @@ class TestValmexApp:
         self.home_page = ValmexHomePage(valmex_driver)
         self.operations_page = ValmexOperationsPage(valmex_driver)
         self.vender_page = ValmexVenderPage(valmex_driver)
+        self.waiter = ScreenWaiter(valmex_driver)
 
         # get current location to verify
         current_location = valmex_driver.location
@@ -70,7 +71,9 @@ class TestValmexApp:
             self.login_page.verificar_existencia_texto01() is True
         ), "❌ FALLA DE ASSERT: El texto clave de inicio no se encontró después de 15s."
         take_evidence(driver)
-        sleep(10)
+        self.waiter.wait_for(
+            ValmexLoginPage.SCREEN_SIGNATURE, step="step_01_open_and_validate"
+        )
 
     def step_02_ingresar_password(self, driver):
         """
@@ -84,7 +87,9 @@ class TestValmexApp:
         ), " No fue posible realizar la accion de inicio de sesion."
         driver.hide_keyboard()
         take_evidence(driver)
-        sleep(20)  # Espera para asegurar que la pantalla de inicio se haya cargado
+        self.waiter.wait_for(
+            ValmexHomePage.SCREEN_SIGNATURE, step="step_02_ingresar_password", timeout=45
+        )
         # Validar que la página de inicio se haya cargado correctamente
         assert (
             self.home_page.validate_home_page_loaded() is True
@@ -98,7 +103,9 @@ class TestValmexApp:
         print("step_03_click_operaciones")
         self.home_page.click_operaciones()
         take_evidence(driver)
-        sleep(5)  # Espera para asegurar que la pantalla de Operaciones se haya cargado
+        self.waiter.wait_for(
+            ValmexOperationsPage.SCREEN_SIGNATURE, step="step_03_click_operaciones"
+        )
         # Validar que la página de Operaciones se haya cargado correctamente
         assert (
             self.operations_page.validate_operations_page_loaded() is True
@@ -114,7 +121,9 @@ class TestValmexApp:
             self.operations_page.click_vender() is True
         ), " No fue posible realizar la accion de clic en vender."
         take_evidence(driver)
-        sleep(5)  # Espera para asegurar que la pantalla de Vender se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.SCREEN_SIGNATURE, step="step_04_click_vender"
+        )
         # Validar que la página de Vender se haya cargado correctamente
         assert (
             self.vender_page.validate_vender_page_loaded() is True
@@ -145,7 +154,9 @@ class TestValmexApp:
         ), " No fue posible ingresar el monto y continuar."
         take_evidence(driver)
         self.vender_page._scroll_page_down()
-        sleep(5)  # Espera para asegurar que la pantalla de confirmación se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.CONTRACT_LIST_SIGNATURE, step="step_06_ingreso_del_importe_de_venta"
+        )
 
     def step_07_Ejecucion_de_la_venta(self, driver):
         """
@@ -157,12 +168,16 @@ class TestValmexApp:
             self.vender_page.select_contract_by_number(self.data["contract"]) is True
         ), " No fue posible seleccionar el contrato por número."
         take_evidence(driver)
-        sleep(5)  # Espera para asegurar que la pantalla de confirmación se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.SELL_READY_SIGNATURE, step="step_07_Ejecucion_de_la_venta"
+        )
         assert (
             self.vender_page.click_vender_button() is True
         ), " No fue posible ejecutar la venta."
         take_evidence(driver)
-        sleep(5)  # Espera para asegurar que la pantalla de confirmación se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.CONFIRMATION_SIGNATURE, step="step_07_Ejecucion_de_la_venta"
+        )
         # Valida que la página de confirmación se haya cargado correctamente
         assert (
             self.vender_page.validate_confirmation_page_loaded() is True
@@ -178,9 +193,9 @@ class TestValmexApp:
             self.vender_page.click_confirmar_operacion() is True
         ), " No fue posible confirmar la venta."
         take_evidence(driver)
-        sleep(
-            15
-        )  # Espera para asegurar que la pantalla de confirmación se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.DETALLE_SIGNATURE, step="step_08_validacion_de_carga_de_token_movil"
+        )
 
     def step_09_validacion_de_datos_del_comprobante_de_venta(self, driver):
         """
@@ -192,7 +207,4 @@ class TestValmexApp:
         assert (
             self.vender_page.validate_detalle_de_operacion_page_loaded() is True
         ), "❌ FALLA DE ASSERT: La página de Detalle de Operación no se cargó correctamente."
-        take_evidence(driver)
-        sleep(
-            5
-        ) 
\ No newline at end of file
+        take_evidence(driver)
\ No newline at end of file
@@ -2,7 +2,6 @@
 Casos de prueba para la aplicación Valmex Móvil
 """
 
-from time import sleep
 from conftest import driver
 from pages.home_page import ValmexHomePage
 from pages.login_page import ValmexLoginPage
@@ -10,6 +9,7 @@ from pages.operations_page import ValmexOperationsPage
 from pages.vender_page import ValmexVenderPage
 
 from utils.evidences import take_evidence
+from utils.waits import ScreenWaiter
 import subprocess
 
 
@@ -28,6 +28,7 @@ class TestValmexApp:
         self.home_page = ValmexHomePage(valmex_driver)
         self.operations_page = ValmexOperationsPage(valmex_driver)
         self.vender_page = ValmexVenderPage(valmex_driver)
+        self.waiter = ScreenWaiter(valmex_driver)
 
         # get current location to verify
         current_location = valmex_driver.location
@@ -65,7 +66,9 @@ class TestValmexApp:
         ), " No fue posible realizar la accion de inicio de sesion."
         driver.hide_keyboard()
         take_evidence(driver)
-        sleep(30)  # Espera para asegurar que la pantalla de inicio se haya cargado
+        self.waiter.wait_for(
+            ValmexHomePage.SCREEN_SIGNATURE, step="step_02_ingresar_password", timeout=45
+        )
         # Validar que la página de inicio se haya cargado correctamente
         assert (
             self.home_page.validate_home_page_loaded() is True
@@ -79,7 +82,9 @@ class TestValmexApp:
         print("step_03_click_operaciones")
         self.home_page.click_operaciones()
         take_evidence(driver)
-        sleep(5)  # Espera para asegurar que la pantalla de Operaciones se haya cargado
+        self.waiter.wait_for(
+            ValmexOperationsPage.SCREEN_SIGNATURE, step="step_03_click_operaciones"
+        )
         # Validar que la página de Operaciones se haya cargado correctamente
         assert (
             self.operations_page.validate_operations_page_loaded() is True
@@ -95,7 +100,9 @@ class TestValmexApp:
             self.operations_page.click_vender() is True
         ), " No fue posible realizar la accion de clic en vender."
         take_evidence(driver)
-        sleep(5)  # Espera para asegurar que la pantalla de Vender se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.SCREEN_SIGNATURE, step="step_04_click_vender"
+        )
         # Validar que la página de Vender se haya cargado correctamente
         assert (
             self.vender_page.validate_vender_page_loaded() is True
@@ -124,7 +131,9 @@ class TestValmexApp:
         ), " No fue posible ingresar el número de títulos y continuar."
         driver.hide_keyboard()
         take_evidence(driver)
-        sleep(5)  # Espera para asegurar que la pantalla de confirmación se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.CONTRACT_LIST_SIGNATURE, step="step_06_ingreso_de_titulos_a_vender"
+        )
 
     def step_07_Ejecucion_de_la_venta(self, driver):
         """
@@ -136,12 +145,16 @@ class TestValmexApp:
             self.vender_page.select_contract_by_number("244231") is True
         ), " No fue posible seleccionar el contrato por número."
         take_evidence(driver)
-        sleep(5)  # Espera para asegurar que la pantalla de confirmación se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.SELL_READY_SIGNATURE, step="step_07_Ejecucion_de_la_venta"
+        )
         assert (
             self.vender_page.click_vender_button() is True
         ), " No fue posible ejecutar la venta."
         take_evidence(driver)
-        sleep(5)  # Espera para asegurar que la pantalla de confirmación se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.CONFIRMATION_SIGNATURE, step="step_07_Ejecucion_de_la_venta"
+        )
         # Valida que la página de confirmación se haya cargado correctamente
         assert (
             self.vender_page.validate_confirmation_page_loaded() is True
@@ -157,9 +170,9 @@ class TestValmexApp:
             self.vender_page.click_confirmar_operacion() is True
         ), " No fue posible confirmar la venta."
         take_evidence(driver)
-        sleep(
-            15
-        )  # Espera para asegurar que la pantalla de confirmación se haya cargado
+        self.waiter.wait_for(
+            ValmexVenderPage.DETALLE_SIGNATURE, step="step_08_validacion_de_carga_de_token_movil"
+        )
 
     def step_09_validacion_de_datos_del_comprobante_de_venta(self, driver):
         """
@@ -172,6 +185,3 @@ class TestValmexApp:
             self.vender_page.validate_detalle_de_operacion_page_loaded() is True
         ), "❌ FALLA DE ASSERT: La página de Detalle de Operación no se cargó correctamente."
         take_evidence(driver)
-        sleep(
-            5
-        )  # Espera para asegurar que la pantalla de detalle de operación se haya cargado
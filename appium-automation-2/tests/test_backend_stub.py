@@ -0,0 +1,103 @@
+"""
+Stub del backend con mitmproxy (utils.backend_stub)
+Graba las respuestas de un backend local lento a través de mitmdump y las
+reproduce con el backend apagado: mismas respuestas, en el mismo orden para
+las peticiones repetidas, y 502 para lo no grabado, también por HTTPS (CONNECT)
+sin conectar con el backend. Requiere mitmproxy; no requiere dispositivo (el
+proxy del emulador no se configura).
+"""
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import urllib3
+
+from utils.backend_stub import BackendStub
+
+pytest.importorskip("mitmproxy")
+
+BACKEND_DELAY = 0.3
+
+
+class _SlowBackendHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.calls += 1
+        time.sleep(BACKEND_DELAY)
+        body = json.dumps({"path": self.path, "call": self.server.calls}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def slow_backend():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowBackendHandler)
+    server.calls = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_positions(stub, base_url, count=3):
+    # Por HTTPS el cliente confía en cualquier certificado (el de la CA de mitmproxy)
+    http = urllib3.ProxyManager(
+        f"http://127.0.0.1:{stub.port}", retries=False, timeout=5, cert_reqs="CERT_NONE"
+    )
+    responses = [
+        http.request("GET", f"{base_url}/api/posicion?ts={time.time()}") for _ in range(count)
+    ]
+    return [(r.status, json.loads(r.data).get("call")) for r in responses]
+
+
+@pytest.mark.filterwarnings("ignore::urllib3.exceptions.InsecureRequestWarning")
+def test_replay_serves_recorded_responses_without_backend(slow_backend, tmp_path):
+    base_url = f"http://127.0.0.1:{slow_backend.server_address[1]}"
+    options = {"port": _free_port(), "ignore_params": ["ts"]}
+
+    recorder = BackendStub("record", tmp_path, **options).start(configure_device=False)
+    try:
+        recorder.use_scenario("test_venta[fila03]")
+        recorded = _get_positions(recorder, base_url)
+    finally:
+        recorder.stop(configure_device=False)
+    assert recorded == [(200, 1), (200, 2), (200, 3)]
+    assert recorder.results[0]["recorded"] == 3
+
+    # Backend apagado: el puerto deja de aceptar conexiones
+    slow_backend.shutdown()
+    slow_backend.server_close()
+    replayer = BackendStub("replay", tmp_path, **options).start(configure_device=False)
+    try:
+        replayer.use_scenario("test_venta[fila03]")
+        started_at = time.perf_counter()
+        assert _get_positions(replayer, base_url) == recorded
+        assert time.perf_counter() - started_at < BACKEND_DELAY * len(recorded)
+
+        # HTTPS: el CONNECT no debe intentar conectar con el backend apagado
+        replayer.use_scenario("test_venta[fila03]")
+        started_at = time.perf_counter()
+        assert _get_positions(replayer, base_url.replace("http://", "https://")) == recorded
+        assert time.perf_counter() - started_at < BACKEND_DELAY * len(recorded)
+
+        replayer.use_scenario("sin_grabar")
+        assert _get_positions(replayer, base_url, count=1) == [(502, None)]
+    finally:
+        replayer.stop(configure_device=False)
+    assert [r["hits"] for r in replayer.results] == [3, 3, 0]
+    assert replayer.results[2]["misses"] == 1
@@ -0,0 +1,76 @@
+"""
+Grabación y reproducción de comandos (utils.command_log)
+Se graba un flujo de page objects contra el Appium falso de los benchmarks y se
+reproduce sin servidor: mismas respuestas, y una divergencia en los parámetros
+(otro fondo) detiene el replay. No requiere dispositivo.
+"""
+
+import pytest
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+
+import pages.vender_page
+from benchmarks.fake_appium_server import FakeAppiumServer
+from pages.vender_page import ValmexVenderPage
+from utils.command_log import (
+    RecordingAppiumConnection,
+    ReplayConnection,
+    ReplayDivergence,
+    log_path_for,
+)
+from utils.navigator import ScreenNavigator
+from utils.transport import create_tuned_connection
+
+
+def _options():
+    options = UiAutomator2Options()
+    options.platform_name = "Android"
+    options.automation_name = "UiAutomator2"
+    return options
+
+
+def _sell_flow(driver, fund_name):
+    ScreenNavigator(driver).go_to("vender", password="benchmark")
+    page = ValmexVenderPage(driver)
+    selected = page.select_fund_by_name(fund_name)
+    return selected, [fund["name"] for fund in page.get_all_available_funds()]
+
+
+@pytest.fixture
+def recorded_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(pages.vender_page, "sleep", lambda seconds: None)
+    path = log_path_for("tests/test_venta.py::TestVenta::test_venta", tmp_path)
+    with FakeAppiumServer() as server:
+        connection = create_tuned_connection(server.url, connection_class=RecordingAppiumConnection)
+        driver = webdriver.Remote(command_executor=connection, options=_options())
+        connection.start_segment()
+        recorded = _sell_flow(driver, "VXGUBCP")
+        assert connection.save(path, test="test_venta") == path
+        driver.quit()
+    return path, recorded
+
+
+def test_replay_returns_recorded_responses(recorded_log):
+    path, recorded = recorded_log
+    connection = ReplayConnection(path)
+    driver = webdriver.Remote(command_executor=connection, options=_options())
+
+    assert _sell_flow(driver, "VXGUBCP") == recorded
+    report = connection.report()
+    assert report["remaining"] == 0
+    assert report["divergences"] == []
+
+
+def test_replay_flags_divergent_command(recorded_log):
+    path, _ = recorded_log
+    connection = ReplayConnection(path)
+    driver = webdriver.Remote(command_executor=connection, options=_options())
+
+    # El page object atrapa la excepción; la divergencia queda en el reporte
+    selected, _ = _sell_flow(driver, "VALMXES")
+
+    assert not selected
+    assert connection.divergences[0]["type"] == "mismatch"
+    assert "VALMXES" in connection.divergences[0]["message"]
+    with pytest.raises(ReplayDivergence):
+        driver.get_screenshot_as_png()
@@ -0,0 +1,73 @@
+"""
+Filas de datos del libro de Excel (utils.data_rows)
+Un libro con la hoja "data" (key/value, con encabezado) y la hoja "rows" (una
+fila por caso) se expande en DataRow con los valores comunes como respaldo de
+las celdas vacías; order_rows agrupa las filas por contrato. Los libros sin
+hoja de filas siguen entregando un solo caso. No requiere dispositivo.
+"""
+
+import os
+
+import pytest
+
+from utils.data_rows import DataRow, load_rows, order_rows
+
+SELL_WORKBOOK = "12_APP_Venta_de_fondo_por_un_monto_al_precio_de_un_titulo.xlsx"
+# data: key/value con encabezado; rows: 5 filas (una en blanco) y una columna sin encabezado
+ROWS_WORKBOOK = os.path.join(os.path.dirname(__file__), "resources", "data_rows", "venta_filas.xlsx")
+
+
+def test_load_rows_merges_data_sheet_defaults():
+    rows = load_rows(ROWS_WORKBOOK)
+
+    # La fila en blanco (5) se omite; el número de fila es el de la hoja
+    assert [row.index for row in rows] == [2, 3, 5, 6]
+    assert [row.values for row in rows] == [
+        {"password": "secreto", "contract": "318877", "fondo": "VXGUBCP", "sell_amount": "100"},
+        {"password": "secreto", "contract": "244231", "fondo": "VALMXES", "sell_amount": "200"},
+        {"password": "secreto", "contract": "318877", "fondo": "VXDEUDA"},
+        {"password": "secreto", "contract": "244231/B", "fondo": "VALMXES", "sell_amount": "300"},
+    ]
+
+
+def test_data_sheet_header_and_blank_keys_are_not_values():
+    defaults = load_rows(ROWS_WORKBOOK, sheet="no_existe")
+
+    assert defaults == [DataRow(0, {"password": "secreto", "contract": "244231", "fondo": "VALMXES"})]
+    assert "key" not in defaults[0]
+
+
+def test_workbook_without_rows_sheet_is_one_case():
+    (row,) = load_rows(SELL_WORKBOOK)
+
+    assert row.index == 0
+    assert row["contract"] == "244231"
+    assert row.get("password")
+    assert row.id == "fila00-244231"
+
+
+def test_order_rows_groups_by_contract_keeping_book_order():
+    rows = order_rows(load_rows(ROWS_WORKBOOK))
+
+    assert [row.id for row in rows] == [
+        "fila02-318877",
+        "fila05-318877",
+        "fila03-244231",
+        "fila06-244231_B",
+    ]
+    assert order_rows(rows, group_by=None) == rows
+
+
+def test_row_without_contract_id_and_dict():
+    row = DataRow(7, {"fondo": "VALMXES", "contract": ""})
+
+    assert row.id == "fila07"
+    assert row.as_dict() == {"row": 7, "id": "fila07", "fondo": "VALMXES", "contract": ""}
+
+
+@pytest.mark.data_rows(ROWS_WORKBOOK, group_by="contract")
+def test_data_rows_marker_expands_one_case_per_row(request, data_row):
+    # pytest_generate_tests (conftest) parametriza data_row con los ids de las filas
+    assert request.node.name == f"test_data_rows_marker_expands_one_case_per_row[{data_row.id}]"
+    assert data_row["password"] == "secreto"
+    assert data_row.id in {"fila02-318877", "fila05-318877", "fila03-244231", "fila06-244231_B"}
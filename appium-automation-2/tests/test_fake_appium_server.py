@@ -0,0 +1,143 @@
+"""
+Appium falso de los benchmarks (benchmarks.fake_appium_server)
+Los UiSelector a los que se compilan los localizadores deben encontrar en el
+servidor los mismos nodos que su XPath original, y los page objects deben poder
+recorrer el flujo de venta contra las pantallas grabadas. No requiere dispositivo.
+"""
+
+import os
+
+import pytest
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+from lxml import etree
+from selenium.common.exceptions import StaleElementReferenceException
+
+import pages.vender_page
+from benchmarks.fake_appium_server import FakeAppiumServer, uiautomator_find
+from pages.home_page import ValmexHomePage
+from pages.login_page import ValmexLoginPage
+from pages.operations_page import ValmexOperationsPage
+from pages.vender_page import ValmexVenderPage
+from utils.command_stats import count_commands
+from utils.locators import Locator
+from utils.navigator import ScreenNavigator
+from utils.transport import create_tuned_connection
+
+PAGE_SOURCES_DIR = os.path.join(os.path.dirname(__file__), "resources", "page_sources")
+
+
+def _uiautomator_locators():
+    locators = []
+    for page in (ValmexLoginPage, ValmexHomePage, ValmexOperationsPage, ValmexVenderPage):
+        for name, value in vars(page).items():
+            if isinstance(value, Locator) and value[0] == AppiumBy.ANDROID_UIAUTOMATOR:
+                locators.append(pytest.param(value, id=f"{page.__name__}.{name}"))
+    return locators
+
+
+@pytest.fixture(scope="module")
+def fake_server():
+    with FakeAppiumServer() as server:
+        yield server
+
+
+@pytest.fixture
+def fake_driver(fake_server, monkeypatch):
+    monkeypatch.setattr(pages.vender_page, "sleep", lambda seconds: None)
+    options = UiAutomator2Options()
+    options.platform_name = "Android"
+    options.automation_name = "UiAutomator2"
+    driver = webdriver.Remote(
+        command_executor=create_tuned_connection(fake_server.url), options=options
+    )
+    yield driver
+    driver.quit()
+
+
+@pytest.mark.parametrize("locator", _uiautomator_locators())
+def test_uiselector_matches_original_xpath(locator):
+    for name in sorted(os.listdir(PAGE_SOURCES_DIR)):
+        with open(os.path.join(PAGE_SOURCES_DIR, name), "rb") as f:
+            root = etree.fromstring(f.read())
+        expected = [node for node in root.xpath(locator.xpath) if isinstance(node, etree._Element)]
+        assert uiautomator_find(root, locator[1]) == expected, f"{name}: {locator!r}"
+
+
+def test_navigator_reaches_vender_from_closed_app(fake_server, fake_driver):
+    fake_server.device.terminate()
+
+    result = ScreenNavigator(fake_driver).go_to("vender", password="benchmark")
+
+    assert result.relaunched
+    assert result.path == ["login", "home", "operations", "vender"]
+    assert fake_server.device.screen == "vender_fondos"
+
+
+def test_sell_flow_on_recorded_screens(fake_server, fake_driver):
+    fake_server.device.show("vender_fondos", remember=False)
+    page = ValmexVenderPage(fake_driver)
+
+    with count_commands(fake_driver) as stats:
+        assert page.select_fund_by_name("VXGUBCP")
+        assert page.set_sell_amount("1000")
+        assert page.click_vender_button()
+    assert page.validate_detalle_de_operacion_page_loaded()
+    assert stats.round_trips > 0
+    assert fake_server.commands["find"] > 0
+
+
+def test_elements_go_stale_after_screen_change(fake_server, fake_driver):
+    fake_server.device.show("operations", remember=False)
+    vender = fake_driver.find_element(*ValmexOperationsPage.VENDER_BTN)
+    vender.click()
+
+    assert fake_server.device.screen == "vender_fondos"
+    with pytest.raises(StaleElementReferenceException):
+        vender.get_attribute("content-desc")
+
+
+def test_fund_search_rewinds_list_before_swipe_fallback(fake_server, fake_driver):
+    fake_server.device.show("vender_fondos", remember=False)
+    page = ValmexVenderPage(fake_driver)
+    directions = []
+    scroll = page.gestures.scroll
+    page.gestures.scroll = lambda direction="down", **kwargs: (
+        directions.append(direction) or scroll(direction, **kwargs)
+    )
+
+    # UiScrollable deja la lista en VXDEUDA ($5,500), que no cumple el valor
+    # mínimo: la lista vuelve al inicio antes del ciclo de swipes
+    fund = page._find_fund_by_criteria(name="VXDEUDA", value_min=6000)
+
+    assert fund is None
+    assert page.last_fund_search_stats["strategy"] == "swipe"
+    assert directions[0] == "up"
+
+
+@pytest.mark.parametrize("screen_after_tap, expected_taps", [(None, 2), ("home", 1)])
+def test_contract_retap_only_on_unchanged_list(
+    fake_server, fake_driver, monkeypatch, screen_after_tap, expected_taps
+):
+    monkeypatch.setattr(pages.vender_page.test, "SCREEN_WAIT_TIMEOUT", 0.2)
+    fake_server.device.show("vender_contratos", remember=False)
+    page = ValmexVenderPage(fake_driver)
+    taps = []
+    execute_script = fake_driver.execute_script
+
+    def spy(script, *args):
+        result = execute_script(script, *args)
+        if script == "mobile: clickGesture":
+            taps.append(args[0])
+            if screen_after_tap:
+                # La pantalla cambia después del tap, pero sin la firma esperada
+                fake_server.device.show(screen_after_tap, remember=False)
+        return result
+
+    monkeypatch.setattr(fake_driver, "execute_script", spy)
+
+    # En las pantallas grabadas el tap sobre un contrato no navega
+    assert not page.select_contract_by_index(0)
+    assert len(taps) == expected_taps
+    assert all(tap == taps[0] for tap in taps)
@@ -0,0 +1,89 @@
+"""
+Parseo del content-desc de los fondos (utils.fund_catalog)
+Cada botón de fondo de las pantallas grabadas (tests/resources/page_sources) y
+otras formas vistas en la app se parsean a nombre, clave, serie, valor (con
+separador de miles) y días de liquidez. No requiere dispositivo.
+"""
+
+import os
+
+import pytest
+from lxml import etree
+
+from utils.fund_catalog import FundCatalog, parse_fund_description
+
+PAGE_SOURCES_DIR = os.path.join(os.path.dirname(__file__), "resources", "page_sources")
+
+# content-desc -> (name, fund, series, value, liquidity_days)
+RECORDED_FUNDS = {
+    "VALMXES - $1,234.56\nLiquida hoy": ("VALMXES", "VALMXES", "", 1234.56, 0),
+    "VXGUBCP - $23,010.00\nLiquida en 1 dias": ("VXGUBCP", "VXGUBCP", "", 23010.0, 1),
+    "VXREPO1 - $99.10\nLiquida hoy": ("VXREPO1", "VXREPO1", "", 99.1, 0),
+    "VXDEUDA - $5,500.00\nLiquida en 2 dias": ("VXDEUDA", "VXDEUDA", "", 5500.0, 2),
+    "VLMXETF - $8,120.45\nLiquida en 3 dias": ("VLMXETF", "VLMXETF", "", 8120.45, 3),
+    "Fondo Balanceado Valmex - $ 7,777.00\nLiquida en 2 dias": (
+        "Fondo Balanceado Valmex", "Fondo Balanceado Valmex", "", 7777.0, 2,
+    ),
+}
+
+OTHER_DESCRIPTIONS = [
+    # Precio con seis decimales y liquidez entre paréntesis
+    ("VXGUBCP - $38.561459 (Liquida hoy)", ("VXGUBCP", "VXGUBCP", "", 38.561459, 0)),
+    # Serie después de la clave del fondo
+    ("VALMX28 BF - $1,250.10\nLiquida en 2 dias", ("VALMX28 BF", "VALMX28", "BF", 1250.1, 2)),
+    ("VALMXES B-1 - $ 12,345,678.9\nLiquida en 1 día", ("VALMXES B-1", "VALMXES", "B-1", 12345678.9, 1)),
+    # Miles sin decimales
+    ("VXDEUDA - $5,500\nLiquida en 2 dias", ("VXDEUDA", "VXDEUDA", "", 5500.0, 2)),
+    # El valor junto al nombre tiene prioridad sobre otros importes
+    ("VXGUBCP - $38.56 (Precio $40.00)", ("VXGUBCP", "VXGUBCP", "", 38.56, 0)),
+    # Sin valor ni separador de nombre
+    ("VXREPO1\nLiquida hoy", ("", "", "", None, 0)),
+    ("Fondo\nSeleccione un fondo", ("", "", "", None, 0)),
+    ("", ("", "", "", None, 0)),
+]
+
+
+def _recorded_fund_descriptions():
+    with open(os.path.join(PAGE_SOURCES_DIR, "vender_fondos.xml"), "rb") as f:
+        root = etree.fromstring(f.read())
+    return [
+        node.get("content-desc")
+        for node in root.iter("android.widget.Button")
+        if " - $" in (node.get("content-desc") or "")
+    ]
+
+
+def test_recorded_screen_funds_are_covered():
+    assert sorted(_recorded_fund_descriptions()) == sorted(RECORDED_FUNDS)
+
+
+@pytest.mark.parametrize(
+    "description, expected",
+    list(RECORDED_FUNDS.items()) + OTHER_DESCRIPTIONS,
+    ids=lambda value: value.split("\n")[0] if isinstance(value, str) else None,
+)
+def test_parse_fund_description(description, expected):
+    info = parse_fund_description(description)
+
+    assert (info.name, info.fund, info.series, info.value, info.liquidity_days) == expected
+    assert info.description == description
+
+
+@pytest.mark.parametrize(
+    "criteria, expected",
+    [
+        ({"name": "vxgub"}, "VXGUBCP"),
+        ({"value_min": 6000, "liquidity_days": 2}, "Fondo Balanceado Valmex"),
+        ({"value_max": 100}, "VXREPO1"),
+        ({"value_min": 1000, "value_max": 2000}, "VALMXES"),
+        ({"name": "VXDEUDA", "value_min": 6000}, None),
+    ],
+)
+def test_catalog_find_by_criteria(criteria, expected):
+    catalog = FundCatalog()
+    for description in RECORDED_FUNDS:
+        catalog.get(description)
+
+    found = catalog.find(**criteria)
+
+    assert (found.name if found else None) == expected
@@ -0,0 +1,143 @@
+"""
+Equivalencia del compilador de localizadores (utils.locators)
+Cada localizador XPath de los page objects se evalúa con lxml sobre page_source
+grabados de la app y se compara, nodo por nodo y en el mismo orden, con el
+UiSelector / accessibility id / id al que se compila. No requiere dispositivo.
+"""
+
+import os
+
+import pytest
+from lxml import etree
+from appium.webdriver.common.appiumby import AppiumBy
+
+from pages.home_page import ValmexHomePage
+from pages.login_page import ValmexLoginPage
+from pages.operations_page import ValmexOperationsPage
+from pages.vender_page import ValmexVenderPage
+from utils.locators import Locator, compile_locator, compile_xpath
+from utils.page_snapshot import PageSnapshot
+from utils.waits import DEFAULT_ERROR_SIGNATURES
+
+PAGE_SOURCES_DIR = os.path.join(os.path.dirname(__file__), "resources", "page_sources")
+
+# Formas XPath usadas dentro de los métodos de los page objects
+INLINE_XPATHS = [
+    "//android.widget.Button[contains(@content-desc, ' - $') and contains(@content-desc, 'Liquida')]",
+    "//android.widget.Button[starts-with(@content-desc, 'V') and contains(@content-desc, '$')]",
+    "//android.widget.Button[contains(@content-desc, '$') and contains(@content-desc, 'Liquida')]",
+    "//android.widget.Button[contains(@content-desc, 'VALMX') or contains(@content-desc, 'VXGUB') or contains(@content-desc, 'VXREP') or contains(@content-desc, 'VXDEU') or contains(@content-desc, 'VLMX')]",
+    "//android.widget.Button[contains(@content-desc, ' - $') and (contains(@content-desc, 'hoy') or contains(@content-desc, 'dias'))]",
+    "//android.widget.Button[starts-with(@content-desc, 'Fondo')]",
+    '//android.view.View[contains(@content-desc, "Contrato - 244231")]',
+    '//android.view.View[starts-with(@content-desc, "Detalle") and @content-desc="Detalle de operación"]',
+    '//*[@content-desc="Vender"]',
+    '//*[@resource-id="android:id/aerr_close"]',
+    '//android.widget.TextView[@text="Valmex se detuvo"]',
+    "//android.view.View[contains(@content-desc, 'Contrato') and contains(@content-desc, 'Contrato - 3')]",
+]
+
+
+def _page_locators():
+    locators = []
+    for page in (ValmexLoginPage, ValmexHomePage, ValmexOperationsPage, ValmexVenderPage):
+        for name, value in vars(page).items():
+            if isinstance(value, Locator):
+                locators.append(pytest.param(value, id=f"{page.__name__}.{name}"))
+    locators.append(
+        pytest.param(ValmexVenderPage.CONTRACT_BY_NUMBER(None, "244231"), id="ValmexVenderPage.CONTRACT_BY_NUMBER")
+    )
+    for i, locator in enumerate(DEFAULT_ERROR_SIGNATURES):
+        locators.append(pytest.param(compile_locator(locator, enabled=True), id=f"DEFAULT_ERROR_SIGNATURES[{i}]"))
+    for i, xpath in enumerate(INLINE_XPATHS):
+        locators.append(pytest.param(compile_xpath(xpath), id=f"inline[{i}]"))
+    return locators
+
+
+def _page_sources():
+    return sorted(name for name in os.listdir(PAGE_SOURCES_DIR) if name.endswith(".xml"))
+
+
+@pytest.fixture(scope="module")
+def page_roots():
+    roots = {}
+    for name in _page_sources():
+        with open(os.path.join(PAGE_SOURCES_DIR, name), "rb") as f:
+            roots[name] = etree.fromstring(f.read())
+    return roots
+
+
+@pytest.mark.parametrize("locator", _page_locators())
+def test_compiled_locator_matches_xpath(locator, page_roots):
+    if locator.spec is None:
+        pytest.skip(f"Se conserva la estrategia original: {locator!r}")
+
+    matched_somewhere = False
+    for name, root in page_roots.items():
+        expected = [node for node in root.xpath(locator.xpath) if isinstance(node, etree._Element)]
+        actual = locator.spec.find_all(root)
+        assert actual == expected, f"{name}: {locator!r}"
+        matched_somewhere = matched_somewhere or bool(expected)
+    assert matched_somewhere, f"Ninguna fuente grabada ejercita {locator!r}"
+
+
+def test_exact_content_desc_compiles_to_uiselector():
+    locator = ValmexHomePage.OPERACIONES_BTN
+    assert locator[0] == AppiumBy.ANDROID_UIAUTOMATOR
+    assert locator[1] == 'new UiSelector().className("android.view.View").description("Operaciones")'
+    assert locator.xpath == '//android.view.View[@content-desc="Operaciones"]'
+
+
+def test_contains_compiles_to_case_sensitive_regex():
+    locator = ValmexVenderPage.FUND_ITEM
+    assert locator[0] == AppiumBy.ANDROID_UIAUTOMATOR
+    # descriptionContains ignora mayúsculas; debe usarse descriptionMatches
+    assert "descriptionContains" not in locator[1]
+    assert locator[1] == (
+        'new UiSelector().className("android.widget.Button")'
+        '.descriptionMatches("(?s)(?=.*\\\\QV\\\\E).*")'
+    )
+
+
+def test_wildcard_tag_uses_accessibility_id_and_id():
+    assert compile_xpath('//*[@content-desc="Vender"]') == (AppiumBy.ACCESSIBILITY_ID, "Vender")
+    assert compile_xpath('//*[@resource-id="android:id/aerr_close"]') == (AppiumBy.ID, "android:id/aerr_close")
+    # Sin ':id/' Appium antepone el paquete de la app: no es equivalente
+    assert compile_xpath('//*[@resource-id="aerr_close"]')[0] == AppiumBy.ANDROID_UIAUTOMATOR
+
+
+@pytest.mark.parametrize(
+    "xpath",
+    [
+        '//android.widget.EditText[@hint="Contraseña"]',
+        "//*[@text and string-length(@text) > 0]",
+        "//android.view.View[contains(@content-desc, 'A') or contains(@text, 'A')]",
+        '//android.view.View[@content-desc=""]',
+        '//android.view.View[@content-desc="Fondo\nSeleccione un fondo"]',
+        "(//android.widget.Button)[1]",
+        "//android.view.View[@content-desc='Vender']/android.widget.Button",
+    ],
+)
+def test_unsupported_shapes_keep_xpath(xpath):
+    locator = compile_xpath(xpath)
+    assert tuple(locator) == (AppiumBy.XPATH, xpath)
+    assert not locator.compiled
+
+
+def test_non_xpath_locators_pass_through():
+    assert tuple(ValmexVenderPage.SELECCIONE_FONDO) == (AppiumBy.ACCESSIBILITY_ID, "Fondo\nSeleccione un fondo")
+    assert ValmexVenderPage.SELECCIONE_FONDO.xpath is None
+
+
+def test_disabled_compilation_keeps_xpath():
+    xpath = '//android.view.View[@content-desc="Vender"]'
+    locator = compile_locator((AppiumBy.XPATH, xpath), enabled=False)
+    assert tuple(locator) == (AppiumBy.XPATH, xpath)
+    assert locator.xpath == xpath
+
+
+def test_snapshot_evaluates_original_xpath():
+    with open(os.path.join(PAGE_SOURCES_DIR, "vender_fondos.xml"), encoding="utf-8") as f:
+        snapshot = PageSnapshot(None, f.read().split("\n", 1)[1])
+    names = [node.content_desc.split(" - ")[0] for node in snapshot.find_all(ValmexVenderPage.FUND_ITEM)]
+    assert names == ["VALMXES", "VXGUBCP", "VXREPO1", "VXDEUDA", "VLMXETF", "Fondo Balanceado Valmex", "Vender"]
@@ -0,0 +1,101 @@
+"""
+Validación de varios textos en una sola pasada (utils.text_matcher)
+Los textos literales se buscan con una sola expresión combinada sobre el corpus
+de la pantalla y las expresiones regulares elemento por elemento: ningún patrón
+puede coincidir a través de dos elementos distintos. No requiere dispositivo.
+"""
+
+import re
+
+import pytest
+
+from utils.text_matcher import TextMatcher
+
+SCREEN_TEXTS = [
+    "Vender",
+    "Fondo de inversión",
+    "Mi Fondo",
+    "Valmex",
+    "Importe estimado: $ 1,234.56",
+    "abc",
+]
+
+
+def _found_texts(patterns, partial_match=True, texts=SCREEN_TEXTS, **kwargs):
+    matcher = TextMatcher(patterns, partial_match=partial_match, **kwargs)
+    found = matcher.match([(text, f"elemento-{i}") for i, text in enumerate(texts)])
+    return [found[i][0] if i in found else None for i in range(len(patterns))]
+
+
+def test_overlapping_literals_are_found_independently():
+    # "Fondo" está contenido en "Fondo de inversión": ninguno consume al otro
+    assert _found_texts(["Fondo de inversión", "Fondo", "de inv", "inversión"]) == [
+        "Fondo de inversión",
+        "Fondo de inversión",
+        "Fondo de inversión",
+        "Fondo de inversión",
+    ]
+
+
+def test_match_reports_the_element():
+    matcher = TextMatcher(["Valmex"])
+    found = matcher.match([("Vender", "a"), ("Valmex", "b")])
+
+    assert found == {0: ("Valmex", "b")}
+    report = matcher.report(found)
+    assert report and report.matches[0].element == "b"
+
+
+@pytest.mark.parametrize(
+    "partial_match, expected",
+    [
+        (True, ["Fondo de inversión", "Importe estimado: $ 1,234.56", None]),
+        (False, ["Mi Fondo", None, None]),
+    ],
+)
+def test_exact_and_partial_match(partial_match, expected):
+    patterns = ["mi fondo" if not partial_match else "fondo", "1,234.56", "Comisión"]
+    assert _found_texts(patterns, partial_match) == expected
+
+
+def test_exact_literal_requires_whole_element_text():
+    assert _found_texts(["Fondo", "  Valmex  ", "valmex"], partial_match=False) == [
+        None,
+        "Valmex",
+        "Valmex",
+    ]
+
+
+def test_case_sensitive_literals():
+    assert _found_texts(["valmex", "Valmex"], ignore_case=False) == [None, "Valmex"]
+
+
+def test_exact_regex_alternation_is_grouped():
+    # Sin agrupar, "abc|Fondo" aceptaría "Mi Fondo" como coincidencia exacta
+    assert _found_texts([re.compile("abc|Fondo")], partial_match=False) == ["abc"]
+    assert _found_texts([re.compile("xyz|Fondo")], partial_match=False) == [None]
+    assert _found_texts([re.compile("xyz|Fondo")], partial_match=True) == ["Fondo de inversión"]
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"Valmex.*abc", r"Vender\W+Fondo", r"Vender\s*\S*\s*Fondo", r"inversión[^x]Mi"],
+)
+def test_regex_does_not_span_elements(pattern):
+    assert _found_texts([re.compile(pattern)]) == [None]
+
+
+def test_regex_anchors_apply_to_each_element():
+    assert _found_texts([re.compile(r"^Fondo"), re.compile(r"Fondo$"), re.compile(r"^\$")]) == [
+        "Fondo de inversión",
+        "Mi Fondo",
+        None,
+    ]
+
+
+def test_regex_and_literals_together_respect_pending():
+    matcher = TextMatcher(["Vender", re.compile(r"\$\s*[\d,]+\.\d{2}"), "Comisión"])
+    texts = [(text, None) for text in SCREEN_TEXTS]
+
+    assert sorted(matcher.match(texts)) == [0, 1]
+    assert sorted(matcher.match(texts, pending=[1, 2])) == [1]
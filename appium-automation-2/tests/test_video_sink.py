@@ -0,0 +1,119 @@
+"""
+Receptor local de videos (utils.evidences.video_sink)
+Appium sube la grabación con remotePath como multipart/form-data: en disco debe
+quedar solo el contenido del campo "file", sin delimitadores ni encabezados de
+las partes, con Content-Length o chunked. No requiere dispositivo.
+"""
+
+import os
+import random
+
+import pytest
+import urllib3
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+
+from benchmarks.fake_appium_server import FakeAppiumServer
+from utils.evidences.video import VideoRecorder
+from utils.evidences.video_sink import UPLOAD_FIELD, VideoSink
+from utils.transport import create_tuned_connection
+
+BOUNDARY = "----appiumUploadBoundary7MA4YWxk"
+
+
+def _video_bytes(size):
+    # Binario con CRLF y fragmentos del delimitador repartidos por el contenido
+    data = bytearray(random.Random(size).randbytes(size))
+    for position in range(0, size - 64, 4099):
+        data[position:position + 12] = b"\r\n------appi"
+    return bytes(data)
+
+
+def _multipart(video, field=UPLOAD_FIELD):
+    return (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="user"\r\n\r\nqa\r\n'
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{field}"; filename="video.mp4"\r\n'
+        f"Content-Type: video/mp4\r\n\r\n"
+    ).encode() + video + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+@pytest.fixture
+def sink():
+    sink = VideoSink(host="127.0.0.1", port=0)
+    yield sink
+    sink.close()
+
+
+def _put(url, body, chunked=False):
+    http = urllib3.PoolManager()
+    try:
+        return http.request(
+            "PUT",
+            url,
+            body=iter([body[i:i + 70000] for i in range(0, len(body), 70000)]) if chunked else body,
+            headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+            chunked=chunked,
+        ).status
+    finally:
+        http.clear()
+
+
+@pytest.mark.parametrize("chunked", [False, True], ids=["content-length", "chunked"])
+@pytest.mark.parametrize("size", [0, 10, 600_000])
+def test_multipart_upload_writes_only_file_part(sink, tmp_path, size, chunked):
+    video = _video_bytes(size)
+    filepath = str(tmp_path / "videos" / "prueba.mp4")
+    url, done = sink.expect(filepath)
+
+    assert _put(url, _multipart(video), chunked=chunked) == 201
+    assert done.is_set()
+    with open(filepath, "rb") as f:
+        assert f.read() == video
+    assert not os.path.exists(filepath + ".part")
+
+
+def test_raw_upload_is_written_as_is(sink, tmp_path):
+    video = _video_bytes(1000)
+    filepath = str(tmp_path / "crudo.mp4")
+    url, _ = sink.expect(filepath)
+
+    http = urllib3.PoolManager()
+    assert http.request("PUT", url, body=video).status == 201
+    with open(filepath, "rb") as f:
+        assert f.read() == video
+
+
+def test_multipart_without_file_field_is_rejected(sink, tmp_path):
+    filepath = str(tmp_path / "sin_archivo.mp4")
+    url, done = sink.expect(filepath)
+
+    assert _put(url, _multipart(b"video", field="otro")) == 500
+    assert done.wait(timeout=5)
+    assert not os.path.exists(filepath)
+    assert not os.path.exists(filepath + ".part")
+
+
+def test_unknown_token_is_not_found(sink):
+    assert _put(f"http://{sink.host}:{sink.port}/desconocido", _multipart(b"video")) == 404
+
+
+def test_fake_appium_multipart_upload_keeps_video_intact(sink, tmp_path, monkeypatch):
+    monkeypatch.setattr(VideoSink, "_instance", sink)
+    with FakeAppiumServer() as server:
+        options = UiAutomator2Options()
+        options.platform_name = "Android"
+        options.automation_name = "UiAutomator2"
+        driver = webdriver.Remote(
+            command_executor=create_tuned_connection(server.url), options=options
+        )
+        try:
+            driver.start_recording_screen()
+            filepath = str(tmp_path / "appium.mp4")
+            assert VideoRecorder._stop_with_upload(driver, filepath) is True
+        finally:
+            driver.quit()
+
+    with open(filepath, "rb") as f:
+        video = f.read()
+    assert video.startswith(b"\x00\x00\x00\x18ftypmp42")
+    assert len(video) == server.device.video_bytes
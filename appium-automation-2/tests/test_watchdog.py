@@ -0,0 +1,86 @@
+"""
+Watchdog de pasos colgados (utils.watchdog)
+Contra el Appium falso de los benchmarks, con los find colgados: el paso que
+excede su presupuesto se aborta sin esperar al servidor, deja captura y
+page_source de diagnóstico y falla con StepHangError; el paso siguiente usa la
+misma sesión con normalidad. No requiere dispositivo.
+"""
+
+import os
+import time
+
+import pytest
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+
+from benchmarks.fake_appium_server import FakeAppiumServer
+from pages.vender_page import ValmexVenderPage
+from utils.evidences.steps import StepRegistry
+from utils.transport import create_tuned_connection
+from utils.watchdog import StepHangError, StepWatchdog
+
+STALLED_FIND_SECONDS = 3.0
+BUDGET = 0.5
+
+
+@pytest.fixture
+def stalled_driver():
+    with FakeAppiumServer(route_latency={"find": STALLED_FIND_SECONDS}) as server:
+        options = UiAutomator2Options()
+        options.platform_name = "Android"
+        options.automation_name = "UiAutomator2"
+        driver = webdriver.Remote(
+            command_executor=create_tuned_connection(server.url, retries=0), options=options
+        )
+        server.device.show("vender_fondos", remember=False)
+        yield driver
+        driver.quit()
+
+
+def test_stalled_step_is_aborted_with_diagnostics(stalled_driver, tmp_path):
+    watchdog = StepWatchdog(stalled_driver, "test_watchdog", budget=BUDGET, output_dir=str(tmp_path))
+    results = []
+
+    def step_01_buscar_importe(driver):
+        return driver.find_element(*ValmexVenderPage.IMPORTE_FIELD)
+
+    def step_02_leer_pantalla(driver):
+        results.append(len(driver.page_source))
+
+    token = StepRegistry.use_watchdog(watchdog)
+    try:
+        started_at = time.perf_counter()
+        with pytest.raises(StepHangError, match="step_01_buscar_importe"):
+            StepRegistry.wrap(step_01_buscar_importe)(stalled_driver)
+        assert time.perf_counter() - started_at < STALLED_FIND_SECONDS
+
+        StepRegistry.wrap(step_02_leer_pantalla)(stalled_driver)
+    finally:
+        StepRegistry.release_watchdog(token)
+
+    assert results and results[0] > 0
+    assert [trip["step"] for trip in watchdog.trips] == ["step_01_buscar_importe"]
+    trip = watchdog.trips[0]
+    assert trip["screenshot"].endswith(".png") and os.path.getsize(trip["screenshot"]) > 0
+    with open(trip["page_source"], encoding="utf-8") as f:
+        assert "Seleccione un fondo" in f.read()
+
+
+def test_step_within_budget_leaves_connection_usable(stalled_driver, tmp_path):
+    watchdog = StepWatchdog(stalled_driver, "test_watchdog", budget=BUDGET, output_dir=str(tmp_path))
+
+    for _ in range(3):
+        with watchdog.guard("step_01_leer_pantalla"):
+            assert stalled_driver.page_source
+
+    assert not watchdog.tripped
+    assert not stalled_driver.command_executor._aborted.is_set()
+    assert os.listdir(tmp_path) == []
+
+
+def test_tuned_connection_tracks_http_and_https_pools():
+    connection = create_tuned_connection("https://127.0.0.1:4723")
+
+    for url in ("https://127.0.0.1:4723/status", "http://127.0.0.1:4723/status"):
+        pool = connection._conn.connection_from_url(url)
+        assert type(pool).__name__.startswith("Tracked")
@@ -6,22 +6,30 @@ from appium import webdriver
 from appium.options.android import UiAutomator2Options
 import time
 
+from config.settings import appium
+from utils.command_log import RecordingAppiumConnection, ReplayConnection
+from utils.transport import TunedAppiumConnection, create_tuned_connection
+
 
 class AppiumDriver:
     """
     Clase para inicializar y manejar el driver de Appium
     """
 
-    def __init__(self, capabilities):
+    def __init__(self, capabilities, replay_log=None):
         """
         Inicializa el driver de Appium
 
         Args:
             capabilities (dict): Diccionario con las capabilities del dispositivo
+            replay_log (str, optional): Log grabado (utils.command_log); si se indica,
+                el driver se reproduce desde el log sin Appium Server ni dispositivo
         """
         self.capabilities = capabilities
+        self.replay_log = replay_log
         self.driver = None
         self.appium_server_url = "http://localhost:4723"
+        self.startup_seconds = None
 
     def start_driver(self):
         """
@@ -33,21 +41,48 @@ class AppiumDriver:
         try:
             print("🚀 Iniciando conexión con Appium Server...")
             print(f"📱 URL del servidor: {self.appium_server_url}")
+            started_at = time.perf_counter()
 
             # Crear opciones usando UiAutomator2Options
             options = UiAutomator2Options()
             options.load_capabilities(self.capabilities)
 
             # Inicializar el driver
+            if self.replay_log:
+                # Reproducción desde el log grabado (APPIUM_COMMAND_LOG=replay)
+                print(f"📼 Reproduciendo comandos desde: {self.replay_log}")
+                command_executor = ReplayConnection(self.replay_log, strict=appium.REPLAY_STRICT)
+            elif appium.HTTP_TUNED or appium.COMMAND_LOG == "record":
+                # Transporte afinado (pool keep-alive, TCP_NODELAY, reintentos, latencia);
+                # con APPIUM_COMMAND_LOG=record además guarda cada comando y su respuesta
+                command_executor = create_tuned_connection(
+                    self.appium_server_url,
+                    pool_size=appium.HTTP_POOL_SIZE,
+                    retries=appium.HTTP_RETRIES,
+                    backoff_factor=appium.HTTP_BACKOFF,
+                    timeout=appium.HTTP_TIMEOUT,
+                    connection_class=(
+                        RecordingAppiumConnection
+                        if appium.COMMAND_LOG == "record"
+                        else TunedAppiumConnection
+                    ),
+                )
+            else:
+                command_executor = self.appium_server_url
+
             self.driver = webdriver.Remote(
-                command_executor=self.appium_server_url, options=options
+                command_executor=command_executor, options=options
             )
 
             print("✅ Conexión establecida exitosamente")
             print(f"📱 Dispositivo: {self.capabilities.get('appium:deviceName')}")
 
             # Esperar a que el dispositivo esté listo
-            time.sleep(2)
+            if not self.replay_log:
+                time.sleep(2)
+
+            self.startup_seconds = time.perf_counter() - started_at
+            print(f"⏱️ Arranque de sesión: {self.startup_seconds:.2f}s")
 
             return self.driver
 
@@ -59,11 +94,31 @@ class AppiumDriver:
             print("   3. Las capabilities son correctas")
             raise
 
+    def reset_app(self, package_name, strategy="terminate"):
+        """
+        Reinicia la app bajo prueba sin cerrar la sesión de Appium
+
+        Args:
+            package_name (str): Paquete de la app (ej: com.valmex.valmexcb)
+            strategy (str): 'terminate' (cerrar y volver a abrir) o
+                'clear' (borrar datos de la app y volver a abrir)
+        """
+        if strategy == "clear":
+            self.driver.execute_script("mobile: clearApp", {"appId": package_name})
+        else:
+            self.driver.terminate_app(package_name)
+        self.driver.activate_app(package_name)
+
     def stop_driver(self):
         """
         Detiene el driver y cierra la sesión
         """
         if self.driver:
+            latency = getattr(self.driver.command_executor, "latency", None)
+            if latency is not None:
+                latency.print_summary()
+            if isinstance(self.driver.command_executor, ReplayConnection):
+                self.driver.command_executor.print_report()
             try:
                 print("🛑 Cerrando conexión con Appium...")
                 self.driver.quit()
@@ -0,0 +1,249 @@
+"""
+Stub local del backend de la app con mitmproxy
+Arranca mitmdump con el addon utils/backend_stub_addon.py y configura el proxy
+HTTP global del emulador (adb shell settings put global http_proxy) para que el
+tráfico de la app pase por él:
+
+- BACKEND_STUB_MODE=record: graba las respuestas del backend real por escenario
+- BACKEND_STUB_MODE=replay: las sirve al instante (BACKEND_STUB_LATENCY_MS
+  inyecta una latencia fija o "recorded" la grabada), de modo que las
+  transiciones de pantalla dependen solo de la velocidad de la UI
+
+Cada prueba usa su propio escenario (su nombre o @pytest.mark.backend_scenario).
+Para interceptar HTTPS el emulador debe confiar en el certificado de mitmproxy
+(~/.mitmproxy/mitmproxy-ca-cert.cer instalado como CA del sistema) y la app no
+debe fijar certificados (certificate pinning) en el build de pruebas.
+"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+import urllib3
+
+ADDON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend_stub_addon.py")
+# Host de control del addon (mismo valor que en backend_stub_addon, que no se
+# importa aquí para no cargar mitmproxy en el proceso de pytest)
+CONTROL_HOST = "backend-stub.local"
+
+
+class BackendStubError(RuntimeError):
+    """mitmdump no arrancó o el emulador no aceptó la configuración del proxy."""
+
+
+class BackendStub:
+    """
+    Uso (lo hace el fixture backend_stub con BACKEND_STUB_MODE=record/replay):
+        stub = BackendStub.from_config(backend, device_lease).start()
+        stub.use_scenario("test_venta_ffv")
+        ...
+        stub.stop()
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(self, mode, stub_dir, port=8081, udid=None, hosts=(), latency="0",
+                 passthrough=False, ignore_params=(), proxy_host="10.0.2.2",
+                 mitmdump="mitmdump", adb="adb", startup_timeout=20):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de stub no soportado: {mode} (record o replay)")
+        self.mode = mode
+        self.stub_dir = str(stub_dir)
+        self.port = port
+        self.udid = udid
+        self.hosts = list(hosts)
+        self.latency = str(latency)
+        self.passthrough = passthrough
+        self.ignore_params = list(ignore_params)
+        self.proxy_host = proxy_host
+        self.mitmdump = mitmdump
+        self.adb = adb
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.log_path = os.path.join(self.stub_dir, "mitmdump.log")
+        self._log = None
+        self.scenario = None
+        self.results = []  # estadísticas por escenario (hits, misses, recorded)
+        self._http = urllib3.ProxyManager(f"http://127.0.0.1:{port}", retries=False, timeout=10)
+
+    @classmethod
+    def from_config(cls, config, lease=None):
+        """
+        Args:
+            config: BackendStubConfig (config.settings.backend)
+            lease (DeviceLease, optional): Dispositivo del worker; con xdist cada
+                worker usa su propio puerto (BACKEND_STUB_PORT + índice del dispositivo)
+        """
+        from config.settings import device
+
+        udid = lease.slot.udid if lease is not None else device.DEVICE_NAME
+        port = config.PORT + (lease.slot.index if lease is not None else 0)
+        return cls(
+            config.MODE,
+            config.DIR,
+            port=port,
+            udid=udid,
+            hosts=config.HOSTS,
+            latency=config.LATENCY_MS,
+            passthrough=config.PASSTHROUGH,
+            ignore_params=config.IGNORE_PARAMS,
+            proxy_host=config.PROXY_HOST,
+            mitmdump=config.MITMDUMP,
+            adb=config.ADB,
+        )
+
+    # ----------------------------------------------------
+    # Ciclo de vida
+    # ----------------------------------------------------
+
+    def command(self):
+        """
+        Returns:
+            list: Línea de comandos de mitmdump con las opciones del addon
+        """
+        options = {
+            "stub_mode": self.mode,
+            "stub_dir": self.stub_dir,
+            "stub_hosts": ",".join(self.hosts),
+            "stub_latency": self.latency,
+            "stub_passthrough": str(self.passthrough).lower(),
+            "stub_ignore_params": ",".join(self.ignore_params),
+        }
+        if self.mode == "replay":
+            # Sin esto mitmdump abre la conexión (TCP/TLS) con el backend real en cada
+            # CONNECT antes de que el addon responda, y sin backend responde 502
+            options["connection_strategy"] = "lazy"
+        command = [self.mitmdump, "--listen-port", str(self.port), "-q", "-s", ADDON_PATH]
+        for name, value in options.items():
+            command += ["--set", f"{name}={value}"]
+        return command
+
+    def start(self, configure_device=True):
+        """
+        Arranca mitmdump y apunta el proxy del emulador a él.
+
+        Returns:
+            BackendStub: self
+        """
+        os.makedirs(self.stub_dir, exist_ok=True)
+        started_at = time.perf_counter()
+        # Salida a archivo: un PIPE sin leer bloquearía a mitmdump al llenarse
+        self._log = open(self.log_path, "wb")
+        try:
+            self.process = subprocess.Popen(
+                self.command(),
+                stdout=self._log,
+                stderr=subprocess.STDOUT,
+                # En Windows, CTRL_BREAK_EVENT solo llega a un grupo de procesos propio
+                creationflags=getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0),
+            )
+        except FileNotFoundError:
+            self._log.close()
+            raise BackendStubError(f"No se encontró {self.mitmdump} (pip install mitmproxy)")
+
+        while not self._listening():
+            if self.process.poll() is not None:
+                self.process = None
+                self._log.close()
+                with open(self.log_path, encoding="utf-8", errors="replace") as f:
+                    error = f.read().strip()
+                raise BackendStubError(f"mitmdump terminó al arrancar: {error}")
+            if time.perf_counter() - started_at > self.startup_timeout:
+                self.stop(configure_device=False)
+                raise BackendStubError(f"mitmdump no escuchó en el puerto {self.port}")
+            time.sleep(0.1)
+
+        print(
+            f"🧪 Stub del backend ({self.mode}) en 127.0.0.1:{self.port} "
+            f"en {time.perf_counter() - started_at:.2f}s -> {self.stub_dir}"
+        )
+        if configure_device:
+            self._set_device_proxy(f"{self.proxy_host}:{self.port}")
+        return self
+
+    def stop(self, configure_device=True):
+        """Restablece el proxy del emulador y detiene mitmdump (guarda lo grabado)."""
+        if configure_device:
+            try:
+                self._set_device_proxy(":0")
+            except BackendStubError as e:
+                print(f"⚠️ {e}")
+        if self.process is None:
+            return
+        try:
+            self._finish_scenario(self._control("status").get("stats"))
+        except BackendStubError as e:
+            print(f"⚠️ {e}")
+        # mitmdump guarda el escenario en curso al recibir la interrupción
+        self.process.send_signal(signal.CTRL_BREAK_EVENT if sys.platform == "win32" else signal.SIGINT)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+        self._log.close()
+        print(f"🧪 Stub del backend detenido ({len(self.results)} escenario(s))")
+
+    def _listening(self):
+        try:
+            with socket.create_connection(("127.0.0.1", self.port), timeout=0.5):
+                return True
+        except OSError:
+            return False
+
+    # ----------------------------------------------------
+    # Escenarios (host de control del addon)
+    # ----------------------------------------------------
+
+    def use_scenario(self, name):
+        """
+        Activa el escenario de una prueba: en record se graba en
+        <stub_dir>/<name>.json; en replay se sirven sus respuestas.
+
+        Returns:
+            dict: Estado del addon (escenario, claves grabadas)
+        """
+        status = self._control(f"scenario/{quote(name, safe='')}")
+        self._finish_scenario(status.get("previous"))
+        self.scenario = name
+        if self.mode == "replay" and not status.get("keys"):
+            print(f"⚠️ Escenario '{name}' sin respuestas grabadas en {self.stub_dir}")
+        return status
+
+    def status(self):
+        return self._control("status")
+
+    def _control(self, path):
+        try:
+            response = self._http.request("GET", f"http://{CONTROL_HOST}/{path}")
+            return json.loads(response.data)
+        except Exception as e:
+            raise BackendStubError(f"El addon del stub no respondió a /{path}: {e}")
+
+    def _finish_scenario(self, stats):
+        if self.scenario is None:
+            return
+        result = {"scenario": self.scenario, "hits": 0, "misses": 0, "recorded": 0}
+        result.update({k: v for k, v in (stats or {}).items() if k != "scenario"})
+        self.results.append(result)
+        if result.get("misses"):
+            print(f"⚠️ Escenario '{self.scenario}': {result['misses']} petición(es) sin respuesta grabada")
+
+    # ----------------------------------------------------
+    # Emulador
+    # ----------------------------------------------------
+
+    def _set_device_proxy(self, value):
+        command = [self.adb] + (["-s", self.udid] if self.udid else [])
+        command += ["shell", "settings", "put", "global", "http_proxy", value]
+        try:
+            subprocess.run(command, check=True, capture_output=True, timeout=30)
+        except (OSError, subprocess.SubprocessError) as e:
+            raise BackendStubError(f"No se pudo configurar el proxy del emulador ({value}): {e}")
+        print(f"📶 Proxy del emulador {self.udid or ''}: {value}")
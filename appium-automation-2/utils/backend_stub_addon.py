@@ -0,0 +1,218 @@
+"""
+Addon de mitmproxy: stub del backend de la app Valmex por escenario
+Se carga con mitmdump (lo arranca utils.backend_stub.BackendStub):
+
+    mitmdump --listen-port 8081 -s utils/backend_stub_addon.py \\
+        --set stub_mode=replay --set stub_dir=backend_stubs --set stub_latency=0
+
+- record: las peticiones van al backend real y cada respuesta se acumula en
+  memoria, indexada por método, host, ruta, query y cuerpo; el escenario se
+  escribe en <stub_dir>/<escenario>.json al cambiar de escenario y al detener
+  el proxy.
+- replay: las respuestas grabadas se sirven al instante (o con la latencia
+  indicada en ms, o con la grabada si stub_latency=recorded). Las peticiones
+  repetidas (sondeos) reciben las respuestas en el orden grabado y después la
+  última. Lo no grabado responde 502, o va al backend real con stub_passthrough.
+
+El escenario activo se cambia sin reiniciar el proxy con una petición al host
+de control: GET http://backend-stub.local/scenario/<nombre> (ver BackendStub).
+Este archivo solo depende de mitmproxy y de la biblioteca estándar.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from urllib.parse import unquote, urlencode
+
+from mitmproxy import ctx, http
+
+CONTROL_HOST = "backend-stub.local"
+# Cabeceras que dependen de la codificación original (el cuerpo se guarda decodificado)
+_DROPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "connection"}
+_UNSAFE_RE = re.compile(r"[^\w.-]+")
+
+
+def scenario_filename(name):
+    return _UNSAFE_RE.sub("_", name).strip("_") or "default"
+
+
+class BackendStub:
+    def __init__(self):
+        self.scenario = None
+        self.responses = {}  # clave -> [respuesta grabada]
+        self.cursor = Counter()  # clave -> respuestas ya servidas en replay
+        self.stats = Counter()
+
+    def load(self, loader):
+        loader.add_option("stub_mode", str, "replay", "record o replay")
+        loader.add_option("stub_dir", str, "backend_stubs", "Carpeta de escenarios grabados")
+        loader.add_option("stub_scenario", str, "default", "Escenario inicial")
+        loader.add_option("stub_hosts", str, "", "Hosts del backend separados por coma (vacío = todos)")
+        loader.add_option("stub_latency", str, "0", "replay: ms por respuesta o 'recorded'")
+        loader.add_option("stub_passthrough", bool, False, "replay: reenviar al backend lo no grabado")
+        loader.add_option(
+            "stub_ignore_params", str, "", "Parámetros de query/JSON volátiles que no forman la clave"
+        )
+
+    def configure(self, updated):
+        if "stub_scenario" in updated:
+            self.use_scenario(ctx.options.stub_scenario)
+
+    def done(self):
+        self.save()
+
+    # ----------------------------------------------------
+    # Escenarios
+    # ----------------------------------------------------
+
+    @property
+    def recording(self):
+        return ctx.options.stub_mode == "record"
+
+    def _path(self, scenario):
+        return os.path.join(ctx.options.stub_dir, scenario_filename(scenario) + ".json")
+
+    def use_scenario(self, name):
+        """
+        Returns:
+            dict: Estadísticas del escenario anterior (hits, misses, recorded)
+        """
+        previous = {"scenario": self.scenario, **self.stats}
+        if self.scenario is not None:
+            self.save()
+        self.scenario = name
+        self.cursor = Counter()
+        self.stats = Counter()
+        self.responses = {}
+        path = self._path(name)
+        if not self.recording and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.responses = json.load(f).get("responses", {})
+        logging.info(f"Escenario '{name}' ({ctx.options.stub_mode}): {len(self.responses)} claves")
+        return previous
+
+    def save(self):
+        if not self.recording or self.scenario is None or not self.responses:
+            return
+        os.makedirs(ctx.options.stub_dir, exist_ok=True)
+        with open(self._path(self.scenario), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "scenario": self.scenario,
+                    "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                    "responses": self.responses,
+                },
+                f,
+                indent=1,
+            )
+
+    # ----------------------------------------------------
+    # Clave de una petición
+    # ----------------------------------------------------
+
+    def _ignored(self):
+        return {p.strip() for p in ctx.options.stub_ignore_params.split(",") if p.strip()}
+
+    def key(self, request):
+        ignored = self._ignored()
+        query = sorted((k, v) for k, v in request.query.items(multi=True) if k not in ignored)
+        body = request.content or b""
+        try:
+            data = json.loads(body)
+            if isinstance(data, dict):
+                data = {k: v for k, v in data.items() if k not in ignored}
+            body = json.dumps(data, sort_keys=True).encode("utf-8")
+        except ValueError:
+            pass
+        digest = hashlib.sha1(body).hexdigest()[:12] if body else "-"
+        path = request.path.partition("?")[0]
+        return f"{request.method} {request.pretty_host}{path}?{urlencode(query)} {digest}"
+
+    def _intercepted(self, host):
+        hosts = [h.strip() for h in ctx.options.stub_hosts.split(",") if h.strip()]
+        return not hosts or any(host == h or host.endswith("." + h) for h in hosts)
+
+    # ----------------------------------------------------
+    # Hooks de mitmproxy
+    # ----------------------------------------------------
+
+    async def request(self, flow):
+        if flow.request.pretty_host == CONTROL_HOST:
+            self._control(flow)
+            return
+        if self.recording or not self._intercepted(flow.request.pretty_host):
+            return
+
+        key = self.key(flow.request)
+        recorded = self.responses.get(key)
+        if not recorded:
+            self.stats["misses"] += 1
+            logging.warning(f"Sin respuesta grabada: {key}")
+            if not ctx.options.stub_passthrough:
+                flow.response = http.Response.make(
+                    502,
+                    json.dumps({"error": "sin respuesta grabada", "key": key}),
+                    {"Content-Type": "application/json"},
+                )
+            return
+
+        entry = recorded[min(self.cursor[key], len(recorded) - 1)]
+        self.cursor[key] += 1
+        self.stats["hits"] += 1
+        if ctx.options.stub_latency == "recorded":
+            latency = entry.get("ms", 0)
+        else:
+            latency = float(ctx.options.stub_latency or 0)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+        flow.response = http.Response.make(
+            entry["status"],
+            base64.b64decode(entry["body"]),
+            [(name.encode("utf-8"), value.encode("utf-8")) for name, value in entry["headers"]],
+        )
+
+    def response(self, flow):
+        if not self.recording or flow.request.pretty_host == CONTROL_HOST:
+            return
+        if not self._intercepted(flow.request.pretty_host):
+            return
+        response = flow.response
+        self.responses.setdefault(self.key(flow.request), []).append({
+            "status": response.status_code,
+            "headers": [
+                [name, value] for name, value in response.headers.items(multi=True)
+                if name.lower() not in _DROPPED_HEADERS
+            ],
+            "body": base64.b64encode(response.content or b"").decode("ascii"),
+            "ms": round((response.timestamp_end - flow.request.timestamp_start) * 1000, 1)
+            if response.timestamp_end else 0,
+        })
+        self.stats["recorded"] += 1
+
+    def _control(self, flow):
+        parts = [p for p in flow.request.path.partition("?")[0].split("/") if p]
+        previous = None
+        if len(parts) == 2 and parts[0] == "scenario":
+            previous = self.use_scenario(unquote(parts[1]))
+        elif parts != ["status"]:
+            flow.response = http.Response.make(404, b"", {})
+            return
+        body = {
+            "mode": ctx.options.stub_mode,
+            "scenario": self.scenario,
+            "keys": len(self.responses),
+            "stats": dict(self.stats),
+            "previous": previous,
+        }
+        flow.response = http.Response.make(
+            200, json.dumps(body), {"Content-Type": "application/json"}
+        )
+
+
+addons = [BackendStub()]
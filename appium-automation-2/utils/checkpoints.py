@@ -0,0 +1,166 @@
+"""
+Checkpoints por paso para los reintentos (pytest-rerunfailures)
+Cada paso step_XX_* que termina en verde registra una huella de la pantalla en
+que dejó la app y las evidencias acumuladas hasta ese momento. Si la prueba
+falla y se reintenta sobre la misma sesión de Appium (APPIUM_SESSION_REUSE=True),
+se compara la pantalla actual con esas huellas: se reanuda después del último
+paso cuya huella coincide, se omiten los pasos ya verificados y sus evidencias
+se restauran para que el reporte final contenga el intento completo.
+Si ninguna huella coincide, la prueba se ejecuta desde el inicio.
+"""
+
+from config.settings import test
+from utils.page_snapshot import PageSnapshot
+
+
+def screen_fingerprint(snapshot):
+    """
+    Huella de una pantalla: clase, resource-id y content-desc/texto de cada nodo
+    identificable (se ignoran bounds y contenedores anónimos).
+
+    Returns:
+        frozenset: Elementos de la huella
+    """
+    fingerprint = set()
+    for node in snapshot.root.iter():
+        attrib = node.attrib
+        label = attrib.get("content-desc") or attrib.get("text") or ""
+        resource_id = attrib.get("resource-id") or ""
+        if label or resource_id:
+            fingerprint.add(f"{attrib.get('class', node.tag)}|{resource_id}|{label}")
+    return frozenset(fingerprint)
+
+
+def similarity(a, b):
+    """
+    Returns:
+        float: Índice de Jaccard entre dos huellas (1.0 = misma pantalla)
+    """
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class StepRecord:
+    """Paso verificado: huella posterior y evidencias acumuladas al terminar."""
+
+    __slots__ = ("name", "fingerprint", "photos", "step_count")
+
+    def __init__(self, name, fingerprint, photos, step_count):
+        self.name = name
+        self.fingerprint = fingerprint
+        self.photos = photos
+        self.step_count = step_count
+
+
+class StepCheckpoint:
+    """
+    Uso (lo hace el fixture valmex_driver):
+        checkpoint = StepCheckpoint.for_test(request.node.nodeid, driver)
+        if is_rerun and checkpoint.resume():
+            ...  # no reiniciar la app
+        token = StepRegistry.use_checkpoint(checkpoint)
+    """
+
+    _by_test = {}  # nodeid -> StepCheckpoint (sobrevive entre reintentos del proceso)
+
+    def __init__(self, nodeid, driver=None, min_similarity=None):
+        self.nodeid = nodeid
+        self.driver = driver
+        self.min_similarity = (
+            min_similarity if min_similarity is not None else test.CHECKPOINT_MIN_SIMILARITY
+        )
+        self.records = []
+        self._skip = set()
+
+    @classmethod
+    def for_test(cls, nodeid, driver):
+        checkpoint = cls._by_test.get(nodeid)
+        if checkpoint is None:
+            checkpoint = cls._by_test[nodeid] = cls(nodeid)
+        checkpoint.driver = driver
+        return checkpoint
+
+    @classmethod
+    def pending(cls, nodeid):
+        """
+        Returns:
+            bool: True si un intento anterior de la prueba dejó pasos verificados
+        """
+        checkpoint = cls._by_test.get(nodeid)
+        return checkpoint is not None and checkpoint.has_progress
+
+    @classmethod
+    def discard(cls, nodeid):
+        cls._by_test.pop(nodeid, None)
+
+    @property
+    def has_progress(self):
+        return bool(self.records)
+
+    def reset(self):
+        self.records = []
+        self._skip = set()
+
+    # ----------------------------------------------------
+    # Reanudación
+    # ----------------------------------------------------
+
+    def resume(self):
+        """
+        Busca el último paso verificado cuya huella coincide con la pantalla actual
+        y restaura sus evidencias en el evidence_state del driver.
+
+        Returns:
+            bool: True si se puede reanudar (los pasos previos se omitirán)
+        """
+        if not self.records:
+            return False
+        try:
+            current = screen_fingerprint(PageSnapshot.capture(self.driver))
+        except Exception as e:
+            print(f"⚠️ No se pudo leer la pantalla para reanudar: {e}")
+            self.reset()
+            return False
+
+        for position in range(len(self.records) - 1, -1, -1):
+            record = self.records[position]
+            if similarity(current, record.fingerprint) >= self.min_similarity:
+                self.records = self.records[: position + 1]
+                self._skip = {r.name for r in self.records}
+                state = getattr(self.driver, "evidence_state", {})
+                state["photo_paths"] = [dict(photo) for photo in record.photos]
+                state["step_count"] = record.step_count
+                state["resumed_after"] = record.name
+                print(
+                    f"⏩ Reanudando después de {record.name}: "
+                    f"{len(self._skip)} pasos ya verificados, "
+                    f"{len(record.photos)} evidencias restauradas"
+                )
+                return True
+
+        print("🔁 La pantalla no coincide con ningún paso verificado; se ejecuta desde el inicio")
+        self.reset()
+        return False
+
+    # ----------------------------------------------------
+    # Ganchos llamados por StepRegistry
+    # ----------------------------------------------------
+
+    def should_skip(self, info):
+        if info.name in self._skip:
+            print(f"⏭️ {info.name} ya verificado en el intento anterior")
+            return True
+        return False
+
+    def step_passed(self, info):
+        try:
+            fingerprint = screen_fingerprint(PageSnapshot.capture(self.driver))
+        except Exception as e:
+            print(f"⚠️ No se pudo registrar el checkpoint de {info.name}: {e}")
+            return
+        state = getattr(self.driver, "evidence_state", {})
+        photos = [dict(photo) for photo in state.get("photo_paths", [])]
+        self.records.append(
+            StepRecord(info.name, fingerprint, photos, state.get("step_count", 0))
+        )
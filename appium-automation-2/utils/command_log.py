@@ -0,0 +1,286 @@
+"""
+Grabación y reproducción de los comandos de Appium por prueba
+Con APPIUM_COMMAND_LOG=record cada comando WebDriver de la prueba y su respuesta
+se guardan en command_logs/<prueba>.jsonl (una línea de cabecera con la sesión
+y una línea por comando). Con APPIUM_COMMAND_LOG=replay la prueba se ejecuta sin
+Appium ni emulador: ReplayConnection responde cada comando con la respuesta
+grabada, en el mismo orden, y detecta cualquier divergencia en la secuencia
+(comando o parámetros distintos), lo que permite ajustar localizadores y
+parsers de los page objects en un ciclo local de milisegundos.
+
+Las esperas fijas (sleep) de los page objects siguen corriendo; las esperas por
+sondeo (ScreenWaiter, WebDriverWait) avanzan al ritmo de las respuestas grabadas.
+"""
+
+import copy
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+import urllib3
+from appium.webdriver.appium_connection import AppiumConnection
+from appium.webdriver.client_config import AppiumClientConfig
+from appium.webdriver.mobilecommand import MobileCommand
+from selenium.webdriver.remote.command import Command
+
+from config.settings import appium
+from utils.transport import TunedAppiumConnection
+
+LOG_FORMAT = 1
+# Parámetros que cambian entre ejecuciones y no cuentan como divergencia
+VOLATILE_PARAMS = ("sessionId", "remotePath")
+_UNSAFE_RE = re.compile(r"[^\w.-]+")
+
+
+class ReplayDivergence(AssertionError):
+    """La prueba emitió un comando distinto al grabado en esa posición."""
+
+
+def log_path_for(nodeid, base_dir=None):
+    """
+    Returns:
+        str: Ruta del log de una prueba (p. ej. command_logs/tests_12_APP..._test_venta.jsonl)
+    """
+    base_dir = str(base_dir or appium.COMMAND_LOG_DIR)
+    return os.path.join(base_dir, _UNSAFE_RE.sub("_", nodeid).strip("_") + ".jsonl")
+
+
+def _normalize(params):
+    """Copia JSON de los parámetros sin los valores volátiles."""
+    params = json.loads(json.dumps(params or {}, default=str))
+    if isinstance(params, dict):
+        for key in VOLATILE_PARAMS:
+            params.pop(key, None)
+        options = params.get("options")
+        if isinstance(options, dict):
+            for key in VOLATILE_PARAMS:
+                options.pop(key, None)
+    return params
+
+
+def _describe(command, params, start=0):
+    text = json.dumps(params, ensure_ascii=False, sort_keys=True)
+    start = max(0, min(start, len(text) - 160))
+    return f"{command} {'…' if start else ''}{text[start:start + 160]}{'…' if len(text) > start + 160 else ''}"
+
+
+def _first_difference(a, b):
+    a = json.dumps(a, ensure_ascii=False, sort_keys=True)
+    b = json.dumps(b, ensure_ascii=False, sort_keys=True)
+    position = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+    return max(0, position - 60)
+
+
+# ----------------------------------------------------
+# Grabación
+# ----------------------------------------------------
+
+class RecordingAppiumConnection(TunedAppiumConnection):
+    """
+    TunedAppiumConnection que guarda cada comando con su respuesta.
+
+    Uso (lo hace el fixture valmex_driver con APPIUM_COMMAND_LOG=record):
+        driver.command_executor.start_segment()
+        ...  # la prueba
+        driver.command_executor.save(log_path_for(nodeid), test=nodeid)
+    """
+
+    def __init__(self, client_config, **kwargs):
+        self.entries = []
+        self.session_response = None
+        super().__init__(client_config, **kwargs)
+
+    def start_segment(self):
+        """Descarta lo grabado hasta ahora (la sesión puede venir de una prueba anterior)."""
+        self.entries = []
+
+    def execute(self, command, params):
+        recorded_params = _normalize(params)
+        started_at = time.perf_counter()
+        try:
+            response = super().execute(command, params)
+        except Exception as e:
+            self._record(command, recorded_params, started_at, error=f"{type(e).__name__}: {e}")
+            raise
+        if command == Command.NEW_SESSION:
+            self.session_response = copy.deepcopy(response)
+        elif command != Command.QUIT:
+            self._record(command, recorded_params, started_at, response=copy.deepcopy(response))
+        return response
+
+    def _record(self, command, params, started_at, response=None, error=None):
+        entry = {
+            "command": command,
+            "params": params,
+            "ms": round((time.perf_counter() - started_at) * 1000, 2),
+        }
+        if error is not None:
+            entry["error"] = error
+        else:
+            entry["response"] = response
+        self.entries.append(entry)
+
+    def save(self, filepath, test=None):
+        """
+        Escribe el log JSON Lines: cabecera (sesión) y un comando por línea.
+
+        Returns:
+            str: Ruta del archivo o None si falla
+        """
+        try:
+            os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+            header = {
+                "format": LOG_FORMAT,
+                "test": test,
+                "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                "server": self._client_config.remote_server_addr,
+                "session": self.session_response,
+                "commands": len(self.entries),
+            }
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(json.dumps(header, ensure_ascii=False) + "\n")
+                for entry in self.entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            return filepath
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar el log de comandos: {e}")
+            return None
+
+
+# ----------------------------------------------------
+# Reproducción
+# ----------------------------------------------------
+
+class ReplayConnection(AppiumConnection):
+    """
+    Conexión sin red que responde con un log grabado.
+
+    - strict=True: la primera divergencia lanza ReplayDivergence y el replay se
+      detiene (los comandos siguientes también fallan)
+    - strict=False: se busca el comando en las siguientes `lookahead` entradas;
+      las entradas saltadas se anotan en `divergences` y el replay continúa
+    """
+
+    def __init__(self, filepath, strict=True, lookahead=50):
+        with open(filepath, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get("format") != LOG_FORMAT:
+            raise ValueError(f"Log de comandos no válido: {filepath}")
+
+        self.filepath = filepath
+        self.header = lines[0]
+        self.entries = lines[1:]
+        self.strict = strict
+        self.lookahead = lookahead
+        self.position = 0
+        self.divergences = []
+        self._derailed = False
+        self._started_at = None
+        super().__init__(
+            client_config=AppiumClientConfig(
+                remote_server_addr=self.header.get("server") or "http://replay", keep_alive=True
+            )
+        )
+
+    # video.py ajusta command_executor._timeout durante la descarga del video
+    @property
+    def _timeout(self):
+        return self._client_config.timeout
+
+    @_timeout.setter
+    def _timeout(self, value):
+        self._client_config.timeout = value
+
+    @property
+    def remaining(self):
+        return len(self.entries) - self.position
+
+    def execute(self, command, params):
+        if command == Command.NEW_SESSION:
+            self._started_at = time.perf_counter()
+            return copy.deepcopy(self.header.get("session") or {"value": {"sessionId": "replay"}})
+        if command == Command.QUIT:
+            return {"value": None}
+
+        actual = _normalize(params)
+        if self._derailed:
+            raise ReplayDivergence(f"❌ Replay detenido por una divergencia anterior: {_describe(command, actual)}")
+
+        entry = self._next_matching(command, actual)
+        self._upload_if_requested(command, params)
+        if "error" in entry:
+            raise ConnectionError(f"(grabado) {entry['error']}")
+        return copy.deepcopy(entry["response"])
+
+    def _next_matching(self, command, actual):
+        if self.position >= len(self.entries):
+            self._diverge(
+                f"❌ Comando #{self.position + 1} no grabado (el log terminó): {_describe(command, actual)}"
+            )
+
+        window = self.entries[self.position:self.position + 1 + (0 if self.strict else self.lookahead)]
+        for offset, entry in enumerate(window):
+            if entry["command"] == command and entry["params"] == actual:
+                if offset:
+                    skipped = self.entries[self.position:self.position + offset]
+                    self.divergences.append({
+                        "position": self.position + 1,
+                        "type": "skipped",
+                        "skipped": [_describe(e["command"], e["params"]) for e in skipped],
+                    })
+                    print(f"⚠️ Replay: {offset} comando(s) grabado(s) no emitidos antes de #{self.position + offset + 1}")
+                self.position += offset + 1
+                return entry
+
+        expected = self.entries[self.position]
+        start = _first_difference(expected["params"], actual) if expected["command"] == command else 0
+        self._diverge(
+            f"❌ Divergencia en el comando #{self.position + 1}:\n"
+            f"   grabado: {_describe(expected['command'], expected['params'], start)}\n"
+            f"   emitido: {_describe(command, actual, start)}"
+        )
+
+    def _diverge(self, message):
+        self.divergences.append({"position": self.position + 1, "type": "mismatch", "message": message})
+        self._derailed = True
+        print(message)
+        raise ReplayDivergence(message)
+
+    def _upload_if_requested(self, command, params):
+        # Al detener el video con remotePath, Appium sube el archivo al receptor
+        # local; sin esa subida video.py esperaría hasta EVIDENCE_VIDEO_TIMEOUT
+        options = (params or {}).get("options") or {}
+        if command != MobileCommand.STOP_RECORDING_SCREEN or not options.get("remotePath"):
+            return
+        try:
+            urllib3.PoolManager(retries=False).request(
+                options.get("method", "PUT"), options["remotePath"], body=b"", timeout=5
+            )
+        except Exception as e:
+            print(f"⚠️ Replay: no se pudo simular la subida del video: {e}")
+
+    def report(self):
+        """
+        Returns:
+            dict: Comandos reproducidos, sin consumir, divergencias y tiempos
+        """
+        recorded_ms = sum(entry.get("ms", 0) for entry in self.entries[:self.position])
+        replay_seconds = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            "log": self.filepath,
+            "replayed": self.position,
+            "remaining": self.remaining,
+            "divergences": self.divergences,
+            "recorded_seconds": round(recorded_ms / 1000, 3),
+            "replay_seconds": round(replay_seconds, 3),
+        }
+
+    def print_report(self):
+        report = self.report()
+        print(
+            f"📼 Replay {os.path.basename(self.filepath)}: {report['replayed']} comandos en "
+            f"{report['replay_seconds']:.2f}s (grabados en {report['recorded_seconds']:.2f}s), "
+            f"{report['remaining']} sin consumir, {len(report['divergences'])} divergencia(s)"
+        )
@@ -0,0 +1,144 @@
+"""
+Perfilado de comandos de Appium por prueba
+Envuelve command_executor.execute (el punto por el que pasa toda petición
+HTTP al servidor) y registra comando, estrategia de localización, duración y
+el método del page object que lo originó, p. ej.
+ValmexVenderPage._get_selected_fund_value. Se activa con TEST_PROFILE_COMMANDS.
+"""
+
+import json
+import os
+import sys
+import time
+
+# Módulos cuyo frame identifica el origen de un comando (en orden de prioridad)
+CALL_SITE_PREFIXES = ("pages.", "utils.waits", "utils.evidences", "tests.")
+
+
+def _call_site(max_depth=30):
+    """
+    Busca en la pila el primer frame de un page object (o de la prueba).
+
+    Returns:
+        str: 'Clase.metodo' o 'modulo.funcion'; '?' si no se encuentra
+    """
+    frame = sys._getframe(2)
+    fallback = None
+    depth = 0
+    while frame is not None and depth < max_depth:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(CALL_SITE_PREFIXES):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            site = f"{type(owner).__name__}.{name}" if owner is not None else f"{module}.{name}"
+            if module.startswith("pages."):
+                return site
+            fallback = fallback or site
+        frame = frame.f_back
+        depth += 1
+    return fallback or "?"
+
+
+class CommandProfiler:
+    """
+    Registra cada comando WebDriver emitido por un driver.
+
+    Uso:
+        profiler = CommandProfiler.attach(driver)
+        ...
+        profile = profiler.detach()
+    """
+
+    def __init__(self, driver, top_n=10):
+        self.driver = driver
+        self.top_n = top_n
+        self.records = []
+        self._executor = driver.command_executor
+        self._was_wrapped = "execute" in self._executor.__dict__
+        self._original_execute = self._executor.execute
+        self._started_at = time.perf_counter()
+
+    @classmethod
+    def attach(cls, driver, top_n=10):
+        profiler = cls(driver, top_n=top_n)
+        profiler._executor.execute = profiler._execute
+        return profiler
+
+    def _execute(self, command, params):
+        # execute() de Selenium elimina de params las variables de la URL
+        using = value = None
+        if isinstance(params, dict):
+            using = params.get("using")
+            value = params.get("value") if using else None
+        site = _call_site()
+        started_at = time.perf_counter()
+        try:
+            return self._original_execute(command, params)
+        finally:
+            self.records.append({
+                "command": command,
+                "using": using,
+                "value": value[:120] if isinstance(value, str) else None,
+                "ms": round((time.perf_counter() - started_at) * 1000, 2),
+                "call_site": site,
+            })
+
+    def detach(self):
+        """
+        Restaura el execute original y devuelve el resumen.
+
+        Returns:
+            dict: Ver summary()
+        """
+        if self._was_wrapped:
+            self._executor.execute = self._original_execute
+        else:
+            self._executor.__dict__.pop("execute", None)
+        return self.summary()
+
+    def summary(self):
+        """
+        Returns:
+            dict: total de comandos y ms, los N comandos más lentos, y el tiempo
+                  agregado por comando y por método de origen
+        """
+        by_command = {}
+        by_site = {}
+        for record in self.records:
+            key = record["command"] if not record["using"] else f"{record['command']} ({record['using']})"
+            for bucket, name in ((by_command, key), (by_site, record["call_site"])):
+                entry = bucket.setdefault(name, {"name": name, "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                entry["count"] += 1
+                entry["total_ms"] = round(entry["total_ms"] + record["ms"], 2)
+                entry["max_ms"] = max(entry["max_ms"], record["ms"])
+
+        def top(bucket):
+            return sorted(bucket.values(), key=lambda e: e["total_ms"], reverse=True)[: self.top_n]
+
+        return {
+            "total_commands": len(self.records),
+            "total_ms": round(sum(r["ms"] for r in self.records), 2),
+            "wall_seconds": round(time.perf_counter() - self._started_at, 2),
+            "slowest_commands": sorted(self.records, key=lambda r: r["ms"], reverse=True)[: self.top_n],
+            "by_command": top(by_command),
+            "by_call_site": top(by_site),
+        }
+
+    def save(self, output_dir, test_name, summary=None):
+        """
+        Guarda el perfil completo (resumen + registros) como JSON.
+
+        Returns:
+            str: Ruta del archivo
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in test_name)
+        filepath = os.path.join(output_dir, f"perfil_comandos_{safe_name}.json")
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(
+                {"test": test_name, "summary": summary or self.summary(), "records": self.records},
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+        return filepath
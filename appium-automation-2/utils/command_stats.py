@@ -0,0 +1,60 @@
+"""
+Conteo de peticiones al servidor de Appium
+Todas las órdenes WebDriver (del driver y de sus elementos) pasan por
+driver.execute, así que basta con envolverlo temporalmente para medir
+cuántas peticiones y cuánto tiempo consume una operación.
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class CommandCount:
+    """Resultado de una medición: número de peticiones y segundos totales."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.commands = {}
+        self.seconds = 0.0
+
+    def add(self, command):
+        self.round_trips += 1
+        self.commands[command] = self.commands.get(command, 0) + 1
+
+    def as_dict(self):
+        return {
+            "round_trips": self.round_trips,
+            "seconds": round(self.seconds, 3),
+            "commands": dict(self.commands),
+        }
+
+
+@contextmanager
+def count_commands(driver):
+    """
+    Cuenta las peticiones WebDriver emitidas dentro del bloque.
+
+    Uso:
+        with count_commands(driver) as stats:
+            page.select_fund_by_name("VALMXES")
+        print(stats.round_trips, stats.seconds)
+    """
+    stats = CommandCount()
+    original_execute = driver.execute
+    was_wrapped = "execute" in driver.__dict__
+
+    def counting_execute(driver_command, params=None):
+        stats.add(driver_command)
+        return original_execute(driver_command, params)
+
+    driver.execute = counting_execute
+    started_at = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.seconds = time.perf_counter() - started_at
+        if was_wrapped:
+            driver.execute = original_execute
+        else:
+            # Quitar el atributo de instancia restaura el método de la clase
+            del driver.execute
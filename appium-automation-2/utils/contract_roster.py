@@ -0,0 +1,123 @@
+"""
+Lista de contratos de la pantalla de venta
+Se lee una sola vez por entrada a la pantalla (un page_source) y se conserva
+con su content-desc y bounds; la selección por índice y la consulta de montos
+usan esos datos y tocan el centro de los bounds guardados, sin volver a buscar
+el elemento. Se invalida al navegar o hacer scroll.
+"""
+
+import re
+from dataclasses import dataclass
+
+from utils.page_snapshot import PageSnapshot, parse_bounds
+
+_CONTRACT_NUMBER_RE = re.compile(r"Contrato - (\d+)")
+
+
+@dataclass(frozen=True)
+class ContractInfo:
+    """Contrato tal como aparece en la lista."""
+
+    index: int
+    contract_number: str
+    amount: str
+    full_description: str
+    bounds: str = None
+
+    @property
+    def center(self):
+        """
+        Returns:
+            tuple: (x, y) del centro de los bounds o None si no hay bounds
+        """
+        rect = parse_bounds(self.bounds)
+        if rect is None:
+            return None
+        x1, y1, x2, y2 = rect
+        return (x1 + x2) // 2, (y1 + y2) // 2
+
+    def as_dict(self):
+        return {
+            "index": self.index,
+            "contract_number": self.contract_number,
+            "amount": self.amount,
+            "full_description": self.full_description,
+            "bounds": self.bounds,
+        }
+
+
+def parse_contract_description(index, description, bounds=None):
+    """
+    Parsea el content-desc de un contrato, p. ej.
+    "Contrato - 244231\\nInversión a la vista\\n$ 845,120.10".
+
+    Returns:
+        ContractInfo: Datos del contrato
+    """
+    lines = description.split("\n")
+    number_match = _CONTRACT_NUMBER_RE.search(lines[0])
+    contract_number = number_match.group(1) if number_match else "Unknown"
+    # El monto es la primera línea con "$"; si no la hay, la segunda línea
+    amount = next((line for line in lines[1:] if "$" in line), None)
+    if amount is None:
+        amount = lines[1] if len(lines) > 1 else "N/A"
+    return ContractInfo(index, contract_number, amount.strip(), description, bounds)
+
+
+class ContractRoster:
+    """
+    Contratos visibles en la pantalla, leídos con un solo page_source.
+
+    Uso:
+        roster = ContractRoster(ValmexVenderPage.CONTRACT_ITEM)
+        contract = roster.by_index(driver, 1)
+        roster.invalidate()  # al navegar
+    """
+
+    def __init__(self, locator):
+        self.locator = locator
+        self.reads = 0
+        self._contracts = None
+
+    @property
+    def loaded(self):
+        return self._contracts is not None
+
+    def contracts(self, driver, refresh=False):
+        """
+        Returns:
+            list: ContractInfo en el orden de la pantalla (lee solo si no hay caché)
+        """
+        if self._contracts is None or refresh:
+            self.read(driver)
+        return self._contracts
+
+    def read(self, driver, snapshot=None):
+        """
+        Lee la lista de contratos (una petición si no se pasa un snapshot).
+
+        Returns:
+            list: ContractInfo leídos
+        """
+        snapshot = snapshot or PageSnapshot.capture(driver)
+        nodes = [node for node in snapshot.find_all(self.locator) if node.content_desc]
+        self._contracts = [
+            parse_contract_description(i, node.content_desc, node.attrib.get("bounds"))
+            for i, node in enumerate(nodes)
+        ]
+        self.reads += 1
+        return self._contracts
+
+    def by_index(self, driver, index):
+        contracts = self.contracts(driver)
+        return contracts[index] if 0 <= index < len(contracts) else None
+
+    def by_number(self, driver, contract_number):
+        contract_number = str(contract_number)
+        return next(
+            (c for c in self.contracts(driver) if c.contract_number == contract_number),
+            None,
+        )
+
+    def invalidate(self):
+        self._contracts = None
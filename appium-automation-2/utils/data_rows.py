@@ -0,0 +1,113 @@
+"""
+Ejecución de varias filas de datos en una misma sesión
+El libro de Excel conserva la hoja "data" (key/value) con los valores comunes
+(p. ej. password) y agrega una hoja "rows": la primera fila son los encabezados
+y cada fila siguiente es un caso. Las celdas vacías toman el valor común.
+Cada fila se convierte en un caso de pytest (data_row) y las filas se ordenan
+agrupando las que usan el mismo contrato, para navegar lo menos posible.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+
+import openpyxl
+
+TEST_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_data")
+
+_ID_UNSAFE_RE = re.compile(r"[^\w-]+")
+
+
+@dataclass(frozen=True)
+class DataRow:
+    """Una fila de datos; se lee como el diccionario de TestData (row["password"])."""
+
+    index: int  # Número de fila en la hoja (o 0 si el libro no tiene hoja de filas)
+    values: dict = field(default_factory=dict)
+
+    @property
+    def id(self):
+        """
+        Returns:
+            str: Identificador del caso, p. ej. "fila03-244231" (se usa en evidencias)
+        """
+        contract = self.values.get("contract")
+        label = f"fila{self.index:02d}"
+        if contract not in (None, ""):
+            label += "-" + _ID_UNSAFE_RE.sub("_", str(contract))
+        return label
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def as_dict(self):
+        return {"row": self.index, "id": self.id, **self.values}
+
+
+def _read_key_values(sheet):
+    values = {}
+    for row in sheet.iter_rows(min_row=2, values_only=True):
+        if row and row[0] is not None:
+            values[str(row[0]).strip()] = row[1] if len(row) > 1 else None
+    return values
+
+
+def load_rows(path, sheet="rows", defaults_sheet="data"):
+    """
+    Lee las filas de datos de un libro.
+
+    Args:
+        path (str): Ruta del libro (relativa a test_data/ o absoluta)
+        sheet (str): Hoja con una fila por caso
+        defaults_sheet (str): Hoja key/value con los valores comunes
+
+    Returns:
+        list: DataRow en el orden del libro (una sola fila si no existe la hoja de filas)
+    """
+    if not os.path.isabs(path):
+        path = os.path.join(TEST_DATA_DIR, path)
+
+    book = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        defaults = (
+            _read_key_values(book[defaults_sheet]) if defaults_sheet in book.sheetnames else {}
+        )
+        if sheet not in book.sheetnames:
+            return [DataRow(0, defaults)]
+
+        rows = book[sheet].iter_rows(values_only=True)
+        headers = [str(h).strip() if h is not None else None for h in next(rows, ())]
+        data_rows = []
+        for number, row in enumerate(rows, start=2):
+            if not any(cell not in (None, "") for cell in row):
+                continue
+            values = dict(defaults)
+            for header, cell in zip(headers, row):
+                if header and cell not in (None, ""):
+                    values[header] = cell
+            data_rows.append(DataRow(number, values))
+        return data_rows
+    finally:
+        book.close()
+
+
+def order_rows(rows, group_by="contract"):
+    """
+    Agrupa las filas con el mismo valor de group_by (en el orden de la primera
+    aparición de cada grupo), conservando el orden del libro dentro de cada grupo.
+
+    Returns:
+        list: DataRow reordenados
+    """
+    if not group_by:
+        return list(rows)
+    groups = {}
+    for row in rows:
+        groups.setdefault(str(row.get(group_by, "")), []).append(row)
+    return [row for group in groups.values() for row in group]
@@ -0,0 +1,228 @@
+"""
+Registro de dispositivos para ejecución paralela con pytest-xdist
+Cada worker obtiene en exclusiva un dispositivo del pool (udid, AVD y puertos
+propios de UiAutomator2) mediante un archivo de arrendamiento bloqueado por el
+sistema operativo: si el worker muere, el bloqueo se libera solo.
+"""
+
+import atexit
+import json
+import os
+import re
+import socket
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class DeviceSlot:
+    """Dispositivo del pool con sus puertos dedicados."""
+
+    def __init__(self, index, udid, avd=None, system_port=8200, chromedriver_port=9515, mjpeg_port=7810):
+        self.index = index
+        self.udid = udid
+        self.avd = avd
+        self.system_port = system_port
+        self.chromedriver_port = chromedriver_port
+        self.mjpeg_port = mjpeg_port
+
+    def as_dict(self):
+        return {
+            "index": self.index,
+            "udid": self.udid,
+            "avd": self.avd,
+            "systemPort": self.system_port,
+            "chromedriverPort": self.chromedriver_port,
+            "mjpegServerPort": self.mjpeg_port,
+        }
+
+    def __repr__(self):
+        return f"<DeviceSlot {self.index} {self.udid} avd={self.avd}>"
+
+
+def _try_lock(fh):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fh):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+
+
+class DeviceLease:
+    """Arrendamiento activo de un dispositivo por parte de este proceso."""
+
+    def __init__(self, slot, path, handle, worker_id):
+        self.slot = slot
+        self.path = path
+        self.worker_id = worker_id
+        self._handle = handle
+        atexit.register(self.release)
+
+    @property
+    def active(self):
+        return self._handle is not None
+
+    def apply(self, capabilities):
+        """
+        Ajusta las capabilities al dispositivo arrendado.
+
+        Args:
+            capabilities (dict): Capabilities base (get_valmex_capabilities_*)
+
+        Returns:
+            dict: Copia con deviceName, udid, avd y puertos del dispositivo
+        """
+        caps = dict(capabilities)
+        caps["appium:deviceName"] = self.slot.udid
+        caps["appium:udid"] = self.slot.udid
+        if "appium:avd" in caps and self.slot.avd:
+            caps["appium:avd"] = self.slot.avd
+        caps["appium:systemPort"] = self.slot.system_port
+        caps["appium:chromedriverPort"] = self.slot.chromedriver_port
+        caps["appium:mjpegServerPort"] = self.slot.mjpeg_port
+        return caps
+
+    def release(self):
+        """Libera el dispositivo (también se ejecuta al salir del proceso)."""
+        if self._handle is None:
+            return
+        handle, self._handle = self._handle, None
+        try:
+            handle.seek(0)
+            handle.truncate()
+        except OSError:
+            pass
+        _unlock(handle)
+        handle.close()
+        print(f"🔓 Dispositivo liberado: {self.slot.udid} ({self.worker_id})")
+
+
+class DeviceRegistry:
+    """
+    Pool de dispositivos compartido entre workers.
+    El worker gwN prefiere el dispositivo N y, si está ocupado, toma el primero libre.
+    """
+
+    def __init__(self, slots, lease_dir, worker_id=None):
+        self.slots = list(slots)
+        self.lease_dir = str(lease_dir)
+        self.worker_id = worker_id or os.getenv("PYTEST_XDIST_WORKER", "master")
+
+    @classmethod
+    def from_config(cls, device_config):
+        """
+        Construye el pool desde DEVICE_POOL ('udid[:avd],udid[:avd]');
+        sin pool configurado usa DEVICE_NAME / DEVICE_AVD.
+        """
+        entries = [e.strip() for e in device_config.POOL.split(",") if e.strip()]
+        if not entries:
+            entries = [f"{device_config.DEVICE_NAME}:{device_config.DEVICE_AVD}"]
+
+        slots = []
+        for index, entry in enumerate(entries):
+            udid, _, avd = entry.partition(":")
+            slots.append(
+                DeviceSlot(
+                    index,
+                    udid.strip(),
+                    avd.strip() or None,
+                    system_port=device_config.SYSTEM_PORT_BASE + index,
+                    chromedriver_port=device_config.CHROMEDRIVER_PORT_BASE + index,
+                    mjpeg_port=device_config.MJPEG_PORT_BASE + index,
+                )
+            )
+        return cls(slots, device_config.LEASE_DIR)
+
+    def _preferred_order(self):
+        match = re.search(r"(\d+)$", self.worker_id)
+        start = int(match.group(1)) % len(self.slots) if match else 0
+        return self.slots[start:] + self.slots[:start]
+
+    def _lease_path(self, slot):
+        safe_udid = re.sub(r"[^A-Za-z0-9_.-]", "_", slot.udid)
+        return os.path.join(self.lease_dir, f"{safe_udid}.lease")
+
+    def try_acquire(self):
+        """
+        Intenta arrendar un dispositivo libre sin esperar.
+
+        Returns:
+            DeviceLease: Arrendamiento o None si todos están ocupados
+        """
+        os.makedirs(self.lease_dir, exist_ok=True)
+        for slot in self._preferred_order():
+            path = self._lease_path(slot)
+            handle = open(path, "a+")
+            if not _try_lock(handle):
+                handle.close()
+                continue
+            handle.seek(0)
+            handle.truncate()
+            handle.write(
+                json.dumps(
+                    {
+                        "worker": self.worker_id,
+                        "pid": os.getpid(),
+                        "host": socket.gethostname(),
+                        "since": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "device": slot.as_dict(),
+                    }
+                )
+            )
+            handle.flush()
+            print(f"🔒 Dispositivo arrendado: {slot.udid} (worker {self.worker_id})")
+            return DeviceLease(slot, path, handle, self.worker_id)
+        return None
+
+    def check_capacity(self, worker_count):
+        """
+        Verifica que haya un dispositivo por worker: con menos dispositivos que
+        workers, los sobrantes esperarían el tiempo completo de acquire().
+
+        Raises:
+            RuntimeError: Si el pool es menor que el número de workers
+        """
+        if worker_count > len(self.slots):
+            raise RuntimeError(
+                f"El pool tiene {len(self.slots)} dispositivo(s) para {worker_count} workers de "
+                f"pytest-xdist (pool: {[s.udid for s in self.slots]}). Define DEVICE_POOL con "
+                f"al menos {worker_count} dispositivos o ejecuta con -n {len(self.slots)}"
+            )
+
+    def acquire(self, timeout=600, poll_interval=2.0):
+        """
+        Arrienda un dispositivo, esperando a que alguno se libere.
+
+        Raises:
+            RuntimeError: Si no hay dispositivos libres en el tiempo indicado
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            lease = self.try_acquire()
+            if lease is not None:
+                return lease
+            if time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"No hay dispositivos libres para el worker {self.worker_id} "
+                    f"tras {timeout}s (pool: {[s.udid for s in self.slots]})"
+                )
+            time.sleep(poll_interval)
@@ -0,0 +1,140 @@
+"""
+Gestor de sesiones reutilizables de Appium
+Mantiene viva una única sesión de UiAutomator2 por ejecución (o por worker de
+pytest-xdist) y reinicia la app entre pruebas en lugar de crear una sesión nueva.
+"""
+
+import json
+import os
+import time
+
+from utils.appium_driver import AppiumDriver
+
+
+class DriverSessionManager:
+    """
+    Entrega el mismo driver a todas las pruebas de un worker y contabiliza
+    el tiempo de arranque ahorrado frente a crear una sesión por prueba.
+    """
+
+    RESET_STRATEGIES = ("terminate", "clear")
+
+    def __init__(self, capabilities, package_name, reset_strategy="terminate"):
+        """
+        Args:
+            capabilities (dict): Capabilities del dispositivo
+            package_name (str): Paquete de la app a reiniciar entre pruebas
+            reset_strategy (str): 'terminate' o 'clear'
+        """
+        if reset_strategy not in self.RESET_STRATEGIES:
+            print(
+                f"⚠️ Estrategia de reinicio '{reset_strategy}' no soportada, se usa 'terminate'"
+            )
+            reset_strategy = "terminate"
+
+        self.capabilities = capabilities
+        self.package_name = package_name
+        self.reset_strategy = reset_strategy
+        self.worker_id = os.getenv("PYTEST_XDIST_WORKER", "master")
+        self.appium_driver = None
+        self.stats = {
+            "worker": self.worker_id,
+            "reset_strategy": reset_strategy,
+            "cold_starts": 0,
+            "cold_start_seconds": 0.0,
+            "reuses": 0,
+            "reset_seconds": 0.0,
+        }
+
+    def acquire(self, reset_app=True):
+        """
+        Retorna el driver de la sesión compartida.
+        La primera llamada arranca la sesión; las siguientes solo reinician la app.
+        Si el reinicio falla (sesión caída) se arranca una sesión nueva.
+
+        Args:
+            reset_app (bool): Si False, la app se deja en la pantalla en que quedó
+                (la prueba navega con ScreenNavigator); solo se verifica la sesión
+
+        Returns:
+            driver: Instancia del driver de Appium
+        """
+        if self.appium_driver is None:
+            return self._cold_start()
+
+        started_at = time.perf_counter()
+        try:
+            if reset_app:
+                self.appium_driver.reset_app(self.package_name, self.reset_strategy)
+            else:
+                self.appium_driver.get_driver().current_package
+        except Exception as e:
+            print(f"⚠️ No se pudo reiniciar la app en la sesión existente: {e}")
+            self.appium_driver.stop_driver()
+            self.appium_driver = None
+            return self._cold_start()
+
+        elapsed = time.perf_counter() - started_at
+        self.stats["reuses"] += 1
+        self.stats["reset_seconds"] += elapsed
+        print(
+            f"♻️ Sesión reutilizada ({self.reset_strategy if reset_app else 'sin reinicio'}) "
+            f"en {elapsed:.2f}s"
+        )
+        return self.appium_driver.get_driver()
+
+    def _cold_start(self):
+        self.appium_driver = AppiumDriver(self.capabilities)
+        driver = self.appium_driver.start_driver()
+        self.stats["cold_starts"] += 1
+        self.stats["cold_start_seconds"] += self.appium_driver.startup_seconds or 0.0
+        return driver
+
+    def time_saved(self):
+        """
+        Estima los segundos ahorrados: cada reutilización evita un arranque en
+        frío (tomando el promedio medido) a cambio del tiempo de reinicio de la app.
+
+        Returns:
+            float: Segundos ahorrados (puede ser 0 si no hubo reutilizaciones)
+        """
+        if not self.stats["cold_starts"]:
+            return 0.0
+        avg_cold_start = self.stats["cold_start_seconds"] / self.stats["cold_starts"]
+        return max(0.0, avg_cold_start * self.stats["reuses"] - self.stats["reset_seconds"])
+
+    def report(self):
+        """
+        Retorna el resumen de la sesión con el tiempo ahorrado
+
+        Returns:
+            dict: Estadísticas de arranques, reutilizaciones y ahorro
+        """
+        summary = dict(self.stats)
+        summary["seconds_saved"] = round(self.time_saved(), 2)
+        return summary
+
+    def save_report(self, output_dir):
+        """
+        Guarda el resumen como JSON en output_dir (un archivo por worker)
+
+        Returns:
+            str: Ruta del archivo generado o None si falla
+        """
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            report_path = os.path.join(output_dir, f"session_reuse_{self.worker_id}.json")
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+            return report_path
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar el reporte de reutilización de sesión: {e}")
+            return None
+
+    def shutdown(self):
+        """
+        Cierra la sesión compartida
+        """
+        if self.appium_driver:
+            self.appium_driver.stop_driver()
+            self.appium_driver = None
@@ -2,6 +2,7 @@
 from .video import VideoRecorder
 from .capture import EvidenceCapturer
 from .report import Reporter
+from .steps import StepRegistry, step
 
 # compat API (mantiene las mismas funciones que usabas)
 _default_manager = {
@@ -16,6 +17,9 @@ def start_video_recording(driver, test_name: str):
 def take_evidence(driver, step_log: str = "N/A"):
     return _default_manager["capture"].take_evidence(driver, step_log)
 
+def flush_evidence(driver, timeout=None):
+    return _default_manager["capture"].flush(driver, timeout=timeout)
+
 def stop_and_save_video_if_recording(driver, test_name: str):
     return _default_manager["video"].stop_and_save_video_if_recording(driver, test_name)
 
@@ -28,7 +32,10 @@ def generate_pdf_report(driver, status="PASSED", company_name=None):
 __all__ = [
     "start_video_recording",
     "take_evidence",
+    "flush_evidence",
     "stop_and_save_video_if_recording",
     "generate_html_report",
-    "generate_pdf_report"
+    "generate_pdf_report",
+    "StepRegistry",
+    "step",
 ]
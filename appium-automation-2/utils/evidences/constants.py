@@ -15,12 +15,25 @@ VIDEO_ENABLED = evidence.VIDEO_ENABLED
 VIDEO_CODEC = evidence.VIDEO_CODEC
 VIDEO_TIME_LIMIT = evidence.VIDEO_TIME_LIMIT
 VIDEO_TIMEOUT = evidence.VIDEO_TIMEOUT
+VIDEO_STREAM_UPLOAD = evidence.VIDEO_STREAM_UPLOAD
+VIDEO_SINK_HOST = evidence.VIDEO_SINK_HOST
+VIDEO_SINK_PORT = evidence.VIDEO_SINK_PORT
 
 # Configuración de imágenes
 IMAGE_MAX_DIMENSION = evidence.IMAGE_MAX_DIMENSION
 IMAGE_QUALITY = evidence.IMAGE_QUALITY
+THUMB_MAX_DIMENSION = evidence.THUMB_MAX_DIMENSION
+THUMB_OUTPUT_PATH = str(evidence.PHOTO_DIR / "miniaturas")
+IMAGE_CACHE_PATH = str(evidence.PHOTO_DIR / "comprimidas")
+
+# Pipeline asíncrono de capturas
+ASYNC_CAPTURE = evidence.ASYNC_CAPTURE
+CAPTURE_WORKERS = evidence.CAPTURE_WORKERS
+CAPTURE_QUEUE_SIZE = evidence.CAPTURE_QUEUE_SIZE
+IMAGE_CACHE_WORKERS = evidence.IMAGE_CACHE_WORKERS
 
 # Configuración de reportes
+HTML_REPORT_MODE = evidence.HTML_REPORT_MODE
 GENERATE_HTML = evidence.GENERATE_HTML
 GENERATE_PDF = evidence.GENERATE_PDF
 ATTACH_TO_ALLURE = evidence.ATTACH_TO_ALLURE
\ No newline at end of file
@@ -0,0 +1,138 @@
+# evidence_manager/image_cache.py
+import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .constants import IMAGE_CACHE_PATH, IMAGE_CACHE_WORKERS, IMAGE_MAX_DIMENSION, IMAGE_QUALITY
+from .utils import _compress_image_to_file
+
+
+class CompressedImageCache:
+    """
+    Caché en disco de capturas comprimidas (JPEG reducido), indexada por el
+    hash del contenido. La compresión se lanza en un pool de procesos en cuanto
+    la captura llega a disco, mientras la prueba sigue corriendo; los reportes
+    HTML y PDF solo leen el JPEG ya codificado.
+
+    El pool se crea una vez en el hilo principal (start() al iniciar la sesión
+    de pytest, antes de que existan los hilos del pipeline) y se cierra con
+    shutdown(). Sin pool, la compresión se hace en el hilo que la pida.
+    """
+
+    _executor = None
+    _lock = threading.Lock()
+    _pending = {}
+
+    @staticmethod
+    def hash_bytes(data):
+        return hashlib.sha1(data).hexdigest()
+
+    @classmethod
+    def hash_file(cls, path):
+        with open(path, "rb") as f:
+            return cls.hash_bytes(f.read())
+
+    @staticmethod
+    def cache_path(image_hash, max_dim=IMAGE_MAX_DIMENSION, quality=IMAGE_QUALITY):
+        return os.path.join(IMAGE_CACHE_PATH, f"{image_hash}_{max_dim}_q{quality}.jpg")
+
+    @classmethod
+    def start(cls):
+        """Crea el pool de compresión (llamar desde el hilo principal)."""
+        with cls._lock:
+            if cls._executor is not None:
+                return
+            if threading.current_thread() is not threading.main_thread():
+                print("⚠️ El pool de compresión solo se crea desde el hilo principal")
+                return
+            try:
+                cls._executor = ProcessPoolExecutor(max_workers=IMAGE_CACHE_WORKERS)
+            except Exception as e:
+                # Sin soporte de multiproceso: se comprime en el hilo que lo pida
+                print(f"⚠️ No se pudo iniciar el pool de compresión: {e}")
+
+    @classmethod
+    def shutdown(cls):
+        """Espera las compresiones en curso y cierra el pool."""
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+            cls._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @classmethod
+    def _discard(cls, target, future):
+        # Callback al terminar: la entrada sale de _pending aunque nadie la pida
+        with cls._lock:
+            if cls._pending.get(target) is future:
+                del cls._pending[target]
+
+    @classmethod
+    def prefetch(cls, img_path, image_hash=None, max_dim=IMAGE_MAX_DIMENSION, quality=IMAGE_QUALITY):
+        """
+        Encola la compresión de una captura si aún no está en caché.
+
+        Returns:
+            str: Ruta destino en la caché
+        """
+        image_hash = image_hash or cls.hash_file(img_path)
+        target = cls.cache_path(image_hash, max_dim, quality)
+        future = None
+        with cls._lock:
+            if target in cls._pending or os.path.exists(target):
+                return target
+            if cls._executor is not None:
+                os.makedirs(IMAGE_CACHE_PATH, exist_ok=True)
+                future = cls._executor.submit(
+                    _compress_image_to_file, img_path, target, max_dim, quality
+                )
+                cls._pending[target] = future
+        if future is not None:
+            # Fuera del lock: si ya terminó, el callback se ejecuta en este hilo
+            future.add_done_callback(lambda f: cls._discard(target, f))
+            return target
+        _compress_image_to_file(img_path, target, max_dim, quality)
+        return target
+
+    @classmethod
+    def get(cls, img_path, image_hash=None, max_dim=IMAGE_MAX_DIMENSION, quality=IMAGE_QUALITY):
+        """
+        Ruta del JPEG comprimido de la captura; espera la compresión si está en
+        curso y la realiza si nunca se encoló.
+
+        Returns:
+            str: Ruta del JPEG o None si no se pudo comprimir
+        """
+        if not img_path or not os.path.exists(img_path):
+            return None
+        target = cls.prefetch(img_path, image_hash, max_dim, quality)
+        with cls._lock:
+            future = cls._pending.get(target)
+        if future is not None:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"⚠️ Error al comprimir imagen {img_path}: {e}")
+        return target if os.path.exists(target) else None
+
+    @classmethod
+    def ensure(cls, photos_data, max_dim=IMAGE_MAX_DIMENSION, quality=IMAGE_QUALITY):
+        """
+        Asegura en paralelo que las capturas del reporte estén en caché (solo
+        espera las de este reporte, no las de otras pruebas).
+
+        Returns:
+            dict: ruta original -> ruta del JPEG comprimido (o None)
+        """
+        items = [
+            (data.get("path"), data.get("image_hash"))
+            for data in photos_data
+            if data.get("path") and os.path.exists(data.get("path"))
+        ]
+        targets = [cls.prefetch(path, image_hash, max_dim, quality) for path, image_hash in items]
+        with cls._lock:
+            futures = [cls._pending[target] for target in targets if target in cls._pending]
+        if futures:
+            wait(futures)
+        return {path: cls.get(path, image_hash, max_dim, quality) for path, image_hash in items}
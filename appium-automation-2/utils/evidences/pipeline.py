@@ -0,0 +1,128 @@
+# evidence_manager/pipeline.py
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import allure
+from PIL import Image
+
+from .constants import (
+    ATTACH_TO_ALLURE,
+    ASYNC_CAPTURE,
+    CAPTURE_QUEUE_SIZE,
+    CAPTURE_WORKERS,
+    THUMB_MAX_DIMENSION,
+)
+from .image_cache import CompressedImageCache
+
+
+class EvidencePipeline:
+    """
+    Procesa las capturas en segundo plano: la prueba solo obtiene los bytes PNG
+    (una petición al driver) y continúa; la escritura a disco y la miniatura se
+    hacen en un pool acotado de hilos. El adjunto de Allure se hace en el hilo
+    de la prueba: allure-pytest guarda el paso/prueba en curso en estado
+    compartido y desde otro hilo el adjunto caería en el paso equivocado.
+    flush(driver) es la barrera que garantiza que los reportes vean todo.
+    """
+
+    _executor = None
+    _slots = None
+    _lock = threading.Lock()
+    _pending = {}
+
+    @classmethod
+    def _get_executor(cls):
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=CAPTURE_WORKERS, thread_name_prefix="evidence"
+                )
+                # Cola acotada: si hay demasiadas capturas pendientes la prueba espera
+                cls._slots = threading.BoundedSemaphore(CAPTURE_QUEUE_SIZE)
+            return cls._executor
+
+    @classmethod
+    def submit(cls, driver, png_bytes, photo_filepath, thumb_filepath=None, allure_name=None, image_hash=None):
+        """
+        Encola el procesamiento de una captura ya obtenida en memoria.
+        Si EVIDENCE_ASYNC_CAPTURE=False se procesa en el mismo hilo.
+        """
+        if ATTACH_TO_ALLURE:
+            cls.attach_to_allure(png_bytes, allure_name or os.path.basename(photo_filepath))
+
+        if not ASYNC_CAPTURE:
+            cls.persist(png_bytes, photo_filepath, thumb_filepath, image_hash)
+            return
+
+        executor = cls._get_executor()
+        cls._slots.acquire()
+        try:
+            future = executor.submit(
+                cls.persist, png_bytes, photo_filepath, thumb_filepath, image_hash
+            )
+        except Exception:
+            cls._slots.release()
+            raise
+        future.add_done_callback(lambda _: cls._slots.release())
+        with cls._lock:
+            cls._pending.setdefault(id(driver), []).append(future)
+
+    @staticmethod
+    def attach_to_allure(png_bytes, name):
+        """Adjunta la captura en memoria al paso de Allure en curso (hilo de la prueba)."""
+        try:
+            allure.attach(png_bytes, name=name, attachment_type=allure.attachment_type.PNG)
+        except Exception as e:
+            print(f"⚠️ No se pudo adjuntar la captura a Allure: {e}")
+
+    @staticmethod
+    def persist(png_bytes, photo_filepath, thumb_filepath=None, image_hash=None):
+        """
+        Escribe la captura, genera su miniatura y encola su versión comprimida
+        para los reportes. Se ejecuta en el pool de hilos: no toca Allure.
+        """
+        os.makedirs(os.path.dirname(photo_filepath), exist_ok=True)
+        with open(photo_filepath, "wb") as f:
+            f.write(png_bytes)
+        print(f"📸 Evidencia FÍSICA guardada en: {photo_filepath}")
+
+        if thumb_filepath:
+            try:
+                os.makedirs(os.path.dirname(thumb_filepath), exist_ok=True)
+                with Image.open(io.BytesIO(png_bytes)) as im:
+                    im = im.convert("RGB")
+                    im.thumbnail((THUMB_MAX_DIMENSION, THUMB_MAX_DIMENSION), Image.LANCZOS)
+                    im.save(thumb_filepath, format="JPEG", quality=80, optimize=True)
+            except Exception as e:
+                print(f"⚠️ No se pudo generar la miniatura {thumb_filepath}: {e}")
+
+        try:
+            CompressedImageCache.prefetch(photo_filepath, image_hash)
+        except Exception as e:
+            print(f"⚠️ No se pudo encolar la compresión de {photo_filepath}: {e}")
+
+    @classmethod
+    def flush(cls, driver, timeout=None):
+        """
+        Espera a que terminen todas las capturas pendientes del driver.
+
+        Returns:
+            int: Número de capturas que fallaron al procesarse
+        """
+        with cls._lock:
+            futures = cls._pending.pop(id(driver), [])
+        if not futures:
+            return 0
+
+        done, not_done = wait(futures, timeout=timeout)
+        failures = len(not_done)
+        for future in done:
+            error = future.exception()
+            if error is not None:
+                failures += 1
+                print(f"⚠️ Error procesando evidencia en segundo plano: {error}")
+        if not_done:
+            print(f"⚠️ {len(not_done)} evidencias no terminaron en {timeout}s")
+        return failures
@@ -1,4 +1,5 @@
 # evidence_manager/report.py
+import html
 import os
 import time
 import allure
@@ -10,12 +11,17 @@ from reportlab.lib.units import mm
 from reportlab.lib import colors
 
 from .utils import EvidenceStateHelper
-from .utils import _compress_image_to_bytes, _file_to_base64, _format_duration_hms
+from .pipeline import EvidencePipeline
+from .image_cache import CompressedImageCache
+from .utils import _compress_image_to_bytes, _format_duration_hms, _link_or_copy, _write_file_as_base64
 from .constants import HTML_OUTPUT_PATH, PDF_OUTPUT_PATH, PHOTO_OUTPUT_PATH, VIDEO_OUTPUT_PATH
+from .constants import HTML_REPORT_MODE, THUMB_MAX_DIMENSION
 
 class Reporter:
     @staticmethod
     def generate_html_report(driver, status="PASSED", company_logo_base64=None):
+        # Las capturas se escriben en segundo plano; el reporte debe verlas todas
+        EvidencePipeline.flush(driver)
         state = EvidenceStateHelper.get_state(driver)
         test_name_full = state.get('test_name', 'UNKNOWN_TEST::UNKNOWN_CLASS::unknown_method')
         module_name = state.get('test_module_name', 'UNKNOWN_FILE').upper()
@@ -31,45 +37,79 @@ class Reporter:
         video_path = state.get('video_path')
         photos_data = state.get('photo_paths', [])
 
-        # Build step HTML (kept simple, identical structure)
-        step_details_html = ""
-        for data in photos_data:
-            image_base64_data = _file_to_base64(data['path'], "image/png")
-            filename = os.path.basename(data['path'])
-            step_details_html += f"""
-            <section class="card step-card">
-                <header class="step-header">
-                    <h3>PASO {data['step_number']}</h3>
-                    <span class="badge">Evidencia: {filename}</span>
-                </header>
-                <div class="step-body">
-                    <div class="meta">
-                        <div><strong>Descripción:</strong> <span class="meta-text">{data['description']}</span></div>
-                        <div><strong>Resultado Esperado:</strong> <span class="meta-text">{data['expected']}</span></div>
-                        <div><strong>Acción (Log):</strong> <span class="meta-text">{data.get('log','')}</span></div>
-                    </div>
-                    <div class="thumb">
-                        <img src="{image_base64_data}" alt="{filename}" />
-                    </div>
-                </div>
+        os.makedirs(HTML_OUTPUT_PATH, exist_ok=True)
+        report_filename = f"reporte_{test_method_name}_{datetime.now().strftime('%H%M%S')}.html"
+        report_filepath = os.path.join(HTML_OUTPUT_PATH, report_filename)
+
+        # Modo "linked": HTML + carpeta hermana de assets; "embedded": todo en base64
+        linked = HTML_REPORT_MODE == "linked"
+        assets_dirname = os.path.splitext(report_filename)[0] + "_assets"
+        assets_dir = os.path.join(HTML_OUTPUT_PATH, assets_dirname)
+        if linked:
+            os.makedirs(assets_dir, exist_ok=True)
+
+        waits_html = ""
+        step_waits = state.get("step_waits", [])
+        if step_waits:
+            rows_html = ""
+            for wait in step_waits:
+                rows_html += f"""
+                        <tr class="wait-{wait['status']}">
+                            <td>{wait['step']}</td>
+                            <td>{wait['status']}</td>
+                            <td>{wait['seconds']:.2f}s</td>
+                            <td>{wait['polls']}</td>
+                        </tr>"""
+            total_wait = sum(wait['seconds'] for wait in step_waits)
+            waits_html = f"""
+            <section class="card waits-card">
+                <h3>⏱️ Tiempos de espera por paso (total {total_wait:.2f}s)</h3>
+                <table class="waits-table">
+                    <thead><tr><th>Paso</th><th>Resultado</th><th>Espera</th><th>Sondeos</th></tr></thead>
+                    <tbody>{rows_html}
+                    </tbody>
+                </table>
             </section>
             """
 
-        video_embed_html = ""
-        if video_path:
-            video_base64_data = _file_to_base64(video_path, "video/mp4")
-            if video_base64_data:
-                video_embed_html = f"""
-                <section class="card video-card">
-                    <h3>🎬 Grabación de la Ejecución</h3>
-                    <div class="video-wrap">
-                        <video controls preload="none">
-                            <source src="{video_base64_data}" type="video/mp4">
-                            Tu navegador no soporta el tag de video.
-                        </video>
-                    </div>
-                </section>
-                """
+        profile_html = ""
+        profile = state.get("command_profile")
+        if profile and profile.get("total_commands"):
+            slow_rows = ""
+            for record in profile.get("slowest_commands", []):
+                locator = f"{record['using']}: {record['value']}" if record.get("using") else ""
+                slow_rows += f"""
+                        <tr>
+                            <td>{record['command']}</td>
+                            <td><code>{html.escape(locator)}</code></td>
+                            <td>{record['call_site']}</td>
+                            <td>{record['ms']:.1f} ms</td>
+                        </tr>"""
+            site_rows = ""
+            for entry in profile.get("by_call_site", []):
+                site_rows += f"""
+                        <tr>
+                            <td>{entry['name']}</td>
+                            <td>{entry['count']}</td>
+                            <td>{entry['total_ms']:.1f} ms</td>
+                            <td>{entry['max_ms']:.1f} ms</td>
+                        </tr>"""
+            profile_html = f"""
+            <section class="card waits-card">
+                <h3>🐢 Comandos más lentos ({profile['total_commands']} comandos, {profile['total_ms'] / 1000:.2f}s en Appium)</h3>
+                <table class="waits-table">
+                    <thead><tr><th>Comando</th><th>Localizador</th><th>Origen</th><th>Duración</th></tr></thead>
+                    <tbody>{slow_rows}
+                    </tbody>
+                </table>
+                <h3 style="margin-top:12px;">Tiempo por método de origen</h3>
+                <table class="waits-table">
+                    <thead><tr><th>Método</th><th>Comandos</th><th>Total</th><th>Máximo</th></tr></thead>
+                    <tbody>{site_rows}
+                    </tbody>
+                </table>
+            </section>
+            """
 
         status_class = "pass" if status == "PASSED" else "fail"
         status_icon = "✅" if status == "PASSED" else "❌"
@@ -121,7 +161,11 @@ class Reporter:
         .step-body .meta .meta-text{display:inline-block;margin-left:6px;color:#0b2545;font-weight:500;}
         .thumb{width:260px;flex:0 0 260px;display:flex;align-items:center;justify-content:center;background:#fbfdff;border-radius:6px;padding:6px;}
         .thumb img{max-width:100%;max-height:200px;border-radius:4px;object-fit:contain;display:block;}
+        .thumb a{display:block;}
         .video-wrap video{width:100%;height:auto;border-radius:6px;background:#000;}
+        .waits-table{width:100%;border-collapse:collapse;font-size:13px;}
+        .waits-table th,.waits-table td{text-align:left;padding:4px 6px;border-bottom:1px solid var(--surface);}
+        .waits-table tr.wait-timeout td,.waits-table tr.wait-error td{color:var(--red);}
         /* responsive */
         @media (max-width:820px){
             .step-body{flex-direction:column;}
@@ -131,7 +175,7 @@ class Reporter:
         footer.report-footer{margin-top:18px;font-size:12px;color:var(--muted);display:flex;justify-content:space-between;align-items:center;}
         """
 
-        report_html = f"""<!doctype html>
+        header_html = f"""<!doctype html>
         <html lang="es">
         <head>
             <meta charset="utf-8" />
@@ -165,8 +209,9 @@ class Reporter:
 
                 <div class="cards">
                     {error_html}
-                    {video_embed_html}
-                    {step_details_html}
+        """
+
+        footer_html = f"""
                 </div>
 
                 <footer class="report-footer">
@@ -178,13 +223,18 @@ class Reporter:
         </html>
         """
 
-        os.makedirs(HTML_OUTPUT_PATH, exist_ok=True)
-        report_filename = f"reporte_{test_method_name}_{datetime.now().strftime('%H%M%S')}.html"
-        report_filepath = os.path.join(HTML_OUTPUT_PATH, report_filename)
-
+        # Se escribe por secciones directamente al archivo: nunca se arma el
+        # documento completo (ni las imágenes en base64) en memoria
         try:
             with open(report_filepath, "w", encoding="utf-8") as f:
-                f.write(report_html)
+                f.write(header_html)
+                if video_path:
+                    Reporter._write_video_card(f, video_path, linked, assets_dir, assets_dirname)
+                f.write(waits_html)
+                f.write(profile_html)
+                for data in photos_data:
+                    Reporter._write_step_card(f, data, linked, assets_dir, assets_dirname)
+                f.write(footer_html)
             print(f"✅ Reporte HTML profesional generado en: {report_filepath}")
         except Exception as e:
             print(f"⚠️ Error al guardar el reporte HTML: {e}")
@@ -196,6 +246,102 @@ class Reporter:
         except Exception as e:
             print(f"⚠️ Error al generar PDF/Excel automáticamente: {e}")
 
+    @staticmethod
+    def _write_step_card(f, data, linked, assets_dir, assets_dirname):
+        """
+        Escribe la tarjeta de un paso. En modo linked la miniatura se enlaza
+        con carga diferida y abre la captura completa; en modo embedded se
+        incrusta en base64 por bloques la versión comprimida (caché compartida
+        con el PDF).
+        """
+        filename = os.path.basename(data['path'])
+        f.write(f"""
+            <section class="card step-card">
+                <header class="step-header">
+                    <h3>PASO {data['step_number']}</h3>
+                    <span class="badge">Evidencia: {filename}</span>
+                </header>
+                <div class="step-body">
+                    <div class="meta">
+                        <div><strong>Descripción:</strong> <span class="meta-text">{data['description']}</span></div>
+                        <div><strong>Resultado Esperado:</strong> <span class="meta-text">{data['expected']}</span></div>
+                        <div><strong>Acción (Log):</strong> <span class="meta-text">{data.get('log','')}</span></div>
+                    </div>
+                    <div class="thumb">
+                        """)
+        if linked and os.path.exists(data['path']):
+            full_name, thumb_name = Reporter._link_step_assets(data, assets_dir)
+            f.write(
+                f'<a href="{assets_dirname}/{full_name}" target="_blank">'
+                f'<img src="{assets_dirname}/{thumb_name}" alt="{filename}" loading="lazy" decoding="async" /></a>'
+            )
+        elif os.path.exists(data['path']):
+            jpeg_path = CompressedImageCache.get(data['path'], data.get('image_hash'))
+            f.write('<img src="')
+            if jpeg_path:
+                _write_file_as_base64(f, jpeg_path, "image/jpeg")
+            else:
+                _write_file_as_base64(f, data['path'], "image/png")
+            f.write(f'" alt="{filename}" />')
+        f.write("""
+                    </div>
+                </div>
+            </section>
+            """)
+
+    @staticmethod
+    def _link_step_assets(data, assets_dir):
+        """
+        Coloca la captura completa y su miniatura en la carpeta de assets.
+        La miniatura del pipeline de capturas se reutiliza; solo si no existe
+        se reduce aquí (una vez por reporte).
+
+        Returns:
+            tuple: (nombre de la captura, nombre de la miniatura) relativos a assets
+        """
+        base = f"paso_{int(data['step_number']):02d}"
+        full_name = base + os.path.splitext(data['path'])[1]
+        thumb_name = base + "_miniatura.jpg"
+        _link_or_copy(data['path'], os.path.join(assets_dir, full_name))
+
+        thumb_src = data.get('thumb_path')
+        thumb_dst = os.path.join(assets_dir, thumb_name)
+        if thumb_src and os.path.exists(thumb_src):
+            _link_or_copy(thumb_src, thumb_dst)
+        else:
+            bio = _compress_image_to_bytes(data['path'], max_dim=THUMB_MAX_DIMENSION, quality=80)
+            if bio is None:
+                return full_name, full_name
+            with open(thumb_dst, "wb") as out:
+                out.write(bio.getvalue())
+        return full_name, thumb_name
+
+    @staticmethod
+    def _write_video_card(f, video_path, linked, assets_dir, assets_dirname):
+        """Escribe la tarjeta de video: referenciado en modo linked, base64 en embedded."""
+        if not os.path.exists(video_path):
+            return
+        f.write("""
+                <section class="card video-card">
+                    <h3>🎬 Grabación de la Ejecución</h3>
+                    <div class="video-wrap">
+                        <video controls preload="none">
+                            """)
+        f.write('<source src="')
+        if linked:
+            video_name = "video" + os.path.splitext(video_path)[1]
+            _link_or_copy(video_path, os.path.join(assets_dir, video_name))
+            f.write(f"{assets_dirname}/{video_name}")
+        else:
+            _write_file_as_base64(f, video_path, "video/mp4")
+        f.write('" type="video/mp4">')
+        f.write("""
+                            Tu navegador no soporta el tag de video.
+                        </video>
+                    </div>
+                </section>
+                """)
+
     @staticmethod
     def generate_pdf_report(driver, status="PASSED", company_name=None):
         """
@@ -216,6 +362,8 @@ class Reporter:
             duration_formatted = _format_duration_hms(duration_seconds)
             execution_date = datetime.fromtimestamp(start_time).strftime("%d/%m/%Y %H:%M:%S")
             photos_data = state.get("photo_paths", []) or []
+            # Capturas comprimidas en paralelo durante la prueba; aquí solo se colocan
+            compressed = CompressedImageCache.ensure(photos_data)
 
             os.makedirs(PDF_OUTPUT_PATH, exist_ok=True)
             timestamp = datetime.now().strftime("%H%M%S")
@@ -299,6 +447,30 @@ class Reporter:
                 c.line(table_x + 2, row_y + 13, table_x + table_w - 2, row_y + 13)
                 c.setStrokeColorRGB(0, 0, 0)
 
+            def _draw_image_area(cobj, item, img_top, min_h, empty_msg):
+                """
+                Coloca la captura ya comprimida (caché) centrada entre img_top y el pie.
+                """
+                img_bottom_margin = margin + 18
+                avail_h = img_top - img_bottom_margin
+                jpeg_path = compressed.get(item.get("path"))
+                if not jpeg_path or avail_h <= min_h:
+                    cobj.setFont("Helvetica-Oblique", 8)
+                    cobj.drawCentredString(page_w / 2, margin + 28, empty_msg)
+                    return
+                try:
+                    img_reader = ImageReader(jpeg_path)
+                    iw, ih = img_reader.getSize()
+                    max_w = page_w - 2 * margin
+                    scale = min(max_w / iw, avail_h / ih, 1.0)
+                    dw, dh = iw * scale, ih * scale
+                    img_x = (page_w - dw) / 2
+                    img_y = img_bottom_margin + (avail_h - dh) / 2
+                    cobj.drawImage(img_reader, img_x, img_y, width=dw, height=dh, preserveAspectRatio=True)
+                except Exception as e:
+                    cobj.setFont("Helvetica-Oblique", 9)
+                    cobj.drawString(margin, img_bottom_margin + 6, f"Error incrustando imagen: {e}")
+
             # espacio disponible bajo la tabla en la portada
             content_start_y = row_y - 12
 
@@ -404,28 +576,7 @@ class Reporter:
                 img_top = _draw_text_block_on_page(c, first, content_start_y - 18, page_h)
 
                 # imagen en la portada: escalar para el espacio disponible (img_top - margin - footer)
-                img_bottom_margin = margin + 18
-                avail_h = img_top - img_bottom_margin
-                img_path = first.get("path")
-                if img_path and os.path.exists(img_path) and avail_h > (20 * mm):
-                    img_bio = _compress_image_to_bytes(img_path, max_dim=1400, quality=75)
-                    if img_bio:
-                        try:
-                            img_reader = ImageReader(img_bio)
-                            iw, ih = img_reader.getSize()
-                            max_w = page_w - 2 * margin
-                            max_h = avail_h
-                            scale = min(max_w / iw, max_h / ih, 1.0)
-                            dw, dh = iw * scale, ih * scale
-                            img_x = (page_w - dw) / 2
-                            img_y = img_bottom_margin + (avail_h - dh) / 2
-                            c.drawImage(img_reader, img_x, img_y, width=dw, height=dh, preserveAspectRatio=True)
-                        except Exception as e:
-                            c.setFont("Helvetica-Oblique", 9)
-                            c.drawString(margin, img_bottom_margin + 6, f"Error incrustando imagen: {e}")
-                else:
-                    c.setFont("Helvetica-Oblique", 8)
-                    c.drawCentredString(page_w / 2, margin + 28, "No hay imagen o espacio insuficiente para mostrarla en la portada.")
+                _draw_image_area(c, first, img_top, 20 * mm, "No hay imagen o espacio insuficiente para mostrarla en la portada.")
 
                 # pie y siguiente página
                 c.setFont("Helvetica-Oblique", 8)
@@ -467,28 +618,7 @@ class Reporter:
                         img_top_local = _draw_text_block_on_page(cobj, it, top_y_local, page_h)
 
                         # imagen
-                        img_path_local = it.get("path")
-                        img_bottom_margin_local = margin + 18
-                        avail_h_local = img_top_local - img_bottom_margin_local
-                        if img_path_local and os.path.exists(img_path_local) and avail_h_local > (18 * mm):
-                            img_bio_local = _compress_image_to_bytes(img_path_local, max_dim=1400, quality=75)
-                            if img_bio_local:
-                                try:
-                                    img_reader_local = ImageReader(img_bio_local)
-                                    iw_l, ih_l = img_reader_local.getSize()
-                                    max_w_l = page_w - 2 * margin
-                                    max_h_l = avail_h_local
-                                    scale_l = min(max_w_l / iw_l, max_h_l / ih_l, 1.0)
-                                    dw_l, dh_l = iw_l * scale_l, ih_l * scale_l
-                                    img_x_l = (page_w - dw_l) / 2
-                                    img_y_l = img_bottom_margin_local + (avail_h_local - dh_l) / 2
-                                    cobj.drawImage(img_reader_local, img_x_l, img_y_l, width=dw_l, height=dh_l, preserveAspectRatio=True)
-                                except Exception as e:
-                                    cobj.setFont("Helvetica-Oblique", 9)
-                                    cobj.drawString(margin, img_bottom_margin_local + 6, f"Error incrustando imagen: {e}")
-                        else:
-                            cobj.setFont("Helvetica-Oblique", 8)
-                            cobj.drawCentredString(page_w / 2, margin + 28, "No hay imagen o espacio insuficiente para mostrarla.")
+                        _draw_image_area(cobj, it, img_top_local, 18 * mm, "No hay imagen o espacio insuficiente para mostrarla.")
 
                         # pie
                         cobj.setFont("Helvetica-Oblique", 8)
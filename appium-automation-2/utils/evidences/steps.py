@@ -0,0 +1,181 @@
+# evidence_manager/steps.py
+import contextlib
+import functools
+import inspect
+import re
+import sys
+from contextvars import ContextVar
+
+STEP_NAME_PATTERN = re.compile(r"^step_\d+")
+
+_NOT_FOUND = "N/A: Docstring no encontrado o formato incorrecto."
+
+
+class StepInfo:
+    """Metadatos de un paso extraídos una sola vez de su docstring."""
+
+    __slots__ = ("name", "description", "expected")
+
+    def __init__(self, name, description=_NOT_FOUND, expected=_NOT_FOUND):
+        self.name = name
+        self.description = description
+        self.expected = expected
+
+    @classmethod
+    def from_function(cls, func):
+        info = cls(func.__name__)
+        docstring = inspect.getdoc(func)
+        if not docstring:
+            return info
+        for line in docstring.split('\n'):
+            line = line.strip()
+            low = line.lower()
+            if low.startswith("descripcion:"):
+                info.description = line.split(":", 1)[1].strip()
+            elif low.startswith("resultado esperado:"):
+                info.expected = line.split(":", 1)[1].strip()
+        return info
+
+    def __repr__(self):
+        return f"<StepInfo {self.name}: {self.description!r}>"
+
+
+_current_step: ContextVar = ContextVar("current_step", default=None)
+_active_checkpoint: ContextVar = ContextVar("active_checkpoint", default=None)
+_active_watchdog: ContextVar = ContextVar("active_watchdog", default=None)
+
+
+class StepRegistry:
+    """
+    Registro de pasos (step_XX_*) poblado al recolectar las pruebas o al
+    decorar el método con @step. take_evidence consulta el paso activo en O(1)
+    mediante una variable de contexto en lugar de recorrer inspect.stack().
+    """
+
+    _by_code = {}
+
+    @classmethod
+    def register(cls, func):
+        """Parsea el docstring de la función (una vez) y la registra."""
+        code = getattr(func, "__code__", None)
+        info = cls._by_code.get(code)
+        if info is None:
+            info = StepInfo.from_function(func)
+            if code is not None:
+                cls._by_code[code] = info
+        return info
+
+    @classmethod
+    def wrap(cls, func):
+        """Envuelve un paso para que quede activo mientras se ejecuta."""
+        if getattr(func, "__step_info__", None) is not None:
+            return func
+        info = cls.register(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            checkpoint = _active_checkpoint.get()
+            if checkpoint is not None and checkpoint.should_skip(info):
+                return None
+            watchdog = _active_watchdog.get()
+            guard = watchdog.guard(info.name) if watchdog is not None else contextlib.nullcontext()
+            token = _current_step.set(info)
+            try:
+                with guard:
+                    result = func(*args, **kwargs)
+            finally:
+                _current_step.reset(token)
+            if checkpoint is not None:
+                checkpoint.step_passed(info)
+            return result
+
+        wrapper.__step_info__ = info
+        return wrapper
+
+    @classmethod
+    def register_class(cls, test_cls):
+        """Envuelve todos los métodos step_XX_* definidos en la clase."""
+        for name, member in list(vars(test_cls).items()):
+            if STEP_NAME_PATTERN.match(name) and inspect.isfunction(member):
+                setattr(test_cls, name, cls.wrap(member))
+        return test_cls
+
+    @staticmethod
+    def use_checkpoint(checkpoint):
+        """
+        Activa un checkpoint (utils.checkpoints) para los pasos que se ejecuten
+        en el contexto actual: omite los ya verificados y registra los nuevos.
+
+        Returns:
+            Token: Para release_checkpoint
+        """
+        return _active_checkpoint.set(checkpoint)
+
+    @staticmethod
+    def release_checkpoint(token):
+        _active_checkpoint.reset(token)
+
+    @staticmethod
+    def use_watchdog(watchdog):
+        """
+        Activa un watchdog (utils.watchdog) que limita la duración de cada paso.
+
+        Returns:
+            Token: Para release_watchdog
+        """
+        return _active_watchdog.set(watchdog)
+
+    @staticmethod
+    def release_watchdog(token):
+        _active_watchdog.reset(token)
+
+    @staticmethod
+    def current():
+        """Paso activo en el contexto actual (o None)."""
+        return _current_step.get()
+
+    @classmethod
+    def resolve(cls, max_depth=12):
+        """
+        Paso activo; si el paso no fue registrado, busca en los frames
+        superiores una función registrable por su objeto de código (sin
+        cargar líneas de fuente como inspect.stack()).
+
+        Returns:
+            StepInfo: Metadatos del paso o None
+        """
+        info = _current_step.get()
+        if info is not None:
+            return info
+
+        frame = sys._getframe(1)
+        depth = 0
+        while frame is not None and depth < max_depth:
+            code = frame.f_code
+            info = cls._by_code.get(code)
+            if info is not None:
+                return info
+            if STEP_NAME_PATTERN.match(code.co_name):
+                owner = frame.f_locals.get("self")
+                func = getattr(type(owner), code.co_name, None) if owner is not None else None
+                func = getattr(func, "__wrapped__", func)
+                if getattr(func, "__code__", None) is code:
+                    return cls.register(func)
+            frame = frame.f_back
+            depth += 1
+        return None
+
+
+def step(func):
+    """
+    Decorador opcional para registrar un paso al definir la clase.
+
+    Uso:
+        @step
+        def step_01_open_and_validate(self, driver):
+            \"\"\"
+            Descripcion: ...
+            Resultado Esperado: ...
+            \"\"\"
+    """
+    return StepRegistry.wrap(func)
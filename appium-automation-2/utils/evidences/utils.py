@@ -1,6 +1,7 @@
 # evidence_manager/utils.py
 import os
 import base64
+import shutil
 import io
 from datetime import datetime
 import time
@@ -45,6 +46,20 @@ def _compress_image_to_bytes(img_path, max_dim=2000, quality=70):
         print(f"⚠️ Error al comprimir imagen {img_path}: {e}")
         return None
 
+def _compress_image_to_file(img_path, dst_path, max_dim=2000, quality=70):
+    """
+    Variante de _compress_image_to_bytes que escribe el JPEG en disco.
+    Es una función de módulo para poder ejecutarse en un pool de procesos.
+    """
+    bio = _compress_image_to_bytes(img_path, max_dim=max_dim, quality=quality)
+    if bio is None:
+        return None
+    tmp_path = f"{dst_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(bio.getvalue())
+    os.replace(tmp_path, dst_path)
+    return dst_path
+
 def _file_to_base64(filepath, mime_type):
     try:
         if not os.path.exists(filepath):
@@ -56,6 +71,34 @@ def _file_to_base64(filepath, mime_type):
         print(f"⚠️ Error al convertir {filepath} a Base64: {e}")
         return ""
 
+def _write_file_as_base64(fh, filepath, mime_type, chunk_size=3 * 256 * 1024):
+    """
+    Escribe el archivo como data URI en fh por bloques (múltiplos de 3 bytes
+    para que cada bloque codifique sin relleno intermedio).
+    """
+    try:
+        with open(filepath, "rb") as f:
+            fh.write(f"data:{mime_type};base64,")
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                fh.write(base64.b64encode(chunk).decode('ascii'))
+        return True
+    except Exception as e:
+        print(f"⚠️ Error al convertir {filepath} a Base64: {e}")
+        return False
+
+def _link_or_copy(src, dst):
+    """Enlace duro si el sistema de archivos lo permite; si no, copia."""
+    try:
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
 class EvidenceStateHelper:
     @staticmethod
     def get_state(driver):
@@ -10,8 +10,10 @@ from .constants import (
     VIDEO_CODEC, 
     VIDEO_TIME_LIMIT, 
     VIDEO_TIMEOUT,
+    VIDEO_STREAM_UPLOAD,
     ATTACH_TO_ALLURE
 )
+from .video_sink import UPLOAD_FIELD, VideoSink
 
 
 class VideoRecorder:
@@ -64,41 +66,40 @@ class VideoRecorder:
 
         video_timestamp = state.get('video_start_timestamp', datetime.now().strftime("%H%M%S_%d_%m_%Y"))
         original_timeout = None
-        
+
         try:
+            video_filename = f"{test_name}_{video_timestamp}.mp4"
+            os.makedirs(VIDEO_OUTPUT_PATH, exist_ok=True)
+            video_filepath = os.path.join(VIDEO_OUTPUT_PATH, video_filename)
+
             # Usar timeout desde configuración
             original_timeout = driver.command_executor._timeout
             driver.command_executor._timeout = VIDEO_TIMEOUT
 
-            print(f"⏳ Deteniendo y descargando video (timeout {VIDEO_TIMEOUT}s)...")
-            video_base64 = driver.stop_recording_screen()
+            saved = None
+            if VIDEO_STREAM_UPLOAD:
+                saved = VideoRecorder._stop_with_upload(driver, video_filepath)
+            if saved is None:
+                saved = VideoRecorder._stop_with_base64(driver, video_filepath)
+
             driver.command_executor._timeout = original_timeout
             print("✅ Timeout del driver restaurado.")
 
-            if not video_base64:
-                print("❌ ERROR: El string Base64 del video está vacío.")
+            if not saved:
                 return
 
-            video_filename = f"{test_name}_{video_timestamp}.mp4"
-            os.makedirs(VIDEO_OUTPUT_PATH, exist_ok=True)
-            video_filepath = os.path.join(VIDEO_OUTPUT_PATH, video_filename)
-
-            with open(video_filepath, "wb") as f:
-                f.write(base64.b64decode(video_base64))
-
             print(f"✅ Video guardado en: {video_filepath}")
 
             state['video_path'] = video_filepath
-            
-            # Adjuntar a Allure si está habilitado
+
+            # Adjuntar a Allure si está habilitado (por referencia al archivo)
             if ATTACH_TO_ALLURE:
                 try:
-                    with open(video_filepath, "rb") as f:
-                        allure.attach(
-                            f.read(), 
-                            name=f"Video - {video_filename}", 
-                            attachment_type=allure.attachment_type.MP4
-                        )
+                    allure.attach.file(
+                        video_filepath,
+                        name=f"Video - {video_filename}",
+                        attachment_type=allure.attachment_type.MP4
+                    )
                     print("✅ Video adjuntado a Allure")
                 except Exception as e:
                     print(f"⚠️ No se pudo adjuntar video a Allure: {e}")
@@ -109,4 +110,52 @@ class VideoRecorder:
         except Exception as e:
             if original_timeout is not None:
                 driver.command_executor._timeout = original_timeout
-            print(f"⚠️ Error FATAL al detener/guardar el video: {e}")
\ No newline at end of file
+            print(f"⚠️ Error FATAL al detener/guardar el video: {e}")
+
+    @staticmethod
+    def _stop_with_upload(driver, video_filepath):
+        """
+        Detiene la grabación pidiendo a Appium que suba el archivo (remotePath)
+        al receptor local, que extrae la parte del archivo del multipart y la
+        escribe a disco por bloques.
+
+        Returns:
+            bool: True si el video quedó en disco, False si la subida falló,
+                  None si el receptor no está disponible (usar base64)
+        """
+        try:
+            sink = VideoSink.get()
+        except Exception as e:
+            print(f"⚠️ Receptor de video no disponible, se usará base64: {e}")
+            return None
+
+        upload_url, done = sink.expect(video_filepath)
+        try:
+            print(f"⏳ Deteniendo video y subiéndolo a {upload_url}...")
+            # Appium sube el archivo como multipart/form-data en el campo UPLOAD_FIELD
+            driver.stop_recording_screen(remotePath=upload_url, method="PUT", fileFieldName=UPLOAD_FIELD)
+        except Exception as e:
+            sink.discard(upload_url)
+            print(f"❌ ERROR: Appium no pudo subir el video: {e}")
+            return False
+
+        # Appium responde cuando terminó la subida; el evento confirma la escritura
+        if not done.wait(timeout=VIDEO_TIMEOUT) or not os.path.exists(video_filepath):
+            sink.discard(upload_url)
+            print("❌ ERROR: El video no llegó al receptor local.")
+            return False
+        return True
+
+    @staticmethod
+    def _stop_with_base64(driver, video_filepath):
+        """Método anterior: Appium devuelve el video completo en base64."""
+        print(f"⏳ Deteniendo y descargando video (timeout {VIDEO_TIMEOUT}s)...")
+        video_base64 = driver.stop_recording_screen()
+
+        if not video_base64:
+            print("❌ ERROR: El string Base64 del video está vacío.")
+            return False
+
+        with open(video_filepath, "wb") as f:
+            f.write(base64.b64decode(video_base64))
+        return True
@@ -0,0 +1,199 @@
+# evidence_manager/video_sink.py
+import os
+import re
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .constants import VIDEO_SINK_HOST, VIDEO_SINK_PORT
+
+_CHUNK_SIZE = 256 * 1024
+# Campo del formulario multipart en el que Appium envía el archivo (fileFieldName)
+UPLOAD_FIELD = "file"
+
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    """
+    Recibe la subida de Appium (PUT/POST) y la escribe a disco por bloques.
+    Con remotePath http(s) Appium envía multipart/form-data: solo se guarda el
+    contenido del campo UPLOAD_FIELD. Un cuerpo sin multipart se guarda tal cual.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self):
+        upload = self.server.sink.take(self.path.lstrip("/"))
+        if upload is None:
+            self._reply(404)
+            return
+
+        filepath, done = upload
+        tmp_path = filepath + ".part"
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            content_type = self.headers.get("Content-Type", "")
+            boundary = re.search(r'boundary="?([^";]+)"?', content_type)
+            with open(tmp_path, "wb") as f:
+                if content_type.lower().startswith("multipart/") and boundary:
+                    _copy_multipart_field(self._read_body(), f, boundary.group(1).encode(), UPLOAD_FIELD)
+                else:
+                    for chunk in self._read_body():
+                        f.write(chunk)
+            os.replace(tmp_path, filepath)
+            done.set()
+            self._reply(201)
+        except Exception as e:
+            print(f"⚠️ Error recibiendo el video en {filepath}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._reply(500)
+        finally:
+            done.set()
+
+    do_POST = do_PUT
+
+    def _read_body(self):
+        """Bloques del cuerpo de la petición (Content-Length o chunked)."""
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            yield from self._read_chunked()
+        else:
+            yield from self._read_length(int(self.headers.get("Content-Length", 0)))
+
+    def _read_length(self, remaining):
+        while remaining > 0:
+            chunk = self.rfile.read(min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise IOError("La conexión se cerró antes de recibir el video completo")
+            yield chunk
+            remaining -= len(chunk)
+
+    def _read_chunked(self):
+        while True:
+            size = int(self.rfile.readline().split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # trailers opcionales hasta la línea vacía
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            yield from self._read_length(size)
+            self.rfile.readline()
+
+    def _reply(self, code):
+        self.send_response(code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _copy_multipart_field(chunks, f, boundary, field):
+    """
+    Escribe en `f` el contenido de la parte `field` de un cuerpo multipart/form-data,
+    por bloques y sin cargar el cuerpo completo en memoria.
+
+    Args:
+        chunks (iterable): Bloques (bytes) del cuerpo de la petición
+        f (file): Archivo binario de destino
+        boundary (bytes): Delimitador del Content-Type
+        field (str): Nombre del campo con el archivo
+    """
+    chunks = iter(chunks)
+    delimiter = b"\r\n--" + boundary
+    # El primer delimitador puede no ir precedido de CRLF
+    buffer = b"\r\n"
+    found = False
+
+    def fill(buffer):
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise IOError("Cuerpo multipart incompleto")
+        return buffer + chunk
+
+    # Preámbulo hasta el primer delimitador
+    while delimiter not in buffer:
+        buffer = fill(buffer[-len(delimiter):])
+    buffer = buffer[buffer.index(delimiter) + len(delimiter):]
+
+    while True:
+        while len(buffer) < 2:
+            buffer = fill(buffer)
+        if buffer.startswith(b"--"):
+            break  # delimitador de cierre
+        while b"\r\n\r\n" not in buffer:
+            buffer = fill(buffer)
+        headers, buffer = buffer.split(b"\r\n\r\n", 1)
+        name = re.search(rb'(?i)content-disposition:[^\r\n]*;\s*name="([^"]*)"', headers)
+        is_file = not found and name is not None and name.group(1).decode("utf-8", "replace") == field
+
+        # Contenido de la parte hasta el siguiente delimitador
+        while delimiter not in buffer:
+            keep = len(delimiter) - 1
+            if is_file and len(buffer) > keep:
+                f.write(buffer[:-keep])
+            buffer = fill(buffer[-keep:] if len(buffer) > keep else buffer)
+        end = buffer.index(delimiter)
+        if is_file:
+            f.write(buffer[:end])
+            found = True
+        buffer = buffer[end + len(delimiter):]
+
+    if not found:
+        raise IOError(f"El cuerpo multipart no incluye el campo '{field}'")
+
+
+class VideoSink:
+    """
+    Servidor HTTP local que recibe las grabaciones subidas por Appium con la
+    opción remotePath de stop_recording_screen. El video se escribe a disco
+    por bloques, sin pasar por base64 ni cargarse completo en memoria.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, host=VIDEO_SINK_HOST, port=VIDEO_SINK_PORT):
+        self._uploads = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _UploadHandler)
+        self._server.daemon_threads = True
+        self._server.sink = self
+        self.host = host
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="video-sink", daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def get(cls):
+        """Instancia compartida del proceso (se inicia la primera vez)."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                print(f"🎬 Receptor de video escuchando en http://{cls._instance.host}:{cls._instance.port}")
+            return cls._instance
+
+    def expect(self, filepath):
+        """
+        Registra una subida esperada.
+
+        Returns:
+            tuple: (URL para remotePath, threading.Event que se activa al terminar)
+        """
+        token = secrets.token_urlsafe(12)
+        done = threading.Event()
+        with self._lock:
+            self._uploads[token] = (filepath, done)
+        return f"http://{self.host}:{self.port}/{token}", done
+
+    def take(self, token):
+        with self._lock:
+            return self._uploads.pop(token, None)
+
+    def discard(self, url):
+        self.take(url.rsplit("/", 1)[-1])
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,140 @@
+"""
+Catálogo de fondos de la pantalla de venta
+Cada botón de fondo publica su información en el content-desc, p. ej.
+"VXGUBCP - $38.561459 (Liquida hoy)" o "VALMX28 BF - $1,250.10\nLiquida en 2 dias".
+El catálogo parsea cada content-desc una sola vez (patrones compilados a nivel
+de módulo) y conserva los fondos en el orden en que aparecen al hacer scroll,
+para reutilizarlos en la selección, las validaciones y la lectura del valor.
+"""
+
+import re
+from dataclasses import asdict, dataclass
+
+_VALUE_AFTER_NAME_RE = re.compile(r" - \$\s*(\d[\d,]*(?:\.\d+)?)")
+_VALUE_RE = re.compile(r"\$\s*(\d[\d,]*(?:\.\d+)?)")
+_LIQUIDITY_RE = re.compile(r"Liquida\s+(?:(hoy)|en\s+(\d+)\s+d[ií]as?)", re.I)
+_SERIES_RE = re.compile(r"^(?P<fund>.+?)\s+(?P<series>[A-Z]{1,3}(?:-?\d{1,2})?)$")
+
+
+@dataclass(frozen=True)
+class FundInfo:
+    """Información de un fondo tal como aparece en la lista."""
+
+    description: str
+    name: str = ""  # Etiqueta completa antes de " - " (incluye la serie)
+    fund: str = ""  # Clave del fondo sin la serie
+    series: str = ""
+    value: float = None
+    liquidity_days: int = 0
+
+    def matches(self, name=None, value_min=None, value_max=None, liquidity_days=None):
+        """
+        Verifica los criterios de búsqueda (nombre parcial sin distinguir mayúsculas).
+
+        Returns:
+            bool: True si cumple con todos los criterios especificados
+        """
+        value = self.value if self.value is not None else 0.0
+        if name and name.upper() not in self.name.upper():
+            return False
+        if value_min is not None and value < value_min:
+            return False
+        if value_max is not None and value > value_max:
+            return False
+        if liquidity_days is not None and self.liquidity_days != liquidity_days:
+            return False
+        return True
+
+    def as_dict(self):
+        data = asdict(self)
+        data["full_description"] = self.description
+        return data
+
+
+def _to_float(text):
+    try:
+        return float(text.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def parse_fund_description(description):
+    """
+    Parsea el content-desc de un botón de fondo.
+
+    Args:
+        description (str): content-desc completo
+
+    Returns:
+        FundInfo: Información del fondo (value=None si no trae valor)
+    """
+    description = description or ""
+    name = description.split(" - ")[0].strip() if " - " in description else ""
+    fund, series = name, ""
+    series_match = _SERIES_RE.match(name)
+    if series_match:
+        fund, series = series_match.group("fund"), series_match.group("series")
+
+    value_match = _VALUE_AFTER_NAME_RE.search(description) or _VALUE_RE.search(description)
+    value = _to_float(value_match.group(1)) if value_match else None
+
+    liquidity_days = 0
+    liquidity_match = _LIQUIDITY_RE.search(description)
+    if liquidity_match and liquidity_match.group(2):
+        liquidity_days = int(liquidity_match.group(2))
+
+    return FundInfo(description, name, fund, series, value, liquidity_days)
+
+
+class FundCatalog:
+    """
+    Fondos vistos en la pantalla, indexados por content-desc.
+    Vive lo mismo que la pantalla (una instancia por page object).
+    """
+
+    def __init__(self):
+        self._funds = {}  # content-desc -> FundInfo, en orden de aparición
+
+    def get(self, description):
+        """
+        Returns:
+            FundInfo: Información del fondo (parseada solo la primera vez)
+        """
+        info = self._funds.get(description)
+        if info is None:
+            info = parse_fund_description(description)
+            self._funds[description] = info
+        return info
+
+    def add_visible(self, nodes):
+        """
+        Registra los nodos de fondo visibles (SnapshotNode o WebElement).
+
+        Returns:
+            list: Tuplas (nodo, FundInfo) en el orden de la pantalla
+        """
+        visible = []
+        for node in nodes:
+            description = node.get_attribute("content-desc")
+            if description:
+                visible.append((node, self.get(description)))
+        return visible
+
+    def find(self, **criteria):
+        """
+        Returns:
+            FundInfo: Primer fondo del catálogo que cumple los criterios o None
+        """
+        return next((info for info in self._funds.values() if info.matches(**criteria)), None)
+
+    def funds(self):
+        return list(self._funds.values())
+
+    def reset(self):
+        self._funds.clear()
+
+    def __contains__(self, description):
+        return description in self._funds
+
+    def __len__(self):
+        return len(self._funds)
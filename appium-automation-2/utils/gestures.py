@@ -0,0 +1,132 @@
+"""
+Gestos de scroll y swipe sobre los gestos nativos de UiAutomator2
+mobile: scrollGesture / mobile: swipeGesture se ejecutan en el dispositivo, que
+espera a que la vista quede quieta antes de responder, y scrollGesture devuelve
+canScrollMore: se sabe con exactitud si la lista llegó al final, sin comparar
+contenido ni dormir tras cada gesto. El tamaño de ventana se consulta una vez
+por sesión y la velocidad se ajusta al alto del área desplazable.
+"""
+
+from config.settings import test
+from utils.page_snapshot import parse_bounds
+
+# Límites de velocidad de UiAutomator2 (px/s)
+MIN_SPEED = 800
+MAX_SPEED = 20000
+
+
+class GestureEngine:
+    """
+    Uso:
+        gestures = GestureEngine(driver)
+        while gestures.scroll("down", region=region):
+            ...
+    """
+
+    _window_sizes = {}  # sesión -> {"width", "height"}
+
+    def __init__(self, driver, percent=None, duration_ms=None):
+        self.driver = driver
+        self.percent = percent if percent is not None else test.GESTURE_SCROLL_PERCENT
+        self.duration_ms = duration_ms if duration_ms is not None else test.GESTURE_DURATION_MS
+
+    def _session_key(self):
+        return getattr(self.driver, "session_id", None) or id(self.driver)
+
+    def window_size(self):
+        """
+        Returns:
+            dict: width/height de la ventana (una petición por sesión)
+        """
+        key = self._session_key()
+        size = self._window_sizes.get(key)
+        if size is None:
+            size = self.driver.get_window_size()
+            self._window_sizes[key] = size
+        return size
+
+    def invalidate(self):
+        """Descarta el tamaño de ventana en caché (p. ej. tras rotar la pantalla)."""
+        self._window_sizes.pop(self._session_key(), None)
+
+    def page_region(self, top=0.1, bottom=0.9):
+        """
+        Área de la pantalla completa, sin las barras superior e inferior.
+
+        Returns:
+            dict: left/top/width/height
+        """
+        size = self.window_size()
+        y1, y2 = int(size["height"] * top), int(size["height"] * bottom)
+        return {"left": 0, "top": y1, "width": size["width"], "height": y2 - y1}
+
+    @staticmethod
+    def region_from_bounds(bounds):
+        """
+        Convierte bounds de UiAutomator2 ('[x1,y1][x2,y2]' o tupla) en un área.
+
+        Returns:
+            dict: left/top/width/height o None si los bounds no son válidos
+        """
+        rect = parse_bounds(bounds) if isinstance(bounds, str) else bounds
+        if not rect:
+            return None
+        x1, y1, x2, y2 = rect
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return {"left": x1, "top": y1, "width": x2 - x1, "height": y2 - y1}
+
+    @classmethod
+    def scrollable_region(cls, snapshot):
+        """
+        Área del contenedor desplazable más grande de un snapshot.
+
+        Returns:
+            dict: left/top/width/height o None si no hay contenedor desplazable
+        """
+        regions = [
+            cls.region_from_bounds(node.attrib.get("bounds"))
+            for node in snapshot.find_all('//*[@scrollable="true"]')
+        ]
+        regions = [region for region in regions if region]
+        return max(regions, key=lambda r: r["width"] * r["height"], default=None)
+
+    def _speed(self, distance):
+        # Misma duración aproximada para cualquier área: más rápido en áreas altas
+        speed = int(distance * 1000 / max(self.duration_ms, 1))
+        return max(MIN_SPEED, min(MAX_SPEED, speed))
+
+    def _params(self, direction, region, element, percent):
+        percent = percent if percent is not None else self.percent
+        if element is not None:
+            params = {"elementId": element.id}
+            extent = element.size["height" if direction in ("up", "down") else "width"]
+        else:
+            region = region or self.page_region()
+            params = dict(region)
+            extent = region["height" if direction in ("up", "down") else "width"]
+        params.update(direction=direction, percent=percent, speed=self._speed(extent * percent))
+        return params
+
+    def scroll(self, direction="down", region=None, element=None, percent=None):
+        """
+        Desplaza un área (o un elemento) con mobile: scrollGesture.
+
+        Args:
+            direction (str): up, down, left o right
+            region (dict, optional): left/top/width/height (por defecto la página)
+            element (WebElement, optional): Elemento desplazable (en lugar de region)
+            percent (float, optional): Porción del área a desplazar
+
+        Returns:
+            bool: canScrollMore; False cuando ya no hay más contenido en esa dirección
+        """
+        params = self._params(direction, region, element, percent)
+        return bool(self.driver.execute_script("mobile: scrollGesture", params))
+
+    def swipe(self, direction="left", region=None, element=None, percent=None):
+        """
+        Swipe con mobile: swipeGesture (carruseles y gestos sin fin de lista).
+        """
+        params = self._params(direction, region, element, percent)
+        self.driver.execute_script("mobile: swipeGesture", params)
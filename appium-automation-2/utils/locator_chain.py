@@ -0,0 +1,122 @@
+"""
+Resolución de cadenas de localizadores alternativos ("el primero de N")
+En lugar de probar cada localizador con su propio find_elements (una búsqueda
+completa por intento fallido), evalúa todos los candidatos en una sola petición:
+- snapshot: un page_source evaluado localmente en orden de prioridad
+- union: una unión XPath (solo indica si alguno está presente)
+El localizador ganador se recuerda por pantalla y en la siguiente llamada se
+prueba primero con una sola búsqueda nativa.
+"""
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from utils.locators import compile_locator
+from utils.page_snapshot import PageSnapshot
+
+
+class ChainMatch:
+    """Resultado de una cadena: índice y localizador ganador, y sus elementos."""
+
+    def __init__(self, index, locator, elements, source):
+        self.index = index  # None en modo union (no se distingue el candidato)
+        self.locator = locator
+        self.elements = elements  # SnapshotNode (snapshot) o WebElement
+        self.source = source  # remembered, snapshot o union
+
+    @property
+    def first(self):
+        return self.elements[0]
+
+    def __repr__(self):
+        return f"<ChainMatch index={self.index} elementos={len(self.elements)} via={self.source}>"
+
+
+class LocatorChain:
+    """
+    Localizadores alternativos ordenados por prioridad.
+    Los candidatos deben poder evaluarse con lxml: XPath, accessibility id o
+    localizadores compilados (conservan su XPath original).
+
+    Uso:
+        FUND_CHAIN = LocatorChain("fondo", [(AppiumBy.XPATH, "..."), ...])
+        match = FUND_CHAIN.resolve(driver, screen="vender")
+    """
+
+    def __init__(self, name, locators, mode="snapshot"):
+        if mode not in ("snapshot", "union"):
+            raise ValueError(f"Modo de resolución no soportado: {mode}")
+        self.name = name
+        self.mode = mode
+        self.locators = [compile_locator(locator) for locator in locators]
+        self.union_xpath = " | ".join(self._xpath(locator) for locator in self.locators)
+        self._winners = {}  # pantalla -> índice del último ganador
+
+    @staticmethod
+    def _xpath(locator):
+        return PageSnapshot.to_xpath(locator)
+
+    def winner(self, screen=None):
+        """
+        Returns:
+            int: Índice del último localizador ganador en la pantalla o None
+        """
+        return self._winners.get(screen)
+
+    def forget(self, screen=None):
+        self._winners.pop(screen, None)
+
+    def order(self, screen=None):
+        """Índices de los candidatos en el orden de evaluación (ganador primero)."""
+        indexes = list(range(len(self.locators)))
+        winner = self._winners.get(screen)
+        if winner is not None:
+            indexes.remove(winner)
+            indexes.insert(0, winner)
+        return indexes
+
+    def resolve(self, driver, screen=None, snapshot=None):
+        """
+        Devuelve el primer candidato con resultados.
+
+        Args:
+            driver: Driver de Appium
+            screen (str, optional): Pantalla para recordar el ganador
+            snapshot (PageSnapshot, optional): Snapshot ya obtenido (0 peticiones)
+
+        Returns:
+            ChainMatch: Candidato ganador y sus elementos, o None si ninguno aparece
+        """
+        if snapshot is None:
+            match = self._try_remembered(driver, screen)
+            if match is not None:
+                return match
+            if self.mode == "union":
+                return self._resolve_union(driver)
+            snapshot = PageSnapshot.capture(driver)
+
+        for index in self.order(screen):
+            nodes = snapshot.find_all(self.locators[index])
+            if nodes:
+                self._winners[screen] = index
+                return ChainMatch(index, self.locators[index], nodes, "snapshot")
+        return None
+
+    def _try_remembered(self, driver, screen):
+        winner = self._winners.get(screen)
+        if winner is None:
+            return None
+        locator = self.locators[winner]
+        elements = driver.find_elements(*locator)
+        if elements:
+            return ChainMatch(winner, locator, elements, "remembered")
+        return None
+
+    def _resolve_union(self, driver):
+        elements = driver.find_elements(AppiumBy.XPATH, self.union_xpath)
+        if not elements:
+            return None
+        # La unión XPath devuelve nodos en orden de documento, sin prioridad
+        return ChainMatch(None, None, elements, "union")
+
+    def __repr__(self):
+        return f"<LocatorChain {self.name} candidatos={len(self.locators)} modo={self.mode}>"
@@ -0,0 +1,333 @@
+"""
+Compilador de localizadores XPath a estrategias nativas de UiAutomator2
+Con XPath el servidor serializa toda la jerarquía en cada búsqueda; las formas
+comunes de los page objects (//Clase[@content-desc="..."], contains(...),
+starts-with(...), combinadas con and/or) se traducen a accessibility id, id o
+-android uiautomator (UiSelector) solo cuando el resultado es equivalente.
+Cualquier otra forma se conserva como XPath.
+
+Nota de equivalencia: en UiSelector, descriptionContains/textContains y los
+*StartsWith ignoran mayúsculas, y repetir un criterio lo sobrescribe; por eso
+contains/starts-with se compilan a *Matches con expresiones regulares (Java)
+que respetan mayúsculas como XPath.
+"""
+
+import re
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from config.settings import appium
+
+# Atributo XPath -> (método UiSelector exacto, método UiSelector regex)
+_UISELECTOR_METHODS = {
+    "content-desc": ("description", "descriptionMatches"),
+    "text": ("text", "textMatches"),
+    "resource-id": ("resourceId", "resourceIdMatches"),
+}
+
+_LOCATOR_RE = re.compile(r"^//(\*|[A-Za-z_][\w.$]*)\[(.*)\]$", re.S)
+_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<lparen>\()|(?P<rparen>\))|(?P<comma>,)|(?P<eq>=)|
+        (?P<attr>@[\w:-]+)|
+        (?P<string>"[^"]*"|'[^']*')|
+        (?P<name>[A-Za-z][\w-]*)
+    )""",
+    re.X,
+)
+
+
+class Locator(tuple):
+    """
+    Localizador (By, value) compatible con find_element(*loc) y expected_conditions.
+    Conserva el XPath original en `xpath` (para snapshots y diagnósticos).
+    """
+
+    def __new__(cls, by, value, xpath=None, spec=None):
+        locator = super().__new__(cls, (by, value))
+        locator.xpath = xpath
+        locator.spec = spec
+        return locator
+
+    @property
+    def compiled(self):
+        return self.xpath is not None and self[0] != AppiumBy.XPATH
+
+    def __repr__(self):
+        if self.compiled:
+            return f"Locator({self[0]!r}, {self[1]!r}, xpath={self.xpath!r})"
+        return f"Locator({self[0]!r}, {self[1]!r})"
+
+
+# ----------------------------------------------------
+# Análisis del predicado XPath
+# ----------------------------------------------------
+
+class _Term:
+    """Condición sobre un atributo: eq, contains o starts-with."""
+
+    def __init__(self, op, attr, value):
+        self.op = op
+        self.attr = attr
+        self.value = value
+
+    def attrs(self):
+        return {self.attr}
+
+
+class _Bool:
+    def __init__(self, op, children):
+        self.op = op
+        self.children = children
+
+    def attrs(self):
+        result = set()
+        for child in self.children:
+            result |= child.attrs()
+        return result
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _tokenize(expr):
+    tokens = []
+    pos = 0
+    expr = expr.strip()
+    while pos < len(expr):
+        match = _TOKEN_RE.match(expr, pos)
+        if not match or match.end() == pos:
+            raise _Unsupported(expr[pos:])
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+        while pos < len(expr) and expr[pos].isspace():
+            pos += 1
+    return tokens
+
+
+class _Parser:
+    """expr := and ('or' and)* ; and := atom ('and' atom)* ; atom := '(' expr ')' | term"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self, kind, value=None):
+        token = self._peek()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise _Unsupported(f"se esperaba {value or kind}")
+        self.pos += 1
+        return token[1]
+
+    def parse(self):
+        node = self._or()
+        if self.pos != len(self.tokens):
+            raise _Unsupported("tokens sobrantes")
+        return node
+
+    def _or(self):
+        children = [self._and()]
+        while self._peek() == ("name", "or"):
+            self.pos += 1
+            children.append(self._and())
+        return children[0] if len(children) == 1 else _Bool("or", children)
+
+    def _and(self):
+        children = [self._atom()]
+        while self._peek() == ("name", "and"):
+            self.pos += 1
+            children.append(self._atom())
+        return children[0] if len(children) == 1 else _Bool("and", children)
+
+    def _atom(self):
+        kind, value = self._peek()
+        if kind == "lparen":
+            self.pos += 1
+            node = self._or()
+            self._take("rparen")
+            return node
+        if kind == "attr":
+            self.pos += 1
+            self._take("eq")
+            return _Term("eq", value[1:], self._string())
+        if kind == "name" and value in ("contains", "starts-with"):
+            self.pos += 1
+            self._take("lparen")
+            attr = self._take("attr")[1:]
+            self._take("comma")
+            literal = self._string()
+            self._take("rparen")
+            return _Term(value, attr, literal)
+        raise _Unsupported(f"expresión no soportada: {value}")
+
+    def _string(self):
+        return self._take("string")[1:-1]
+
+
+# ----------------------------------------------------
+# UiSelector equivalente (con evaluación local para pruebas)
+# ----------------------------------------------------
+
+def _java_literal(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _regex_parts(node):
+    """
+    Traduce un subárbol de un solo atributo a una expresión regular de
+    lookaheads. Devuelve (regex Java, regex Python) sin anclas.
+    """
+    if isinstance(node, _Term):
+        if "\\E" in node.value:
+            raise _Unsupported("literal con \\E")
+        java, py = f"\\Q{node.value}\\E", re.escape(node.value)
+        if node.op == "eq":
+            return f"(?={java}\\z)", f"(?={py}\\Z)"
+        if node.op == "contains":
+            return f"(?=.*{java})", f"(?=.*{py})"
+        return f"(?={java})", f"(?={py})"
+    parts = [_regex_parts(child) for child in node.children]
+    if node.op == "and":
+        return "".join(j for j, _ in parts), "".join(p for _, p in parts)
+    return (
+        "(?:" + "|".join(j for j, _ in parts) + ")",
+        "(?:" + "|".join(p for _, p in parts) + ")",
+    )
+
+
+class UiSelectorSpec:
+    """
+    Selector UiAutomator construido por el compilador: clase + un criterio por
+    atributo. Sabe generar el código Java y evaluarse sobre un page_source.
+    """
+
+    def __init__(self, class_name=None):
+        self.class_name = class_name
+        self.criteria = []  # (atributo, método, argumento Java, comparador Python)
+
+    def add_exact(self, attr, value):
+        method = _UISELECTOR_METHODS[attr][0]
+        self.criteria.append((attr, method, _java_literal(value), lambda v, x=value: v == x))
+
+    def add_regex(self, attr, node):
+        java, py = _regex_parts(node)
+        pattern = re.compile(f"(?s){py}.*")
+        method = _UISELECTOR_METHODS[attr][1]
+        self.criteria.append(
+            (attr, method, _java_literal(f"(?s){java}.*"), lambda v, p=pattern: p.fullmatch(v) is not None)
+        )
+
+    def to_java(self):
+        code = "new UiSelector()"
+        if self.class_name:
+            code += f".className({_java_literal(self.class_name)})"
+        for _, method, argument, _ in self.criteria:
+            code += f".{method}({argument})"
+        return code
+
+    def matches(self, attrib, tag=None):
+        if self.class_name and (attrib.get("class") or tag) != self.class_name:
+            return False
+        for attr, _, _, check in self.criteria:
+            value = attrib.get(attr)
+            # UiAutomator2 publica "" cuando el atributo no existe; XPath no lo compara
+            if value is None or value == "" or not check(value):
+                return False
+        return True
+
+    def find_all(self, root):
+        """Nodos (lxml) del page_source que cumplen el selector, en orden de documento."""
+        return [node for node in root.iter() if isinstance(node.tag, str) and self.matches(node.attrib, node.tag)]
+
+
+def _literals(node):
+    if isinstance(node, _Term):
+        return [node.value]
+    return [value for child in node.children for value in _literals(child)]
+
+
+def _build_spec(tag, predicate):
+    """
+    Construye el UiSelector equivalente o lanza _Unsupported.
+    El predicado debe ser un AND de subárboles de un solo atributo soportado.
+    """
+    groups = predicate.children if isinstance(predicate, _Bool) and predicate.op == "and" else [predicate]
+    by_attr = {}
+    for group in groups:
+        attrs = group.attrs()
+        if len(attrs) != 1:
+            raise _Unsupported("or entre atributos distintos")
+        attr = attrs.pop()
+        if attr not in _UISELECTOR_METHODS:
+            raise _Unsupported(f"atributo sin equivalente en UiSelector: @{attr}")
+        by_attr.setdefault(attr, []).append(group)
+
+    if any(value == "" for value in _literals(predicate)):
+        raise _Unsupported("literal vacío")
+
+    spec = UiSelectorSpec(None if tag == "*" else tag)
+    for attr, nodes in by_attr.items():
+        node = nodes[0] if len(nodes) == 1 else _Bool("and", nodes)
+        if isinstance(node, _Term) and node.op == "eq":
+            spec.add_exact(attr, node.value)
+        else:
+            spec.add_regex(attr, node)
+    return spec
+
+
+def compile_xpath(xpath):
+    """
+    Compila un XPath a la estrategia nativa equivalente.
+
+    Returns:
+        Locator: accessibility id, id, -android uiautomator o el mismo XPath
+    """
+    match = _LOCATOR_RE.match(xpath.strip())
+    if not match:
+        return Locator(AppiumBy.XPATH, xpath)
+    tag, predicate_src = match.groups()
+    try:
+        predicate = _Parser(_tokenize(predicate_src)).parse()
+        spec = _build_spec(tag, predicate)
+    except _Unsupported:
+        return Locator(AppiumBy.XPATH, xpath)
+
+    if tag == "*" and len(spec.criteria) == 1 and isinstance(predicate, _Term) and predicate.op == "eq":
+        if predicate.attr == "content-desc":
+            return Locator(AppiumBy.ACCESSIBILITY_ID, predicate.value, xpath=xpath, spec=spec)
+        # Sin ':id/' Appium antepone el paquete de la app; ahí se usa UiSelector
+        if predicate.attr == "resource-id" and ":id/" in predicate.value:
+            return Locator(AppiumBy.ID, predicate.value, xpath=xpath, spec=spec)
+
+    # El parser de UiSelector del servidor no interpreta saltos de línea escapados
+    if any("\n" in value or "\r" in value for value in _literals(predicate)):
+        return Locator(AppiumBy.XPATH, xpath)
+    return Locator(AppiumBy.ANDROID_UIAUTOMATOR, spec.to_java(), xpath=xpath, spec=spec)
+
+
+def compile_locator(locator, enabled=None):
+    """
+    Compila un localizador (By, value) de page object.
+    Solo se traducen los XPath; el resto se devuelve como Locator sin cambios.
+    Con APPIUM_COMPILE_LOCATORS=False se conserva siempre el XPath.
+
+    Args:
+        locator (tuple): (By, value)
+        enabled (bool): Fuerza la compilación (None = configuración)
+
+    Returns:
+        Locator: Localizador equivalente
+    """
+    by, value = locator[0], locator[1]
+    if enabled is None:
+        enabled = appium.COMPILE_LOCATORS
+    if by != AppiumBy.XPATH:
+        return Locator(by, value)
+    if not enabled:
+        return Locator(by, value, xpath=value)
+    return compile_xpath(value)
@@ -0,0 +1,224 @@
+"""
+Navegación por estados de pantalla
+Modela el flujo login -> inicio -> operaciones -> vender como un grafo sobre los
+page objects. La pantalla actual se identifica con un solo page_source evaluando
+localmente la firma (SCREEN_SIGNATURE) de cada página, y se recorre el camino
+más corto (BFS) hasta la pantalla inicial de la prueba. Con la sesión de Appium
+reutilizada, la sesión autenticada de la app se conserva mientras no venza
+TEST_NAV_SESSION_TTL; si venció o la pantalla es desconocida, se relanza la app.
+"""
+
+import time
+from collections import deque
+
+from config.settings import app, test
+from pages.home_page import ValmexHomePage
+from pages.login_page import ValmexLoginPage
+from pages.operations_page import ValmexOperationsPage
+from pages.vender_page import ValmexVenderPage
+from utils.page_snapshot import PageSnapshot
+from utils.waits import ScreenWaiter
+
+
+class NavigationError(AssertionError):
+    """Se lanza cuando no se puede llegar a la pantalla solicitada."""
+
+
+class NavigationResult:
+    """Resultado de go_to: camino recorrido y tiempo empleado."""
+
+    def __init__(self, start, target, path, seconds, relaunched):
+        self.start = start
+        self.target = target
+        self.path = path
+        self.seconds = seconds
+        self.relaunched = relaunched
+
+    def as_dict(self):
+        return {
+            "start": self.start,
+            "target": self.target,
+            "path": self.path,
+            "seconds": round(self.seconds, 3),
+            "relaunched": self.relaunched,
+        }
+
+
+class ScreenNavigator:
+    """
+    Uso:
+        navigator = ScreenNavigator(driver)
+        navigator.go_to("vender", password=data["password"])
+    """
+
+    # Orden de identificación: de la pantalla más profunda a la más general
+    SCREENS = {
+        "vender": ValmexVenderPage,
+        "operations": ValmexOperationsPage,
+        "home": ValmexHomePage,
+        "login": ValmexLoginPage,
+    }
+    AUTHENTICATED = ("home", "operations", "vender")
+    # Plazo extendido para la transición que depende del backend (login)
+    SLOW_TRANSITIONS = {("login", "home"): 45}
+
+    _last_authenticated = {}  # sesión de Appium -> última vez vista una pantalla autenticada
+
+    def __init__(self, driver, session_ttl=None, waiter=None):
+        self.driver = driver
+        self.session_ttl = session_ttl if session_ttl is not None else test.NAV_SESSION_TTL
+        self.waiter = waiter or ScreenWaiter(driver)
+        self.pages = {name: page(driver) for name, page in self.SCREENS.items()}
+        self.edges = {
+            "login": {"home": self._login},
+            "home": {"operations": lambda _: self.pages["home"].click_operaciones()},
+            "operations": {
+                "vender": lambda _: self.pages["operations"].click_vender(),
+                "home": self._back,
+            },
+            "vender": {"operations": self._back},
+        }
+
+    # ----------------------------------------------------
+    # Identificación y plan
+    # ----------------------------------------------------
+
+    def identify(self, snapshot=None):
+        """
+        Identifica la pantalla actual con un solo page_source.
+
+        Returns:
+            str: Nombre de la pantalla o None si no coincide ninguna firma
+        """
+        snapshot = snapshot or PageSnapshot.capture(self.driver)
+        for name, page in self.SCREENS.items():
+            signature = page.SCREEN_SIGNATURE
+            locators = signature if isinstance(signature, list) else [signature]
+            if all(snapshot.exists(locator) for locator in locators):
+                return name
+        return None
+
+    def plan(self, source, target):
+        """
+        Camino más corto (BFS) entre dos pantallas.
+
+        Returns:
+            list: Pantallas desde source hasta target (inclusive) o None si no hay camino
+        """
+        previous = {source: None}
+        queue = deque([source])
+        while queue:
+            screen = queue.popleft()
+            if screen == target:
+                path = []
+                while screen is not None:
+                    path.append(screen)
+                    screen = previous[screen]
+                return path[::-1]
+            for neighbour in self.edges.get(screen, {}):
+                if neighbour not in previous:
+                    previous[neighbour] = screen
+                    queue.append(neighbour)
+        return None
+
+    # ----------------------------------------------------
+    # Navegación
+    # ----------------------------------------------------
+
+    def go_to(self, target, password=None):
+        """
+        Lleva la app a la pantalla indicada por el camino más corto.
+
+        Args:
+            target (str): login, home, operations o vender
+            password (str, optional): Necesaria si el camino pasa por el login
+
+        Returns:
+            NavigationResult: Camino recorrido
+        """
+        if target not in self.SCREENS:
+            raise ValueError(f"Pantalla desconocida: {target}")
+
+        started_at = time.perf_counter()
+        start = self.identify()
+        current = start
+        relaunched = False
+
+        if current is None:
+            # Subpantallas (lista de contratos, confirmación): un "atrás" suele bastar
+            self.driver.back()
+            current = self.identify()
+        if current in self.AUTHENTICATED and self._session_expired():
+            print(f"⌛ Sesión de la app vencida (>{self.session_ttl:.0f}s), se relanza la app")
+            current = None
+        if current is None:
+            current = self._relaunch()
+            relaunched = True
+        elif current in self.AUTHENTICATED:
+            self._touch_session()
+
+        path = self.plan(current, target)
+        if path is None:
+            raise NavigationError(f"❌ No hay camino de '{current}' a '{target}'")
+
+        self._password = password
+        try:
+            for source, destination in zip(path, path[1:]):
+                self._step(source, destination)
+        finally:
+            self._password = None
+
+        result = NavigationResult(
+            start, target, path, time.perf_counter() - started_at, relaunched
+        )
+        print(
+            f"🧭 Navegación {start or 'desconocida'} -> {target}: "
+            f"{' -> '.join(path)} en {result.seconds:.2f}s"
+        )
+        return result
+
+    def _step(self, source, destination):
+        if self.edges[source][destination](source) is False:
+            raise NavigationError(f"❌ No se pudo ir de '{source}' a '{destination}'")
+        result = self.waiter.wait_for(
+            self.SCREENS[destination].SCREEN_SIGNATURE,
+            step=f"navegacion_{source}_{destination}",
+            timeout=self.SLOW_TRANSITIONS.get((source, destination)),
+        )
+        if not result:
+            raise NavigationError(
+                f"❌ No apareció la pantalla '{destination}' después de '{source}'"
+            )
+        if destination in self.AUTHENTICATED:
+            self._touch_session()
+
+    def _login(self, _):
+        if self._password is None:
+            raise NavigationError("❌ Se requiere la contraseña para pasar por el login")
+        return self.pages["login"].set_Access_with_credentials(self._password, self.driver)
+
+    def _back(self, _):
+        self.driver.back()
+        return True
+
+    def _relaunch(self):
+        self.driver.terminate_app(app.PACKAGE_NAME)
+        self.driver.activate_app(app.PACKAGE_NAME)
+        self._last_authenticated.pop(self._session_key(), None)
+        if not self.waiter.wait_for(ValmexLoginPage.SCREEN_SIGNATURE, step="navegacion_relanzar"):
+            raise NavigationError("❌ La app no mostró el login después de relanzarla")
+        return "login"
+
+    # ----------------------------------------------------
+    # Vigencia de la sesión autenticada
+    # ----------------------------------------------------
+
+    def _session_key(self):
+        return getattr(self.driver, "session_id", None) or id(self.driver)
+
+    def _touch_session(self):
+        self._last_authenticated[self._session_key()] = time.monotonic()
+
+    def _session_expired(self):
+        last_seen = self._last_authenticated.get(self._session_key())
+        return last_seen is None or time.monotonic() - last_seen > self.session_ttl
@@ -0,0 +1,183 @@
+"""
+Snapshot de la jerarquía de pantalla
+Obtiene driver.page_source una sola vez por estado de pantalla y evalúa los
+localizadores XPath localmente con lxml, en lugar de un find_elements más un
+get_attribute por nodo (una petición HTTP al servidor de Appium por cada uno).
+Solo se recurre al elemento vivo cuando hay que ejecutar una acción sobre él.
+"""
+
+import re
+
+from lxml import etree
+from appium.webdriver.common.appiumby import AppiumBy
+
+
+_BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+
+def xpath_literal(value):
+    """
+    Convierte un texto en literal XPath 1.0 válido aunque contenga comillas.
+
+    Args:
+        value (str): Texto a convertir
+
+    Returns:
+        str: Literal XPath (entre comillas o como concat(...))
+    """
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    parts = value.split('"')
+    return "concat(" + ", '\"', ".join(f'"{part}"' for part in parts) + ")"
+
+
+def parse_bounds(bounds):
+    """
+    Convierte el atributo bounds de UiAutomator2 ('[x1,y1][x2,y2]') en tupla.
+
+    Returns:
+        tuple: (x1, y1, x2, y2) o None si no tiene el formato esperado
+    """
+    match = _BOUNDS_RE.match(bounds or "")
+    if not match:
+        return None
+    return tuple(int(group) for group in match.groups())
+
+
+class SnapshotNode:
+    """
+    Registro ligero de un nodo del snapshot.
+    Expone la misma interfaz de lectura que un WebElement (get_attribute, text)
+    y resuelve el elemento vivo solo cuando se invoca una acción (click).
+    """
+
+    __slots__ = ("tag", "attrib", "_driver")
+
+    def __init__(self, tag, attrib, driver):
+        self.tag = tag
+        self.attrib = attrib
+        self._driver = driver
+
+    @property
+    def content_desc(self):
+        return self.attrib.get("content-desc", "")
+
+    @property
+    def text(self):
+        return self.attrib.get("text", "")
+
+    @property
+    def bounds(self):
+        return parse_bounds(self.attrib.get("bounds"))
+
+    @property
+    def center(self):
+        bounds = self.bounds
+        if bounds is None:
+            return None
+        x1, y1, x2, y2 = bounds
+        return (x1 + x2) // 2, (y1 + y2) // 2
+
+    def get_attribute(self, name):
+        """
+        Lee un atributo del snapshot (sin petición al servidor).
+        Acepta los alias de Appium ('name' y 'contentDescription' -> content-desc).
+        """
+        if name in ("name", "contentDescription"):
+            name = "content-desc"
+        return self.attrib.get(name)
+
+    def to_element(self):
+        """
+        Resuelve el elemento vivo correspondiente a este nodo.
+        Busca primero por clase + bounds (único en la pantalla) y, si la pantalla
+        se movió desde el snapshot, por clase + content-desc.
+
+        Returns:
+            WebElement: Elemento vivo
+        """
+        bounds = self.attrib.get("bounds")
+        if bounds:
+            elements = self._driver.find_elements(
+                AppiumBy.XPATH, f"//{self.tag}[@bounds={xpath_literal(bounds)}]"
+            )
+            if elements:
+                return elements[0]
+        if self.content_desc:
+            return self._driver.find_element(
+                AppiumBy.XPATH,
+                f"//{self.tag}[@content-desc={xpath_literal(self.content_desc)}]",
+            )
+        return self._driver.find_element(
+            AppiumBy.XPATH, f"//{self.tag}[@text={xpath_literal(self.text)}]"
+        )
+
+    def click(self):
+        self.to_element().click()
+
+    def __repr__(self):
+        return f"<SnapshotNode {self.tag} desc={self.content_desc!r} bounds={self.attrib.get('bounds')}>"
+
+
+class PageSnapshot:
+    """
+    Jerarquía de la pantalla obtenida con una sola llamada a page_source.
+    """
+
+    def __init__(self, driver, source):
+        self.driver = driver
+        self.root = etree.fromstring(source.encode("utf-8"))
+
+    @classmethod
+    def capture(cls, driver):
+        """
+        Obtiene el page_source actual (una petición) y lo parsea.
+
+        Returns:
+            PageSnapshot: Snapshot del estado actual de la pantalla
+        """
+        return cls(driver, driver.page_source)
+
+    def find_all(self, locator):
+        """
+        Evalúa un localizador localmente.
+
+        Args:
+            locator: Tupla (By, value) con By XPATH o ACCESSIBILITY_ID, o un XPath (str)
+
+        Returns:
+            list: Lista de SnapshotNode en orden de documento
+        """
+        xpath = self.to_xpath(locator)
+        return [
+            SnapshotNode(node.tag, dict(node.attrib), self.driver)
+            for node in self.root.xpath(xpath)
+            if isinstance(node, etree._Element)
+        ]
+
+    def find(self, locator):
+        """
+        Returns:
+            SnapshotNode: Primer nodo que cumple el localizador o None
+        """
+        nodes = self.find_all(locator)
+        return nodes[0] if nodes else None
+
+    def exists(self, locator):
+        return bool(self.root.xpath(self.to_xpath(locator)))
+
+    @staticmethod
+    def to_xpath(locator):
+        if isinstance(locator, str):
+            return locator
+        # Localizador compilado (utils.locators): se evalúa su XPath original
+        if getattr(locator, "xpath", None):
+            return locator.xpath
+        by, value = locator[0], locator[1]
+        if by == AppiumBy.XPATH:
+            return value
+        if by == AppiumBy.ACCESSIBILITY_ID:
+            return f"//*[@content-desc={xpath_literal(value)}]"
+        raise ValueError(f"Estrategia no soportada en el snapshot: {by}")
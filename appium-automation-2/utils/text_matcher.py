@@ -0,0 +1,156 @@
+"""
+Validación de varios textos en una sola pasada
+Todos los textos de la pantalla se unen en un solo corpus (separados por \\x00)
+y todos los textos literales esperados se evalúan con una única expresión
+regular combinada: cada patrón es un lookahead opcional con su propio grupo, así
+que en cada posición se prueban todos sin que un patrón "consuma" el texto de otro.
+Las expresiones regulares del usuario (re.Pattern) se evalúan elemento por
+elemento: en el corpus, "." o "\\W" cruzarían el separador y "^"/"$" no
+anclarían al texto del elemento. El resultado indica por patrón si se encontró
+y en qué elemento.
+"""
+
+import bisect
+import re
+
+_SEPARATOR = "\x00"
+
+
+class TextMatch:
+    """Resultado de un patrón: encontrado o no y el elemento que lo contiene."""
+
+    def __init__(self, expected, found=False, text=None, element=None):
+        self.expected = expected
+        self.found = found
+        self.text = text
+        self.element = element
+
+    def as_dict(self):
+        return {"expected": self.expected, "found": self.found, "text": self.text}
+
+    def __repr__(self):
+        icon = "✅" if self.found else "❌"
+        return f"<TextMatch {icon} {self.expected!r}>"
+
+
+class TextReport:
+    """Reporte por patrón; verdadero solo si se encontraron todos."""
+
+    def __init__(self, matches):
+        self.matches = matches
+
+    @property
+    def found(self):
+        return [m for m in self.matches if m.found]
+
+    @property
+    def missing(self):
+        return [m for m in self.matches if not m.found]
+
+    def __bool__(self):
+        return not self.missing
+
+    def __iter__(self):
+        return iter(self.matches)
+
+    def summary(self):
+        lines = []
+        for match in self.matches:
+            if match.found:
+                lines.append(f"✅ '{match.expected}' en: {match.text!r}")
+            else:
+                lines.append(f"❌ '{match.expected}' no encontrado")
+        return "\n".join(lines)
+
+    def as_dict(self):
+        return {"all_found": bool(self), "matches": [m.as_dict() for m in self.matches]}
+
+
+def _describe(pattern):
+    return pattern.pattern if isinstance(pattern, re.Pattern) else pattern
+
+
+class TextMatcher:
+    """
+    Textos esperados compilados en una sola expresión regular (las re.Pattern
+    se evalúan por elemento).
+
+    Args:
+        patterns (list): Textos (literal) o expresiones regulares (re.Pattern)
+        partial_match (bool): Si False, el texto debe ser el texto completo del elemento
+        ignore_case (bool): Sin distinguir mayúsculas (como las validaciones existentes)
+    """
+
+    def __init__(self, patterns, partial_match=True, ignore_case=True):
+        self.patterns = list(patterns)
+        self.partial_match = partial_match
+        flags = re.I if ignore_case else 0
+        parts = []
+        self._regexes = {}  # índice -> re.Pattern evaluado por elemento
+        for i, pattern in enumerate(self.patterns):
+            if isinstance(pattern, re.Pattern):
+                self._regexes[i] = re.compile(pattern.pattern, pattern.flags | flags)
+                continue
+            body = re.escape(pattern.strip())
+            if not partial_match:
+                body = f"(?<={_SEPARATOR})(?:{body})(?={_SEPARATOR})"
+            parts.append(f"(?=(?P<p{i}>{body}))?")
+        self._regex = re.compile("".join(parts), flags) if parts else None
+
+    def match(self, items, pending=None):
+        """
+        Busca todos los patrones en los textos de una pantalla.
+
+        Args:
+            items (list): Tuplas (texto, elemento) o textos
+            pending (list, optional): Índices de patrones a buscar (por defecto todos)
+
+        Returns:
+            dict: índice de patrón -> (texto, elemento) del primer elemento que lo contiene
+        """
+        pending = set(range(len(self.patterns)) if pending is None else pending)
+        items = [item if isinstance(item, tuple) else (item, None) for item in items]
+        found = {}
+
+        literals = pending - set(self._regexes)
+        if literals and self._regex is not None:
+            corpus_parts = [_SEPARATOR]
+            starts = []
+            offset = 1
+            for text, _ in items:
+                starts.append(offset)
+                corpus_parts.append(text + _SEPARATOR)
+                offset += len(text) + 1
+            corpus = "".join(corpus_parts)
+
+            for match in self._regex.finditer(corpus):
+                for name, value in match.groupdict().items():
+                    index = int(name[1:])
+                    if value is None or index in found or index not in literals:
+                        continue
+                    item = bisect.bisect_right(starts, match.start()) - 1
+                    found[index] = items[item]
+                if len(found) == len(literals):
+                    break
+
+        for index in sorted(pending & set(self._regexes)):
+            regex = self._regexes[index]
+            test = regex.search if self.partial_match else regex.fullmatch
+            found_item = next((item for item in items if test(item[0])), None)
+            if found_item is not None:
+                found[index] = found_item
+        return found
+
+    def report(self, found):
+        """
+        Returns:
+            TextReport: Reporte por patrón a partir del resultado de match()
+        """
+        matches = []
+        for i, pattern in enumerate(self.patterns):
+            if i in found:
+                text, element = found[i]
+                matches.append(TextMatch(_describe(pattern), True, text, element))
+            else:
+                matches.append(TextMatch(_describe(pattern)))
+        return TextReport(matches)
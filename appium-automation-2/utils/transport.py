@@ -0,0 +1,237 @@
+"""
+Transporte HTTP afinado para la conexión con Appium Server
+Los page objects emiten cientos de comandos pequeños; con esta conexión todos
+reutilizan sockets persistentes (keep-alive) de un pool de tamaño configurable,
+con TCP_NODELAY, reintentos ante conexiones reiniciadas y latencia por comando.
+Los sockets del pool quedan registrados para que el watchdog (utils.watchdog)
+pueda abortar una petición colgada desde otro hilo.
+"""
+
+import json
+import socket
+import threading
+import time
+import weakref
+
+import urllib3
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from appium.webdriver.appium_connection import AppiumConnection
+from appium.webdriver.client_config import AppiumClientConfig
+
+
+class CommandLatency:
+    """Latencia acumulada por comando WebDriver (en segundos)."""
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, command, seconds):
+        self.samples.setdefault(command, []).append(seconds)
+
+    def reset(self):
+        self.samples = {}
+
+    @property
+    def total_commands(self):
+        return sum(len(values) for values in self.samples.values())
+
+    def summary(self):
+        """
+        Returns:
+            list: Un dict por comando (count, total_ms, avg_ms, p95_ms, max_ms),
+                  ordenado por tiempo total descendente
+        """
+        rows = []
+        for command, values in self.samples.items():
+            ordered = sorted(values)
+            p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+            rows.append({
+                "command": command,
+                "count": len(values),
+                "total_ms": round(sum(values) * 1000, 2),
+                "avg_ms": round(sum(values) / len(values) * 1000, 2),
+                "p95_ms": round(p95 * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def print_summary(self, top=10):
+        rows = self.summary()
+        if not rows:
+            return
+        print(f"📡 Latencia por comando ({self.total_commands} comandos)")
+        print(f"   {'Comando':<32}{'N':>6}{'Prom ms':>10}{'p95 ms':>10}{'Total ms':>12}")
+        for row in rows[:top]:
+            print(
+                f"   {row['command']:<32}{row['count']:>6}{row['avg_ms']:>10.2f}"
+                f"{row['p95_ms']:>10.2f}{row['total_ms']:>12.2f}"
+            )
+
+    def save(self, filepath):
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        return filepath
+
+
+class CommandAborted(ConnectionAbortedError):
+    """La petición en curso fue abortada por el watchdog."""
+
+
+class TunedAppiumConnection(AppiumConnection):
+    """
+    AppiumConnection con pool de conexiones persistentes afinado.
+
+    - keep-alive siempre activo y pool de `pool_size` sockets por host
+    - TCP_NODELAY y SO_KEEPALIVE en cada socket
+    - reintentos con backoff ante errores de conexión (y de lectura en
+      métodos idempotentes), p. ej. un socket reutilizado que el servidor cerró
+    - latencia por comando en `self.latency`
+    - abort_inflight() corta los sockets abiertos desde otro hilo (watchdog)
+    """
+
+    def __init__(self, client_config, pool_size=4, retries=2, backoff_factor=0.2):
+        # _get_connection_manager se invoca dentro del __init__ de la clase base
+        self._pool_size = pool_size
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._sockets = weakref.WeakSet()
+        self._aborted = threading.Event()
+        self.latency = CommandLatency()
+        super().__init__(client_config=client_config)
+
+    # video.py ajusta command_executor._timeout durante la descarga del video;
+    # en Selenium 4.27 el timeout efectivo es el del ClientConfig
+    @property
+    def _timeout(self):
+        return self._client_config.timeout
+
+    @_timeout.setter
+    def _timeout(self, value):
+        self._client_config.timeout = value
+
+    def _get_connection_manager(self):
+        socket_options = list(HTTPConnection.default_socket_options)
+        for option in ((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)):
+            if option not in socket_options:
+                socket_options.append(option)
+
+        retries = Retry(
+            total=self._retries,
+            connect=self._retries,
+            read=self._retries,
+            status=0,
+            backoff_factor=self._backoff_factor,
+            raise_on_status=False,
+            redirect=False,
+        )
+        tls_args = {}
+        if self._client_config.ignore_certificates:
+            tls_args["cert_reqs"] = "CERT_NONE"
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        elif self._client_config.ca_certs:
+            tls_args["cert_reqs"] = "CERT_REQUIRED"
+            tls_args["ca_certs"] = self._client_config.ca_certs
+
+        manager = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=self._pool_size,
+            block=False,
+            retries=retries,
+            socket_options=socket_options,
+            timeout=self._client_config.timeout,
+            **tls_args,
+        )
+        manager.pool_classes_by_scheme = {
+            **manager.pool_classes_by_scheme,
+            **self._tracked_pool_classes(),
+        }
+        return manager
+
+    def _tracked_pool_classes(self):
+        """
+        Returns:
+            dict: Esquema (http, https) -> pool cuyos sockets quedan registrados
+        """
+        sockets, aborted = self._sockets, self._aborted
+
+        def tracked(connection_class):
+            class TrackedConnection(connection_class):
+                def _new_conn(self):
+                    # Un reintento de urllib3 tras el aborto no debe volver a bloquearse
+                    if aborted.is_set():
+                        raise CommandAborted("Petición abortada por el watchdog")
+                    sock = super()._new_conn()
+                    sockets.add(sock)
+                    return sock
+
+            return TrackedConnection
+
+        class TrackedHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = tracked(HTTPConnection)
+
+        class TrackedHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = tracked(HTTPSConnection)
+
+        return {"http": TrackedHTTPConnectionPool, "https": TrackedHTTPSConnectionPool}
+
+    def abort_inflight(self):
+        """
+        Corta todos los sockets del pool (desde cualquier hilo). La petición en curso
+        termina con CommandAborted; las siguientes abren sockets nuevos.
+        """
+        self._aborted.set()
+        for sock in list(self._sockets):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def clear_abort(self):
+        self._aborted.clear()
+
+    def execute(self, command, params):
+        started_at = time.perf_counter()
+        try:
+            if self._aborted.is_set():
+                raise CommandAborted(f"'{command}' abortado por el watchdog")
+            return super().execute(command, params)
+        except CommandAborted:
+            self._aborted.clear()
+            raise
+        except Exception as e:
+            if self._aborted.is_set():
+                self._aborted.clear()
+                raise CommandAborted(f"'{command}' abortado por el watchdog") from e
+            raise
+        finally:
+            self.latency.add(command, time.perf_counter() - started_at)
+
+
+def create_tuned_connection(
+    server_url, pool_size=4, retries=2, backoff_factor=0.2, timeout=120,
+    connection_class=TunedAppiumConnection,
+):
+    """
+    Crea la conexión afinada para webdriver.Remote(command_executor=...).
+
+    Args:
+        server_url (str): URL de Appium Server (ej: http://localhost:4723)
+        pool_size (int): Sockets persistentes por host
+        retries (int): Reintentos ante errores de conexión
+        backoff_factor (float): Backoff entre reintentos (segundos)
+        timeout (int): Timeout de cada petición (segundos)
+        connection_class (type): TunedAppiumConnection o una subclase
+            (p. ej. RecordingAppiumConnection de utils.command_log)
+
+    Returns:
+        TunedAppiumConnection: Conexión lista para usar
+    """
+    client_config = AppiumClientConfig(
+        remote_server_addr=server_url, keep_alive=True, timeout=timeout
+    )
+    return connection_class(
+        client_config, pool_size=pool_size, retries=retries, backoff_factor=backoff_factor
+    )
@@ -0,0 +1,193 @@
+"""
+Motor de esperas por transición de pantalla
+Sustituye los sleep() fijos: cada paso declara la firma de la siguiente pantalla
+y se sondea con backoff hasta que aparece, aparece una pantalla de error conocida
+o vence el plazo. El tiempo real de cada espera queda registrado en evidence_state.
+"""
+
+import time
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from config.settings import test
+from utils.evidences.utils import EvidenceStateHelper
+from utils.locator_chain import LocatorChain
+
+
+# Pantallas de error conocidas (diálogos del sistema y mensajes genéricos de la app)
+DEFAULT_ERROR_SIGNATURES = [
+    (AppiumBy.XPATH, '//*[@resource-id="android:id/aerr_close"]'),  # La app se detuvo
+    (AppiumBy.XPATH, '//*[@resource-id="android:id/aerr_wait"]'),  # La app no responde
+    (AppiumBy.XPATH, '//android.view.View[contains(@content-desc, "Ocurrió un error")]'),
+]
+
+
+def text_signature(text):
+    """
+    Construye una firma que se cumple cuando el texto aparece en pantalla
+    (en content-desc o en text).
+
+    Args:
+        text (str): Texto (parcial) a esperar
+
+    Returns:
+        tuple: Localizador (By, value)
+    """
+    return (
+        AppiumBy.XPATH,
+        f'//*[contains(@content-desc, "{text}") or contains(@text, "{text}")]',
+    )
+
+
+class ScreenErrorDetected(AssertionError):
+    """Se lanza cuando aparece una pantalla de error mientras se espera una transición."""
+
+
+class WaitResult:
+    """Resultado de una espera: verdadero solo si la firma esperada apareció."""
+
+    def __init__(self, step, status, seconds, polls, detail=None):
+        self.step = step
+        self.status = status  # found, error, timeout
+        self.seconds = seconds
+        self.polls = polls
+        self.detail = detail
+
+    def __bool__(self):
+        return self.status == "found"
+
+    def as_dict(self):
+        return {
+            "step": self.step,
+            "status": self.status,
+            "seconds": round(self.seconds, 3),
+            "polls": self.polls,
+            "detail": self.detail,
+        }
+
+
+class ScreenWaiter:
+    """
+    Espera activa con backoff sobre la firma de la siguiente pantalla.
+    La firma puede ser un localizador (By, value), una lista de localizadores
+    (deben estar todos presentes) o una función driver -> bool.
+    """
+
+    def __init__(
+        self,
+        driver,
+        timeout=None,
+        poll_interval=None,
+        max_interval=None,
+        backoff=1.5,
+        error_signatures=None,
+    ):
+        self.driver = driver
+        self.timeout = timeout if timeout is not None else test.SCREEN_WAIT_TIMEOUT
+        self.poll_interval = (
+            poll_interval if poll_interval is not None else test.SCREEN_POLL_INTERVAL
+        )
+        self.max_interval = (
+            max_interval if max_interval is not None else test.SCREEN_POLL_MAX_INTERVAL
+        )
+        self.backoff = backoff
+        self.error_signatures = (
+            DEFAULT_ERROR_SIGNATURES if error_signatures is None else error_signatures
+        )
+        self._error_chain = (
+            LocatorChain("errores", self.error_signatures, mode="union")
+            if self.error_signatures
+            else None
+        )
+
+    def wait_for(self, signature, step=None, timeout=None, raise_on_error=True):
+        """
+        Sondea hasta que la firma aparece, aparece un error conocido o vence el plazo.
+
+        Args:
+            signature: Localizador, lista de localizadores o función driver -> bool
+            step (str, optional): Nombre del paso (para el registro de tiempos)
+            timeout (float, optional): Plazo en segundos (por defecto el configurado)
+            raise_on_error (bool): Si True, lanza ScreenErrorDetected al ver un error
+
+        Returns:
+            WaitResult: Verdadero si la firma apareció antes del plazo
+        """
+        timeout = self.timeout if timeout is None else timeout
+        step = step or "sin_nombre"
+        started_at = time.perf_counter()
+        deadline = started_at + timeout
+        interval = self.poll_interval
+        polls = 0
+
+        while True:
+            polls += 1
+            if self._signature_present(signature):
+                result = WaitResult(step, "found", time.perf_counter() - started_at, polls)
+                break
+
+            error_text = self._error_present()
+            if error_text is not None:
+                result = WaitResult(
+                    step, "error", time.perf_counter() - started_at, polls, error_text
+                )
+                break
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                result = WaitResult(step, "timeout", time.perf_counter() - started_at, polls)
+                break
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * self.backoff, self.max_interval)
+
+        self._record(result)
+
+        if result.status == "error" and raise_on_error:
+            raise ScreenErrorDetected(
+                f"❌ Pantalla de error detectada en '{step}': {result.detail}"
+            )
+        return result
+
+    def _signature_present(self, signature):
+        try:
+            if callable(signature):
+                return bool(signature(self.driver))
+            locators = signature if isinstance(signature, list) else [signature]
+            return all(self.driver.find_elements(*locator) for locator in locators)
+        except Exception:
+            return False
+
+    def _error_present(self):
+        """
+        Busca todas las firmas de error en una sola consulta (unión XPath).
+
+        Returns:
+            str: Descripción del error encontrado o None
+        """
+        if self._error_chain is None:
+            return None
+        try:
+            match = self._error_chain.resolve(self.driver)
+            if match is None:
+                return None
+            element = match.first
+            return (
+                element.get_attribute("content-desc")
+                or element.get_attribute("text")
+                or element.get_attribute("resource-id")
+                or "error"
+            )
+        except Exception:
+            return None
+
+    def _record(self, result):
+        state = EvidenceStateHelper.get_state(self.driver)
+        state.setdefault("step_waits", []).append(result.as_dict())
+        EvidenceStateHelper.set_state(self.driver, state)
+
+        icon = {"found": "✅", "error": "❌", "timeout": "⏰"}[result.status]
+        print(
+            f"{icon} Espera '{result.step}': {result.status} en {result.seconds:.2f}s "
+            f"({result.polls} sondeos)"
+        )
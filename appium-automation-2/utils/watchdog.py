@@ -0,0 +1,164 @@
+"""
+Watchdog de pasos colgados
+Cada paso step_XX_* (y la detención del video en el teardown) se ejecuta con un
+presupuesto de tiempo. Si el emulador o el servidor UiAutomator2 se quedan
+colgados y el paso excede TEST_STEP_BUDGET, el watchdog, desde otro hilo:
+  1. guarda una última captura y el page_source por una conexión aparte con
+     plazo corto (TEST_WATCHDOG_DIAG_TIMEOUT),
+  2. corta los sockets de la conexión del driver (TunedAppiumConnection), con lo
+     que la petición en curso termina con CommandAborted,
+  3. y el paso falla con StepHangError; el resto de la suite sigue su curso.
+"""
+
+import base64
+import contextlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import urllib3
+
+from config.settings import evidence, test
+
+
+class StepHangError(AssertionError):
+    """El paso excedió su presupuesto de tiempo y fue abortado."""
+
+
+class StepWatchdog:
+    """
+    Uso (lo hace el fixture valmex_driver):
+        watchdog = StepWatchdog(driver, test_name)
+        token = StepRegistry.use_watchdog(watchdog)
+        with watchdog.guard("detener_video", raise_on_trip=False):
+            ...
+    """
+
+    def __init__(self, driver, test_name, budget=None, diag_timeout=None, output_dir=None):
+        self.driver = driver
+        self.test_name = test_name
+        self.budget = budget if budget is not None else test.STEP_BUDGET
+        self.diag_timeout = diag_timeout if diag_timeout is not None else test.WATCHDOG_DIAG_TIMEOUT
+        self.output_dir = output_dir or str(evidence.BASE_OUTPUT_DIR / "diagnosticos")
+        self.trips = []
+
+    @property
+    def tripped(self):
+        return bool(self.trips)
+
+    @contextlib.contextmanager
+    def guard(self, name, budget=None, raise_on_trip=True):
+        """
+        Ejecuta un bloque con presupuesto de tiempo.
+
+        Args:
+            name (str): Nombre del paso (para diagnósticos y mensajes)
+            budget (float, optional): Segundos (por defecto TEST_STEP_BUDGET; 0 lo desactiva)
+            raise_on_trip (bool): Si True, el bloque falla con StepHangError al exceder el plazo
+        """
+        budget = self.budget if budget is None else budget
+        if not budget or budget <= 0:
+            yield
+            return
+
+        trip = {}
+        finished = threading.Event()
+        # El lock hace atómicos "¿terminó el paso? -> abortar" en _trip y
+        # "terminó el paso -> ¿hubo aborto?" aquí: un aborto nunca queda sin limpiar
+        lock = threading.Lock()
+        timer = threading.Timer(budget, self._trip, args=(name, budget, trip, finished, lock))
+        timer.daemon = True
+        timer.start()
+        try:
+            yield
+        except Exception as e:
+            if trip and raise_on_trip:
+                raise StepHangError(self._message(name, budget)) from e
+            raise
+        finally:
+            with lock:
+                finished.set()
+            timer.cancel()
+            if trip:
+                # Un aborto que no alcanzó a ninguna petición no debe afectar a la siguiente
+                clear_abort = getattr(self.driver.command_executor, "clear_abort", None)
+                if clear_abort is not None:
+                    clear_abort()
+        if trip and raise_on_trip:
+            raise StepHangError(self._message(name, budget))
+
+    def _message(self, name, budget):
+        return f"⏰ '{name}' excedió su presupuesto de {budget:.0f}s y fue abortado"
+
+    def _trip(self, name, budget, trip, finished, lock):
+        print(f"\n⏰ Watchdog: '{name}' lleva más de {budget:.0f}s; capturando diagnóstico")
+        diagnostics = self._capture_diagnostics(name)
+        abort = getattr(self.driver.command_executor, "abort_inflight", None)
+        with lock:
+            if finished.is_set():
+                # El paso terminó mientras se capturaba el diagnóstico: no se aborta
+                return
+            trip.update(diagnostics, step=name, budget=budget)
+            self.trips.append(trip)
+            state = getattr(self.driver, "evidence_state", None)
+            if isinstance(state, dict):
+                state.setdefault("watchdog", []).append(trip)
+            if abort is not None:
+                abort()
+
+        if abort is None:
+            print("⚠️ La conexión del driver no permite abortar (APPIUM_HTTP_TUNED=False)")
+            return
+        print(f"🛑 Watchdog: petición en curso de '{name}' abortada")
+
+    # ----------------------------------------------------
+    # Diagnóstico por una conexión independiente
+    # ----------------------------------------------------
+
+    def _capture_diagnostics(self, name):
+        """
+        Returns:
+            dict: Rutas de la captura y del page_source (None si no respondió a tiempo)
+        """
+        executor = self.driver.command_executor
+        client_config = getattr(executor, "_client_config", None)
+        server = getattr(client_config, "remote_server_addr", None)
+        session_id = getattr(self.driver, "session_id", None)
+        result = {"screenshot": None, "page_source": None}
+        if not server or not session_id:
+            return result
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(
+            self.output_dir,
+            f"{self.test_name}_{name}_{datetime.now().strftime('%H%M%S_%d_%m_%Y')}",
+        )
+        http = urllib3.PoolManager(
+            timeout=urllib3.Timeout(connect=2, read=self.diag_timeout), retries=False
+        )
+        session_url = f"{server.rstrip('/')}/session/{session_id}"
+        try:
+            for key, endpoint, suffix in (
+                ("screenshot", "screenshot", ".png"),
+                ("page_source", "source", ".xml"),
+            ):
+                started_at = time.perf_counter()
+                try:
+                    response = http.request("GET", f"{session_url}/{endpoint}")
+                    value = json.loads(response.data)["value"]
+                except Exception as e:
+                    print(f"⚠️ Watchdog: sin {key} ({time.perf_counter() - started_at:.1f}s): {e}")
+                    continue
+                if key == "screenshot":
+                    with open(base + suffix, "wb") as f:
+                        f.write(base64.b64decode(value))
+                else:
+                    with open(base + suffix, "w", encoding="utf-8") as f:
+                        f.write(value)
+                result[key] = base + suffix
+                print(f"📸 Watchdog: {key} guardado en {base + suffix}")
+        finally:
+            http.clear()
+        return result